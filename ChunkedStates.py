@@ -0,0 +1,106 @@
+import numpy as np
+from typing import Dict, Tuple
+
+from enums import NodeState
+
+CHUNK_SIZE = 64  # Chunks are CHUNK_SIZE x CHUNK_SIZE nodes
+
+
+class ChunkedStates:
+    '''
+    Sparse replacement for a lattice's state array (see Lattice(chunked=True)), for lattices far too large to hold in
+    memory of which only a small part isn't vacant. The lattice is split into square chunks, which are kept in a dict
+    keyed by chunk coordinates (r // CHUNK_SIZE, c // CHUNK_SIZE). A chunk is only allocated the first time one of its
+    nodes is set to a state other than NodeState.VACANT, and a missing chunk reads as all vacant, so memory grows with
+    what's on the lattice rather than with its area. The number of nodes that aren't vacant is counted per chunk, and
+    a chunk is freed again once that drops to 0 (e.g. when a search's results are cleared).
+
+    Only single nodes can be read and written (states[r, c]), which is all a Node and the searches need.
+    '''
+
+    def __init__(self, shape: Tuple[int, int]) -> None:
+        '''
+        Initializes an all-vacant state array of the given shape (nrows, ncols).
+        '''
+
+        self.shape = shape
+        self.chunks: Dict[Tuple[int, int], np.ndarray] = {}
+        # Number of nodes that aren't vacant in every allocated chunk
+        self.num_occupied: Dict[Tuple[int, int], int] = {}
+
+    def __getitem__(self, index: Tuple[int, int]) -> int:
+        '''
+        Returns the state value of the node at index (r, c).
+        '''
+
+        r, c = index
+        chunk = self.chunks.get((r // CHUNK_SIZE, c // CHUNK_SIZE))
+        if chunk is None:
+            return NodeState.VACANT.value
+        return chunk[r % CHUNK_SIZE, c % CHUNK_SIZE]
+
+    def __setitem__(self, index: Tuple[int, int], value: int) -> None:
+        '''
+        Sets the state value of the node at index (r, c), allocating its chunk if needed, and freeing it if it's all
+        vacant afterwards.
+        '''
+
+        r, c = index
+        chunk_pos = (r // CHUNK_SIZE, c // CHUNK_SIZE)
+        chunk = self.chunks.get(chunk_pos)
+        if chunk is None:
+            if value == NodeState.VACANT.value:  # Already reads as vacant
+                return
+            chunk = self.chunks[chunk_pos] = np.full(
+                (CHUNK_SIZE, CHUNK_SIZE), NodeState.VACANT.value, dtype=np.uint8
+            )
+            self.num_occupied[chunk_pos] = 0
+        local_index = (r % CHUNK_SIZE, c % CHUNK_SIZE)
+        was_vacant = chunk[local_index] == NodeState.VACANT.value
+        is_vacant = value == NodeState.VACANT.value
+        if was_vacant != is_vacant:
+            self.num_occupied[chunk_pos] += 1 if was_vacant else -1
+            if not self.num_occupied[chunk_pos]:
+                del self.chunks[chunk_pos], self.num_occupied[chunk_pos]
+                return
+        chunk[local_index] = value
+
+    def fill(self, value: int) -> None:
+        '''
+        Sets every node to the given state value. Filling with NodeState.VACANT frees all chunks, anything else
+        allocates every chunk of the lattice.
+        '''
+
+        self.chunks = {}
+        self.num_occupied = {}
+        if value == NodeState.VACANT.value:
+            return
+        nrows, ncols = self.shape
+        for chunk_r in range(-(-nrows // CHUNK_SIZE)):
+            for chunk_c in range(-(-ncols // CHUNK_SIZE)):
+                chunk = np.full(
+                    (CHUNK_SIZE, CHUNK_SIZE), NodeState.VACANT.value, dtype=np.uint8
+                )
+                # Nodes of chunks on the edges which are outside the lattice stay vacant
+                chunk[
+                    : nrows - chunk_r * CHUNK_SIZE, : ncols - chunk_c * CHUNK_SIZE
+                ] = value
+                self.chunks[chunk_r, chunk_c] = chunk
+                self.num_occupied[chunk_r, chunk_c] = int(
+                    (chunk != NodeState.VACANT.value).sum()
+                )
+
+    def get_num_chunks(self) -> int:
+        '''
+        Returns the number of chunks allocated.
+        '''
+
+        return len(self.chunks)
+
+    @property
+    def nbytes(self) -> int:
+        '''
+        Returns the number of bytes taken by the allocated chunks, like numpy.ndarray.nbytes.
+        '''
+
+        return len(self.chunks) * CHUNK_SIZE * CHUNK_SIZE
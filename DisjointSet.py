@@ -0,0 +1,58 @@
+from typing import List
+
+
+class DisjointSet:
+    '''
+    Disjoint-set forest (union-find) over the integers 0 to size - 1. Uses path compression in find() and
+    union by rank in union(), so that any sequence of operations runs in near constant amortized time per
+    operation, i.e. O(α(n)).
+    '''
+
+    # Type hints
+    parent: List[int]
+    rank: List[int]
+
+    def __init__(self, size: int) -> None:
+        '''
+        Initializes the forest with every element in a set of its own.
+        '''
+
+        self.parent = list(range(size))
+        self.rank = [0] * size
+
+    def find(self, x: int) -> int:
+        '''
+        Returns the representative (root) of the set containing x. Every element on the way to the root is
+        re-pointed directly at the root, which keeps the trees flat. Written iteratively so that long chains
+        don't hit the recursion limit.
+        '''
+
+        root = x
+        while self.parent[root] != root:
+            root = self.parent[root]
+        while self.parent[x] != root:
+            self.parent[x], x = root, self.parent[x]
+        return root
+
+    def union(self, a: int, b: int) -> bool:
+        '''
+        Merges the sets containing a and b. Returns False if they were already in the same set, else True.
+        The root of lower rank is attached below the root of higher rank.
+        '''
+
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a == root_b:
+            return False
+        if self.rank[root_a] < self.rank[root_b]:
+            root_a, root_b = root_b, root_a
+        self.parent[root_b] = root_a
+        if self.rank[root_a] == self.rank[root_b]:
+            self.rank[root_a] += 1
+        return True
+
+    def connected(self, a: int, b: int) -> bool:
+        '''
+        Returns whether a and b are in the same set.
+        '''
+
+        return self.find(a) == self.find(b)
@@ -0,0 +1,263 @@
+import struct
+import numpy as np
+from typing import List, Tuple
+
+# Event log file format (see EventLogWriter). All values are little-endian.
+EVENT_LOG_MAGIC = b'LEVT'
+EVENT_LOG_VERSION = 1
+# magic, version, nrows, ncols, node size
+EVENT_LOG_HEADER = struct.Struct('<4sHIII')
+# Offset of the frame index, number of frames. At the very end of the file.
+EVENT_LOG_TRAILER = struct.Struct('<QQ')
+STATE_BITS = 3  # Node state values take up the low bits of every event
+# Event marking the end of a frame. Its state bits are a value no NodeState has.
+FRAME_MARKER = (1 << STATE_BITS) - 1
+
+
+def encode_varints(values: np.ndarray) -> bytes:
+    '''
+    Encodes unsigned integers as LEB128 varints, i.e. 7 bits per byte, least significant group first, with the high
+    bit of every byte but the last one of a value set. Vectorized over all values.
+    '''
+
+    values = values.astype(np.uint64)
+    num_bytes = np.ones(len(values), dtype=np.int64)
+    remaining = values >> np.uint64(7)
+    while remaining.any():
+        num_bytes += remaining > 0
+        remaining >>= np.uint64(7)
+    starts = np.cumsum(num_bytes) - num_bytes
+    encoded = np.empty(int(num_bytes.sum()), dtype=np.uint8)
+    for i in range(int(num_bytes.max(initial=0))):
+        has_byte = num_bytes > i
+        groups = (values[has_byte] >> np.uint64(7 * i)) & np.uint64(0x7F)
+        continued = (num_bytes[has_byte] > i + 1).astype(np.uint64) << np.uint64(7)
+        encoded[starts[has_byte] + i] = groups | continued
+    return encoded.tobytes()
+
+
+def decode_varints(data: np.ndarray) -> np.ndarray:
+    '''
+    Decodes a uint8 array of complete varints (see encode_varints()) into a uint64 array. Vectorized.
+    '''
+
+    ends = np.flatnonzero(data < 0x80)
+    if not len(ends):
+        return np.empty(0, dtype=np.uint64)
+    starts = np.concatenate([[0], ends[:-1] + 1])
+    shifts = 7 * (np.arange(len(data)) - np.repeat(starts, ends - starts + 1)).astype(
+        np.uint64
+    )
+    groups = (data & 0x7F).astype(np.uint64) << shifts
+    return np.add.reduceat(groups, starts)
+
+
+class EventLogWriter:
+    '''
+    Records the state changes of a lattice to a compact binary file, frame by frame, so that they can be replayed
+    without recomputing them (see EventLogReader and Replay). A frame is one render of the lattice, e.g. a single node
+    in a search animation or a whole Game of Life generation. The file holds:
+
+    1) Header (EVENT_LOG_HEADER): magic bytes, format version, dimensions and node size
+    2) The states of all nodes when recording started, one byte per node (row-major)
+    3) Events, each a varint (see encode_varints()): (zigzag encoded difference between the node's flat index and the
+       previous event's) << STATE_BITS | new state value. Every frame ends with a FRAME_MARKER event.
+    4) Frame index: the offset of every frame's first event, plus the offset where the events end (uint64 each)
+    5) Trailer (EVENT_LOG_TRAILER): offset of the frame index and the number of frames
+
+    Only nodes whose state actually changed since they were last recorded are written, and frames without any changes
+    are skipped.
+    '''
+
+    def __init__(self, path: str, states: np.ndarray, node_size: int) -> None:
+        '''
+        Starts recording the given (dense) state array to a new file at path.
+        '''
+
+        self.states = states
+        self.recorded_states = states.copy()  # States as of the last recorded frame
+        self.previous_index = 0
+        self.frame_offsets: List[int] = []
+        self.file = open(path, 'wb')
+        nrows, ncols = states.shape
+        self.file.write(
+            EVENT_LOG_HEADER.pack(
+                EVENT_LOG_MAGIC, EVENT_LOG_VERSION, nrows, ncols, node_size
+            )
+        )
+        self.file.write(np.ascontiguousarray(states).tobytes())
+
+    def record(self, indices: np.ndarray) -> None:
+        '''
+        Records a frame, in which the nodes at the given flat indices were rendered.
+        '''
+
+        indices = np.unique(indices)
+        states = self.states.ravel()[indices]
+        changed = states != self.recorded_states.ravel()[indices]
+        self.write_frame(indices[changed], states[changed])
+
+    def record_all(self) -> None:
+        '''
+        Records a frame in which the whole lattice was rendered. Compares every node, so only for full redraws.
+        '''
+
+        indices = np.flatnonzero(self.states != self.recorded_states)
+        self.write_frame(indices, self.states.ravel()[indices])
+
+    def write_frame(self, indices: np.ndarray, states: np.ndarray) -> None:
+        '''
+        Writes a frame in which the nodes at the given (sorted) flat indices changed to the given states. Empty
+        frames aren't written.
+        '''
+
+        if not len(indices):
+            return
+        self.recorded_states.ravel()[indices] = states
+        deltas = np.diff(indices.astype(np.int64), prepend=self.previous_index)
+        # Zigzag encoding, so that small negative deltas become small too
+        zigzag = (deltas << 1) ^ (deltas >> 63)
+        events = np.append(
+            (zigzag.astype(np.uint64) << np.uint64(STATE_BITS)) | states,
+            FRAME_MARKER,
+        )
+        self.frame_offsets.append(self.file.tell())
+        self.file.write(encode_varints(events))
+        self.previous_index = int(indices[-1])
+
+    def close(self) -> None:
+        '''
+        Writes the frame index and trailer, and closes the file.
+        '''
+
+        index_offset = self.file.tell()
+        self.file.write(
+            np.array(self.frame_offsets + [index_offset], dtype='<u8').tobytes()
+        )
+        self.file.write(EVENT_LOG_TRAILER.pack(index_offset, len(self.frame_offsets)))
+        self.file.close()
+
+
+class EventLogReader:
+    '''
+    Reads an event log written by EventLogWriter. The file is memory-mapped, so frames are only read from disk when
+    they're decoded.
+    '''
+
+    def __init__(self, path: str) -> None:
+        '''
+        Opens an event log. Raises ValueError if the file isn't one, or is of an unsupported version.
+        '''
+
+        self.data = np.memmap(path, dtype=np.uint8, mode='r')
+        if len(self.data) < EVENT_LOG_HEADER.size + EVENT_LOG_TRAILER.size:
+            raise ValueError(f'{path} is not an event log')
+        (
+            magic,
+            version,
+            self.nrows,
+            self.ncols,
+            self.node_size,
+        ) = EVENT_LOG_HEADER.unpack(self.data[: EVENT_LOG_HEADER.size].tobytes())
+        if magic != EVENT_LOG_MAGIC:
+            raise ValueError(f'{path} is not an event log')
+        if version != EVENT_LOG_VERSION:
+            raise ValueError(f'Unsupported event log version {version}')
+        index_offset, num_frames = EVENT_LOG_TRAILER.unpack(
+            self.data[-EVENT_LOG_TRAILER.size :].tobytes()
+        )
+        self.frame_offsets = np.frombuffer(
+            self.data[index_offset : index_offset + 8 * (num_frames + 1)].tobytes(),
+            dtype='<u8',
+        ).astype(np.int64)
+
+    def get_dim(self) -> Tuple[int, int]:
+        return self.nrows, self.ncols
+
+    def get_num_frames(self) -> int:
+        return len(self.frame_offsets) - 1
+
+    def get_initial_states(self) -> np.ndarray:
+        '''
+        Returns (a copy of) the states of all nodes when recording started.
+        '''
+
+        start = EVENT_LOG_HEADER.size
+        return np.array(self.data[start : start + self.nrows * self.ncols]).reshape(
+            self.nrows, self.ncols
+        )
+
+    def read_frames(
+        self, start: int, stop: int, previous_index: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        '''
+        Decodes the frames in the range [start, stop), and returns the flat indices of the nodes that changed in them
+        and their new states, in the order they changed. previous_index is the index of the last node that changed
+        before the first of them (0 before the first frame), as indices are stored relative to it.
+        '''
+
+        data = self.data[self.frame_offsets[start] : self.frame_offsets[stop]]
+        events = decode_varints(np.asarray(data))
+        events = events[(events & np.uint64(FRAME_MARKER)) != FRAME_MARKER]
+        states = (events & np.uint64(FRAME_MARKER)).astype(np.uint8)
+        zigzag = (events >> np.uint64(STATE_BITS)).astype(np.int64)
+        deltas = (zigzag >> 1) ^ -(zigzag & 1)
+        indices = previous_index + np.cumsum(deltas)
+        return indices, states
+
+
+class Replay:
+    '''
+    Plays an event log back onto a state array (e.g. a lattice's), without recomputing anything. Moving forward only
+    decodes and applies the frames in between, so its cost depends on the number of changes in them, not on the size
+    of the lattice. Seeking backwards starts over from the initial states, so it also copies the whole state array
+    once, and then applies every frame up to the one sought.
+    '''
+
+    def __init__(self, reader: EventLogReader, states: np.ndarray) -> None:
+        '''
+        Sets the state array to the log's initial states, i.e. frame 0.
+        '''
+
+        self.reader = reader
+        self.states = states
+        self.rewind()
+
+    def rewind(self) -> None:
+        '''
+        Goes back to frame 0, by copying the log's initial states over the whole state array.
+        '''
+
+        self.states[...] = self.reader.get_initial_states()
+        self.frame = 0  # Number of frames applied
+        self.previous_index = 0
+
+    def advance(self, num_frames: int = 1) -> np.ndarray:
+        '''
+        Applies the next num_frames frames (fewer at the end of the log), and returns the flat indices of the nodes
+        that changed.
+        '''
+
+        stop = min(self.frame + num_frames, self.reader.get_num_frames())
+        if stop <= self.frame:
+            return np.empty(0, dtype=np.int64)
+        indices, states = self.reader.read_frames(self.frame, stop, self.previous_index)
+        # Later changes of a node overwrite earlier ones
+        self.states.ravel()[indices] = states
+        self.frame = stop
+        self.previous_index = int(indices[-1])
+        return indices
+
+    def seek(self, frame: int) -> None:
+        '''
+        Jumps to the state after the given number of frames. Seeking backwards rewinds to the initial states first (see
+        rewind()).
+        '''
+
+        frame = max(0, min(frame, self.reader.get_num_frames()))
+        if frame < self.frame:
+            self.rewind()
+        self.advance(frame - self.frame)
+
+    def is_done(self) -> bool:
+        return self.frame == self.reader.get_num_frames()
@@ -0,0 +1,227 @@
+from __future__ import annotations
+import numpy as np
+from typing import TYPE_CHECKING, Optional
+
+from enums import NodeState
+from Node import Pos
+
+if TYPE_CHECKING:
+    from Lattice import Lattice
+
+# Distance of cells the goal can't be reached from (and of walls)
+UNREACHABLE = np.iinfo(np.int32).max
+# Moves an agent can make, as (dr, dc). A cell's direction is an index into this, or NO_DIRECTION.
+DIRECTION_OFFSETS = np.array([[-1, 0], [1, 0], [0, -1], [0, 1]], dtype=np.int8)
+# Index of the opposite move of every move in DIRECTION_OFFSETS
+OPPOSITE_DIRECTIONS = np.array([1, 0, 3, 2], dtype=np.int8)
+# Direction of the goal, walls, and cells the goal can't be reached from
+NO_DIRECTION = -1
+
+
+class FlowField:
+    '''
+    Shortest-path guidance towards a single goal for any number of agents at once. Built from an integration field,
+    i.e. the distance from every cell of the lattice to the goal (found with a breadth-first search from the goal, which
+    is Dijkstra's algorithm as all weights are 1), from which every cell gets the direction of its neighbour closest to
+    the goal. Agents then only have to follow the directions, see step_agents().
+
+    Internally, the walls, distances and directions are kept with a border of walls around them (padded), so that
+    neighbours are always at fixed offsets of a cell's flat index, without any bounds checks.
+    '''
+
+    def __init__(self, lattice: Lattice, goal_pos: Pos) -> None:
+        '''
+        Builds the field for the given goal on the lattice's current walls.
+        '''
+
+        self.lattice = lattice
+        self.goal_pos = goal_pos
+        nrows, ncols = lattice.get_dim()
+        self.padded_shape = (nrows + 2, ncols + 2)
+        # Flat index offsets of the neighbours in DIRECTION_OFFSETS order
+        self.neighbour_offsets = (
+            DIRECTION_OFFSETS[:, 0].astype(np.int64) * self.padded_shape[1]
+            + DIRECTION_OFFSETS[:, 1]
+        )
+        self.goal_index = (goal_pos.r + 1) * self.padded_shape[1] + goal_pos.c + 1
+        self.walls = self.get_padded_walls()
+        self.distances = np.full(self.walls.size, UNREACHABLE, dtype=np.int32)
+        self.directions = np.full(self.walls.size, NO_DIRECTION, dtype=np.int8)
+        self.build()
+
+    def get_padded_walls(self) -> np.ndarray:
+        '''
+        Returns the lattice's current walls as a flat padded boolean array.
+        '''
+
+        walls = np.ones(self.padded_shape, dtype=bool)
+        walls[1:-1, 1:-1] = self.lattice.states == NodeState.WALL.value
+        return walls.ravel()
+
+    def get_distances(self) -> np.ndarray:
+        '''
+        Returns the integration field, i.e. the number of moves from every cell to the goal (UNREACHABLE if there's no
+        path), as an nrows x ncols view.
+        '''
+
+        return self.distances.reshape(self.padded_shape)[1:-1, 1:-1]
+
+    def get_directions(self) -> np.ndarray:
+        '''
+        Returns the index into DIRECTION_OFFSETS of the move every cell makes towards the goal (NO_DIRECTION for the
+        goal itself, walls and cells the goal can't be reached from), as an nrows x ncols view.
+        '''
+
+        return self.directions.reshape(self.padded_shape)[1:-1, 1:-1]
+
+    def build(self) -> None:
+        '''
+        Builds the whole field from scratch.
+        '''
+
+        self.distances.fill(UNREACHABLE)
+        self.directions.fill(NO_DIRECTION)
+        if self.walls[self.goal_index]:
+            return
+        self.distances[self.goal_index] = 0
+        self.propagate(np.array([self.goal_index]))
+        self.update_directions(np.flatnonzero(self.distances != UNREACHABLE))
+
+    def propagate(self, seeds: np.ndarray) -> np.ndarray:
+        '''
+        Spreads distances outwards from the given cells (whose distances are set) one wave at a time, lowering the
+        distance of every passable cell it finds a shorter way to. Seeds are joined to the wave with their own distance,
+        so they don't all have to be equally far from the goal. Every wave is handled in a few vectorized operations.
+        Returns the cells whose distance was lowered.
+        '''
+
+        seeds = seeds[np.argsort(self.distances[seeds], kind='stable')]
+        seed_distances = self.distances[seeds]
+        next_seed = 0
+        frontier = np.empty(0, dtype=np.int64)
+        distance = 0  # Of the cells in the frontier
+        lowered = [frontier]
+        while len(frontier) or next_seed < len(seeds):
+            if not len(frontier):
+                distance = int(seed_distances[next_seed])
+            num_seeds = np.searchsorted(seed_distances, distance, side='right')
+            if num_seeds > next_seed:
+                frontier = np.union1d(frontier, seeds[next_seed:num_seeds])
+                next_seed = num_seeds
+            neighbours = np.unique((frontier[:, None] + self.neighbour_offsets).ravel())
+            neighbours = neighbours[
+                ~self.walls[neighbours] & (self.distances[neighbours] > distance + 1)
+            ]
+            self.distances[neighbours] = distance + 1
+            lowered.append(neighbours)
+            frontier = neighbours
+            distance += 1
+        return np.concatenate(lowered)
+
+    def update_directions(self, indices: np.ndarray) -> None:
+        '''
+        Points each of the given cells towards its neighbour closest to the goal.
+        '''
+
+        indices = indices[~self.walls[indices] & (indices != self.goal_index)]
+        neighbour_distances = self.distances[
+            indices[:, None] + self.neighbour_offsets
+        ]  # One row per cell, one column per direction
+        directions = np.argmin(neighbour_distances, axis=1).astype(np.int8)
+        directions[
+            neighbour_distances[np.arange(len(indices)), directions] == UNREACHABLE
+        ] = NO_DIRECTION
+        self.directions[indices] = directions
+
+    def get_dependent_cells(self, indices: np.ndarray) -> np.ndarray:
+        '''
+        Returns the given cells and every cell whose direction leads through one of them, i.e. the cells whose
+        distance may have been based on a path through them.
+        '''
+
+        dependent = [indices]
+        frontier = indices
+        while len(frontier):
+            # A neighbour depends on a frontier cell if its direction is the opposite of the frontier cell's direction to it
+            candidates = frontier[:, None] + self.neighbour_offsets
+            frontier = candidates[self.directions[candidates] == OPPOSITE_DIRECTIONS]
+            dependent.append(frontier)
+        return np.unique(np.concatenate(dependent))
+
+    def update(self) -> int:
+        '''
+        Brings the field up to date with the lattice's walls, by only rebuilding the region affected by cells that
+        became walls or passable since it was built (or last updated):
+
+        1) Cells which became walls, and every cell whose direction leads through one of them, lose their distance
+        2) Distances spread out again from the passable neighbours of those cells, and from the cells next to the ones
+           that became passable, which can also lower the distances of cells further away (see propagate())
+        3) Only the cells whose distance changed, and their neighbours, get new directions
+
+        Rebuilds the whole field if the goal became a wall or passable. Returns the number of cells whose wall state
+        changed.
+        '''
+
+        walls = self.get_padded_walls()
+        changed = np.flatnonzero(walls != self.walls)
+        if not len(changed):
+            return 0
+        self.walls = walls
+        if self.goal_index in changed:
+            self.build()
+            return len(changed)
+
+        new_walls = changed[walls[changed]]
+        reset = self.get_dependent_cells(new_walls)
+        self.distances[reset] = UNREACHABLE
+        self.directions[reset] = NO_DIRECTION
+        # Cells next to the reset region or a cell that became passable
+        neighbours = np.unique(
+            (np.concatenate([reset, changed])[:, None] + self.neighbour_offsets).ravel()
+        )
+        seeds = neighbours[
+            ~walls[neighbours] & (self.distances[neighbours] != UNREACHABLE)
+        ]
+        lowered = self.propagate(seeds)
+        updated = np.concatenate([reset, lowered])
+        self.update_directions(
+            np.unique(
+                np.concatenate(
+                    [updated, (updated[:, None] + self.neighbour_offsets).ravel()]
+                )
+            )
+        )
+        return len(changed)
+
+    def step_agents(self, agents: np.ndarray) -> np.ndarray:
+        '''
+        Moves every agent one cell along the field, and returns their new positions. agents is an array of (r, c)
+        rows, one per agent. Agents on the goal, on walls or on cells the goal can't be reached from stay put.
+        '''
+
+        indices = (agents[:, 0] + 1) * self.padded_shape[1] + agents[:, 1] + 1
+        directions = self.directions[indices]
+        moves = DIRECTION_OFFSETS[directions]
+        moves[directions == NO_DIRECTION] = 0
+        return agents + moves
+
+    def get_goal_pos(self) -> Pos:
+        return self.goal_pos
+
+    def is_reachable(self, pos: Pos) -> bool:
+        '''
+        Returns whether the goal can be reached from the given cell.
+        '''
+
+        return bool(self.get_distances()[pos.r, pos.c] != UNREACHABLE)
+
+    def get_next_pos(self, pos: Pos) -> Optional[Pos]:
+        '''
+        Returns the cell an agent on the given cell moves to next, or None if it doesn't move.
+        '''
+
+        direction = self.get_directions()[pos.r, pos.c]
+        if direction == NO_DIRECTION:
+            return None
+        dr, dc = DIRECTION_OFFSETS[direction]
+        return Pos(pos.r + int(dr), pos.c + int(dc))
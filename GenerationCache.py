@@ -0,0 +1,78 @@
+import numpy as np
+
+# Number of generations a GenerationCache holds at most
+DEFAULT_CACHE_SIZE = 16
+
+
+def get_next_generation(live: np.ndarray) -> np.ndarray:
+    '''
+    Returns the next Game of Life generation of a board of live cells (see Lattice.game_of_life() for the rules), in a
+    few vectorized operations. As in Lattice.next_generation(), cells outside the board count as dead.
+    '''
+
+    nrows, ncols = live.shape
+    padded = np.pad(live, 1).astype(np.uint8)
+    num_live_neighbours = sum(
+        padded[1 + dr : 1 + dr + nrows, 1 + dc : 1 + dc + ncols]
+        for dr in [-1, 0, 1]
+        for dc in [-1, 0, 1]
+        if dr or dc
+    )
+    return (num_live_neighbours == 3) | (live & (num_live_neighbours == 2))
+
+
+class GenerationCache:
+    '''
+    Boards of a Game of Life (boolean arrays, True for live cells), computed lazily: a generation is only computed the
+    first time it's asked for, from the newest one computed so far. The boards are kept in a ring buffer of a fixed
+    number of generations, so memory doesn't grow with the number of generations. Generations which aren't needed
+    anymore are evicted with evict_before(), and if the buffer is full, computing a new generation evicts the oldest
+    one.
+    '''
+
+    def __init__(
+        self, initial_board: np.ndarray, size: int = DEFAULT_CACHE_SIZE
+    ) -> None:
+        '''
+        Initializes the cache with generation 0, and room for size generations.
+        '''
+
+        self.boards = np.empty((size, *initial_board.shape), dtype=bool)
+        self.boards[0] = initial_board
+        self.first = 0  # Oldest generation held
+        self.last = 0  # Newest generation computed
+
+    def get(self, generation: int) -> np.ndarray:
+        '''
+        Returns the board of the given generation, computing it (and the ones before it) if needed. The board is a view
+        into the buffer, so it's only valid until its generation is evicted. Raises ValueError if the generation has
+        been evicted already.
+        '''
+
+        if generation < self.first:
+            raise ValueError(f'Generation {generation} has been evicted')
+        size = len(self.boards)
+        while self.last < generation:
+            # If the buffer is full, the oldest generation makes room
+            if self.last - self.first + 1 == size:
+                self.first += 1
+            self.boards[(self.last + 1) % size] = get_next_generation(
+                self.boards[self.last % size]
+            )
+            self.last += 1
+        return self.boards[generation % size]
+
+    def evict_before(self, generation: int) -> None:
+        '''
+        Evicts every generation before the given one. The newest generation computed is always kept, as the next one
+        is computed from it.
+        '''
+
+        self.first = max(self.first, min(generation, self.last))
+
+    def get_num_held(self) -> int:
+        '''
+        Returns the number of generations held.
+        '''
+
+        return self.last - self.first + 1
@@ -0,0 +1,212 @@
+from __future__ import annotations
+import struct
+import numpy as np
+from typing import TYPE_CHECKING, Callable, List
+
+from enums import NodeState
+from Node import Pos
+from FlowField import FlowField, UNREACHABLE
+
+if TYPE_CHECKING:
+    from Lattice import Lattice
+
+DEFAULT_NUM_LANDMARKS = 8
+
+# Landmarks file format (see Landmarks.save()). All values are little-endian.
+LANDMARKS_FILE_MAGIC = b'LLMK'
+LANDMARKS_FILE_VERSION = 1
+# magic, version, bytes per distance (2 or 4), nrows, ncols, number of landmarks
+LANDMARKS_FILE_HEADER = struct.Struct('<4sHHIII')
+# Saved next to the lattice file they belong to, at its path with this suffix
+LANDMARKS_FILE_SUFFIX = '.landmarks'
+
+
+class Landmarks:
+    '''
+    Precomputed distances for the ALT heuristic (A*, Landmarks and the Triangle inequality), see Lattice.alt(). For a
+    few landmark cells L, the distance d(L, n) from L to every cell n is stored. As moves go both ways, the triangle
+    inequality gives |d(L, goal) - d(L, n)| <= d(n, goal) for every landmark, so the largest of these is a lower bound
+    on the remaining distance which, unlike the Euclidean distance, takes walls into account.
+
+    Landmarks are picked by farthest-point selection: each one is the cell farthest from all landmarks picked before
+    it, which spreads them out towards the edges of the lattice, where they give the best bounds. The distances of each
+    landmark are found with a vectorized breadth-first search (see FlowField), and stored as uint16 if they all fit in
+    it, else as uint32, one row of num_landmarks distances per cell.
+
+    The table is only valid for the walls it was built for (see is_stale()).
+    '''
+
+    def __init__(
+        self,
+        lattice: Lattice,
+        walls: np.ndarray,
+        positions: List[Pos],
+        distances: np.ndarray,
+    ) -> None:
+        '''
+        Initializes landmarks at the given positions, with a table of distances (one row per cell, one column per
+        landmark, unsigned) built for the given walls. See build() and load().
+        '''
+
+        self.lattice = lattice
+        self.walls = walls
+        self.positions = positions
+        self.distances = distances
+        # Distance of cells a landmark can't reach
+        self.unreachable = np.iinfo(distances.dtype).max
+
+    @classmethod
+    def build(cls, lattice: Lattice, num_landmarks: int) -> Landmarks:
+        '''
+        Picks num_landmarks landmarks on the lattice's current walls (fewer if there aren't enough passable cells), and
+        computes their distance tables.
+        '''
+
+        walls = lattice.states == NodeState.WALL.value
+        passable = ~walls.ravel()
+        positions: List[Pos] = []
+        distances = []
+        if passable.any():
+            # Distances from an arbitrary cell, only used to pick the first landmark
+            min_distances = get_distances(
+                lattice, Pos(*np.unravel_index(np.argmax(passable), walls.shape))
+            )
+            while len(positions) < num_landmarks:
+                # Cells the landmarks can't reach count as farthest, so every component of the lattice gets one
+                candidates = np.where(passable, min_distances, -1)
+                index = int(np.argmax(candidates))
+                if positions and candidates[index] == 0:  # Every cell is a landmark
+                    break
+                pos = Pos(*map(int, np.unravel_index(index, walls.shape)))
+                landmark_distances = get_distances(lattice, pos)
+                min_distances = (
+                    np.minimum(min_distances, landmark_distances)
+                    if positions
+                    else landmark_distances
+                )
+                positions.append(pos)
+                distances.append(landmark_distances)
+
+        distances = np.array(distances, dtype=np.int64).T.reshape(
+            passable.size, len(positions)
+        )
+        max_distance = distances[distances != UNREACHABLE].max(initial=0)
+        dtype = np.uint16 if max_distance < np.iinfo(np.uint16).max else np.uint32
+        distances = np.where(
+            distances == UNREACHABLE, np.iinfo(dtype).max, distances
+        ).astype(dtype)
+        return cls(lattice, walls, positions, distances)
+
+    def is_stale(self) -> bool:
+        '''
+        Returns whether walls were added or removed since the table was built, in which case its distances (and
+        therefore the heuristic) may be wrong. Compares every cell, but in a single vectorized pass.
+        '''
+
+        return not np.array_equal(
+            self.walls, self.lattice.states == NodeState.WALL.value
+        )
+
+    def get_heuristic(self, goal_index: int) -> Callable[[int], int]:
+        '''
+        Returns the ALT heuristic towards the goal at the given flat index, as a function of a cell's flat index. Only
+        the landmarks which can reach the goal are used, as the others give no bound for cells the goal can be
+        reached from.
+        '''
+
+        landmarks = np.flatnonzero(self.distances[goal_index] != self.unreachable)
+        goal_distances = self.distances[goal_index, landmarks].astype(np.int64)
+        if not len(landmarks):
+            return lambda index: 0
+
+        def heuristic(index: int) -> int:
+            return int(np.abs(self.distances[index, landmarks] - goal_distances).max())
+
+        return heuristic
+
+    def save(self, path: str) -> None:
+        '''
+        Saves the landmarks to a file in a compact, versioned binary format:
+
+        1) Header (LANDMARKS_FILE_HEADER): magic bytes, format version, bytes per distance, dimensions and number of
+           landmarks
+        2) Landmark positions, (r, c) as int32 each
+        3) The walls the table was built for, one bit per node (row-major, see numpy.packbits())
+        4) Distances, one row of num_landmarks distances per node (row-major)
+        '''
+
+        nrows, ncols = self.walls.shape
+        with open(path, 'wb') as f:
+            f.write(
+                LANDMARKS_FILE_HEADER.pack(
+                    LANDMARKS_FILE_MAGIC,
+                    LANDMARKS_FILE_VERSION,
+                    self.distances.itemsize,
+                    nrows,
+                    ncols,
+                    len(self.positions),
+                )
+            )
+            f.write(np.array(self.positions, dtype='<i4').tobytes())
+            f.write(np.packbits(self.walls, axis=None).tobytes())
+            f.write(
+                self.distances.astype(self.distances.dtype.newbyteorder('<')).tobytes()
+            )
+
+    @classmethod
+    def load(cls, path: str, lattice: Lattice) -> Landmarks:
+        '''
+        Loads landmarks saved with save() for the given lattice. If the lattice's walls changed since, they're
+        rebuilt the first time they're needed (see is_stale()). Raises ValueError if the file isn't a landmarks file,
+        is of an unsupported version, is for a lattice of different dimensions, or is corrupt.
+        '''
+
+        with open(path, 'rb') as f:
+            header = f.read(LANDMARKS_FILE_HEADER.size)
+            if len(header) < LANDMARKS_FILE_HEADER.size:
+                raise ValueError(f'{path} is not a landmarks file')
+            (
+                magic,
+                version,
+                itemsize,
+                nrows,
+                ncols,
+                num_landmarks,
+            ) = LANDMARKS_FILE_HEADER.unpack(header)
+            if magic != LANDMARKS_FILE_MAGIC:
+                raise ValueError(f'{path} is not a landmarks file')
+            if version != LANDMARKS_FILE_VERSION:
+                raise ValueError(f'Unsupported landmarks file version {version}')
+            if (nrows, ncols) != tuple(lattice.get_dim()):
+                raise ValueError(f'{path} is for a lattice of a different size')
+            if itemsize not in [2, 4]:
+                raise ValueError(f'{path} has invalid distances of {itemsize} bytes')
+            positions = np.frombuffer(f.read(8 * num_landmarks), dtype='<i4')
+            walls = np.unpackbits(
+                np.frombuffer(f.read((nrows * ncols + 7) // 8), dtype=np.uint8),
+                count=nrows * ncols,
+            )
+            dtype = np.dtype(f'<u{itemsize}')
+            distances = np.frombuffer(
+                f.read(nrows * ncols * num_landmarks * itemsize), dtype=dtype
+            )
+        if len(distances) != nrows * ncols * num_landmarks:
+            raise ValueError(f'{path} is truncated')
+        if len(positions) != 2 * num_landmarks or len(walls) != nrows * ncols:
+            raise ValueError(f'{path} is truncated')
+
+        return cls(
+            lattice,
+            walls.reshape(nrows, ncols).astype(bool),
+            [Pos(int(r), int(c)) for r, c in positions.reshape(-1, 2)],
+            distances.reshape(nrows * ncols, num_landmarks),
+        )
+
+
+def get_distances(lattice: Lattice, pos: Pos) -> np.ndarray:
+    '''
+    Returns the distance from the given cell to every cell of the lattice as a flat array (UNREACHABLE if there's no
+    path).
+    '''
+
+    return FlowField(lattice, pos).get_distances().ravel().astype(np.int64)
@@ -1,12 +1,31 @@
+from __future__ import (
+    annotations,
+)  # Annotations aren't evaluated, so that pygame types can be used in them without importing pygame
+import os
 import math
+import heapq
 import random
-import pygame as pg
-from typing import Dict, List, Tuple, Optional
-from collections import namedtuple, defaultdict
-
-from enums import DrawMode, NodeState, PathfindingOption
+import struct
+import time
+import numpy as np
+from typing import TYPE_CHECKING, Dict, Iterator, List, Tuple, Optional, Union
+from contextlib import contextmanager, nullcontext
+from collections import namedtuple, deque
+
+from enums import DrawMode, MazeOption, NodeState, PathfindingOption
+from DisjointSet import DisjointSet
+from SearchScratch import SearchScratch, SparseSearchScratch
+from ChunkedStates import ChunkedStates
+from SearchStats import SearchStats
+from EventLog import EventLogWriter
+from FlowField import FlowField, UNREACHABLE
+from Landmarks import DEFAULT_NUM_LANDMARKS, LANDMARKS_FILE_SUFFIX, Landmarks
+from GenerationCache import GenerationCache
 from Node import Node, NUM_COLOURS_IN_TRANSITION, Pos, node_colour_ranges
 
+if TYPE_CHECKING:
+    import pygame as pg
+
 ScreenDim = namedtuple('ScreenDim', ['w', 'h'])
 LatticeDim = namedtuple('LatticeDim', ['nrows', 'ncols'])
 LatticeInfo = namedtuple('LatticeInfo', ['screen_dim', 'node_size'])
@@ -19,6 +38,34 @@ draw_mode_to_node_state_mapping: DrawModeToNodeStateMapping = {
     DrawMode.SET_GOAL: NodeState.GOAL,
 }
 
+# Lattice file format (see Lattice.save()). All values are little-endian.
+LATTICE_FILE_MAGIC = b'LATC'
+LATTICE_FILE_VERSION = 1
+LATTICE_FILE_HAS_COSTS = 1  # Flag bit, set if the file contains a cost layer
+# magic, version, flags, nrows, ncols, node size, origin (r, c), goal (r, c). Rows and columns are -1 if not set.
+LATTICE_FILE_HEADER = struct.Struct('<4sHHIIIiiii')
+LATTICE_FILE_ALIGNMENT = 8  # Layers start at offsets which are a multiple of this
+
+# Lookup table from a (byte) character of a Moving AI .map file to the value of the NodeState it's loaded as
+MOVINGAI_PASSABLE_CHARS = b'.GS'
+MOVINGAI_CHAR_TO_STATE_VALUE = np.full(256, NodeState.WALL.value, dtype=np.uint8)
+MOVINGAI_CHAR_TO_STATE_VALUE[list(MOVINGAI_PASSABLE_CHARS)] = NodeState.VACANT.value
+
+# States which are only set by searches, and are cleared once a new search starts
+SEARCH_RESULT_STATES = [NodeState.VISITED, NodeState.PATH]
+
+# Colour of agents moving along a flow field (see render_agents()), and their size relative to a node
+AGENT_COLOUR = (30, 90, 220)
+AGENT_SIZE_RATIO = 0.6
+
+# Default maximum number of entries in the transposition table of IDA* (see ida_star())
+DEFAULT_TRANSPOSITION_TABLE_SIZE = 2**18
+
+# Default number of generations find_path_through_life() searches before giving up
+DEFAULT_MAX_GENERATIONS = 1000
+# Seconds every generation is shown for when a path through the Game of Life is played back
+LIFE_PATH_STEP_DELAY = 0.05
+
 NODE_STATES_WITH_TRANSITION_COLOURS = [
     node_state
     for node_state in node_colour_ranges
@@ -31,12 +78,25 @@ class Lattice:
     2D array, where each singular value is of the class Node.
     '''
 
-    def __init__(self, pg_screen: pg.surface.Surface, lattice_info) -> None:
+    def __init__(
+        self,
+        pg_screen: Optional[pg.surface.Surface],
+        lattice_info,
+        states: Optional[np.ndarray] = None,
+        chunked: bool = False,
+    ) -> None:
         '''
-        Initializes the lattice with nodes that have the value NodeState.VACANT.
+        Initializes the lattice with nodes that have the value NodeState.VACANT. The states of all nodes are kept
+        in a single 2D array (self.states), and each Node reads and writes its own cell of it. If pg_screen is None,
+        the lattice is headless: everything works the same, but nothing is rendered. If states is given, the lattice
+        is backed by that (nrows x ncols, uint8) array instead, without copying it, e.g. one in shared memory.
+
+        If chunked is True, the states are kept in a ChunkedStates instead, and the search scratch data in a
+        SparseSearchScratch, so that memory grows with the number of non-vacant nodes and the size of searches rather
+        than with the area of the lattice. Nodes, searches and editing work the same, but operations on the whole
+        state array at once (see check_dense()) aren't supported.
         '''
 
-        self.values = []
         self.info = lattice_info
         self.draw_mode = DrawMode.SET_WALL
         self.ncols = lattice_info.screen_dim.w // lattice_info.node_size
@@ -44,15 +104,41 @@ class Lattice:
         self.origin = None
         self.goal = None
         self.pg_screen = pg_screen
+        self.chunked = chunked
+        if chunked:
+            self.states = ChunkedStates((self.nrows, self.ncols))
+        elif states is None:
+            self.states = np.full(
+                (self.nrows, self.ncols), NodeState.VACANT.value, dtype=np.uint8
+            )
+        else:
+            self.states = states
         self.previously_rendered_nodes = (
             {}
         )  # Contains nodes which have been rendered since beginning of the animation. Used to enable gradient animation on nodes as visualization progresses
-
-        for r in range(self.nrows):
-            row = []
-            for c in range(self.ncols):
-                row.append(Node(Pos(r, c)))
-            self.values.append(row)
+        # Optional per-node cost layer, which is saved and loaded along with the lattice. The searches don't use it yet, i.e. all weights are 1.
+        self.costs: Optional[np.ndarray] = None
+        self.scratch = (
+            SparseSearchScratch() if chunked else SearchScratch(self.nrows * self.ncols)
+        )
+        # Nodes set to one of SEARCH_RESULT_STATES since the last search started, i.e. the only nodes that need to be cleared and redrawn before the next one
+        self.search_result_nodes: List[Node] = []
+        # Only set while an instrumented visualization is running
+        self.stats: Optional[SearchStats] = None
+        # If False, searches leave the state array untouched instead of setting nodes to SEARCH_RESULT_STATES (see find_path())
+        self.record_search_results = True
+        # Landmarks for the ALT heuristic, only built once an ALT search needs them (see get_landmarks())
+        self.num_landmarks = DEFAULT_NUM_LANDMARKS
+        self.landmarks: Optional[Landmarks] = None
+        # Maximum number of entries in the transposition table of IDA*, 0 for none, None for no limit
+        self.transposition_table_size: Optional[int] = DEFAULT_TRANSPOSITION_TABLE_SIZE
+        # Only set while a recording is running (see recording())
+        self.event_log: Optional[EventLogWriter] = None
+
+        # Node objects are only created the first time they're needed (see get_node()), so that constructing
+        # a lattice doesn't depend on the number of nodes in it. On a chunked lattice, vacant ones are dropped again
+        # once a search is done with them (see evict_vacant_nodes()).
+        self.nodes: Dict[Tuple[int, int], Node] = {}
 
     def get_info(self) -> LatticeInfo:
         '''
@@ -62,6 +148,14 @@ class Lattice:
 
         return self.info
 
+    def set_pg_screen(self, pg_screen: Optional[pg.surface.Surface]) -> None:
+        '''
+        Sets the surface the lattice is rendered on. Used to attach a screen to a lattice that was created headless
+        (e.g. loaded from a file before the window was created). If None, the lattice becomes headless.
+        '''
+
+        self.pg_screen = pg_screen
+
     def get_dim(self) -> LatticeDim:
         '''
         Returns a namedtuple LatticeDim containing the number of rows and number of columns in the lattice.
@@ -75,7 +169,43 @@ class Lattice:
         Given the row and column index, returns the specific node from the 2D array of values.
         '''
 
-        return self.values[r][c]
+        node = self.nodes.get((r, c))
+        if node is None:
+            node = self.nodes[r, c] = Node(Pos(r, c), states=self.states)
+        return node
+
+    def evict_vacant_nodes(self) -> None:
+        '''
+        On a chunked lattice, drops the Node objects of vacant nodes, which get_node() creates again when they're
+        needed, so that the number of Node objects grows with what's on the lattice rather than with the searches run
+        on it. Nodes whose colour transition is still running are kept.
+        '''
+
+        if not self.chunked:
+            return
+        self.nodes = {
+            pos: node
+            for pos, node in self.nodes.items()
+            if node.get_state() != NodeState.VACANT
+            or node in self.previously_rendered_nodes
+        }
+
+    def get_flat_index(self, node: Node) -> int:
+        '''
+        Given a node, returns its index in the flattened lattice, i.e. r * ncols + c. Search scratch data is
+        addressed this way.
+        '''
+
+        pos = node.get_pos()
+        return pos.r * self.ncols + pos.c
+
+    def get_node_from_flat_index(self, index: int) -> Node:
+        '''
+        Given an index in the flattened lattice, returns the node at that index.
+        '''
+
+        r, c = divmod(index, self.ncols)
+        return self.get_node(r, c)
 
     def get_origin(self) -> Optional[Node]:
         '''
@@ -115,11 +245,79 @@ class Lattice:
         x, y = pos.r * self.info.node_size, pos.c * self.info.node_size
         return (x, y)
 
+    def check_dense(self, operation: str) -> None:
+        '''
+        Raises a ValueError if the lattice is chunked, for operations which work on the whole state array at once.
+        '''
+
+        if self.chunked:
+            raise ValueError(f'{operation} is not supported on a chunked lattice')
+
+    @contextmanager
+    def counting(self) -> Iterator[SearchStats]:
+        '''
+        Context manager which records the counters (but not the times) of the searches run in it in the SearchStats it
+        yields, e.g. the number of nodes expanded, which counts every expansion of a node that's expanded more than
+        once (as by fringe_search() and ida_star()).
+        '''
+
+        self.stats = SearchStats(timed=False)
+        try:
+            yield self.stats
+        finally:
+            self.stats = None
+
+    def span(self, phase: str):
+        '''
+        Context manager which times the code in it as the given phase (see SearchStats.PHASES) if a visualization is
+        being instrumented, else does nothing.
+        '''
+
+        return (
+            self.stats.span(phase) if self.stats and self.stats.timed else nullcontext()
+        )
+
+    @contextmanager
+    def recording(self, path: Optional[str]):
+        '''
+        Context manager which records every render in it to an event log at the given path (see EventLogWriter), so
+        that it can be replayed later (see replay.py). Does nothing if path is None.
+        '''
+
+        if path is None:
+            yield
+            return
+        self.check_dense('Recording')
+        self.event_log = EventLogWriter(path, self.states, self.info.node_size)
+        try:
+            yield
+        finally:
+            self.event_log.close()
+            self.event_log = None
+
+    def record_frame(self, nodes: Optional[List[Node]] = None) -> None:
+        '''
+        Records the state changes of the given rendered nodes (of all nodes if not given, for full redraws) as a frame
+        of the event log, if a recording is running. Called before anything is rendered, so headless lattices can be
+        recorded too.
+        '''
+
+        if self.event_log is None:
+            return
+        if nodes is None:
+            self.event_log.record_all()
+        else:
+            self.event_log.record(
+                np.array([self.get_flat_index(node) for node in nodes], dtype=np.int64)
+            )
+
     def get_rect_from_node(self, node: Node) -> pg.rect.Rect:
         '''
         Gets a pygame Rect object from a given node.
         '''
 
+        import pygame as pg  # pygame is only imported once something is rendered, so headless use never loads it
+
         x, y = self.get_node_coords(node)
         render_number = self.previously_rendered_nodes.get(node, None)
         colour = node.get_colour(render_number)
@@ -135,23 +333,73 @@ class Lattice:
         Draws the lattice configuration.
         '''
 
-        new_rects = []
-        for r in range(self.nrows):
-            for c in range(self.ncols):
-                node = self.get_node(r, c)
-                new_rect = self.get_rect_from_node(node)
-                new_rects.append(new_rect)
-        pg.display.update(new_rects)  # type: ignore
+        self.record_frame()
+        if self.pg_screen is None:
+            return
+        import pygame as pg
+
+        with self.span('render'):
+            new_rects = []
+            for r in range(self.nrows):
+                for c in range(self.ncols):
+                    node = self.get_node(r, c)
+                    new_rect = self.get_rect_from_node(node)
+                    new_rects.append(new_rect)
+        with self.span('display'):
+            pg.display.update(new_rects)  # type: ignore
 
     def render_nodes(self, nodes: List[Node]) -> None:
         '''
         Renders the given nodes. Leaves rest of the screen untouched (i.e. same as the last render)
         '''
 
-        node_rects = []
-        for node in nodes:
-            node_rects.append(self.get_rect_from_node(node))
-        pg.display.update(node_rects)
+        self.record_frame(nodes)
+        if self.pg_screen is None:
+            return
+        import pygame as pg
+
+        with self.span('render'):
+            node_rects = []
+            for node in nodes:
+                node_rects.append(self.get_rect_from_node(node))
+        with self.span('display'):
+            pg.display.update(node_rects)
+
+    def render_agents(
+        self, agents: np.ndarray, previous_agents: Optional[np.ndarray] = None
+    ) -> None:
+        '''
+        Draws agents (an array of (r, c) rows, see FlowField.step_agents()) as an overlay on top of the lattice. The
+        nodes under previous_agents (if given) are redrawn first, to erase the agents from where they were. Agents on
+        the same node are drawn once, and the screen is updated once for all of them.
+        '''
+
+        if self.pg_screen is None:
+            return
+        import pygame as pg
+
+        with self.span('render'):
+            rects = []
+            if previous_agents is not None:
+                for r, c in np.unique(previous_agents, axis=0).tolist():
+                    rects.append(self.get_rect_from_node(self.get_node(r, c)))
+            node_size = self.info.node_size
+            agent_size = max(1, round(node_size * AGENT_SIZE_RATIO))
+            margin = (node_size - agent_size) // 2
+            for r, c in np.unique(agents, axis=0).tolist():
+                rects.append(
+                    self.pg_screen.fill(
+                        AGENT_COLOUR,
+                        pg.Rect(
+                            r * node_size + margin,
+                            c * node_size + margin,
+                            agent_size,
+                            agent_size,
+                        ),
+                    )
+                )
+        with self.span('display'):
+            pg.display.update(rects)
 
     def handle_node_rendering(self, latest_rendered_node: Optional[Node] = None):
         '''
@@ -161,6 +409,12 @@ class Lattice:
         of a particular state change to be the same colour.
         '''
 
+        if (
+            self.pg_screen is None
+        ):  # Headless, so there are no colour transitions to keep track of
+            if latest_rendered_node:
+                self.record_frame([latest_rendered_node])
+            return
         # Nodes which have already reached the last colour in the transition phase, after which they don't need to be updated, so they can be removed from self.previously_rendered_nodes
         if latest_rendered_node:
             self.previously_rendered_nodes[
@@ -199,7 +453,18 @@ class Lattice:
         if self.get_goal() == node and new_state != NodeState.GOAL:
             self.goal = None
         node.set_state(new_state)
-        self.handle_node_rendering(node)
+        if new_state in SEARCH_RESULT_STATES:
+            self.search_result_nodes.append(node)
+        with self.span('render'):
+            self.handle_node_rendering(node)
+
+    def mark_search_result(self, node: Node, new_state: NodeState) -> None:
+        '''
+        Sets a node to one of SEARCH_RESULT_STATES and renders it, unless search results aren't being recorded.
+        '''
+
+        if self.record_search_results:
+            self.update_node_state_and_render(node, new_state)
 
     def handle_end_transitions(self) -> None:
         '''
@@ -216,7 +481,7 @@ class Lattice:
         This function is used for user-input: drawing walls, setting the goal and origin, etc.
         '''
 
-        node = self.values[pos.r][pos.c]
+        node = self.get_node(pos.r, pos.c)
         new_state = draw_mode_to_node_state_mapping[
             self.draw_mode
         ]  # Get the appropriate NodeState based on draw_mode.
@@ -233,6 +498,65 @@ class Lattice:
 
         self.update_node_state_and_render(node, new_state)
 
+    def draw_stroke(self, positions: List[Pos], brush_radius: int = 0) -> None:
+        '''
+        Applies user input along a stroke, i.e. the line through the given positions (e.g. the mouse positions since
+        the last frame, in order), with the given brush radius. Like change_node_state_on_user_input(), the new state
+        depends on draw_mode, but all nodes covered by the stroke are set in one batch, and rendered with a single
+        screen update. Consecutive positions are joined with Bresenham's line algorithm, so that fast mouse movements
+        don't leave gaps. The origin and goal are a single node each, so for those only the last position is used.
+        '''
+
+        new_state = draw_mode_to_node_state_mapping[self.draw_mode]
+        if new_state in [NodeState.ORIGIN, NodeState.GOAL]:
+            self.change_node_state_on_user_input(positions[-1])
+            return
+
+        line = positions[:1]
+        for start, end in zip(positions, positions[1:]):
+            line.extend(get_line_positions(start, end)[1:])
+        brush_offsets = get_brush_offsets(brush_radius)
+        covered = {(pos.r + dr, pos.c + dc) for pos in line for dr, dc in brush_offsets}
+
+        nodes_to_render = []
+        for r, c in covered:
+            if not (0 <= r < self.nrows and 0 <= c < self.ncols):
+                continue
+            node = self.get_node(r, c)
+            if node.get_state() == new_state:
+                continue
+            if node == self.origin:
+                self.origin = None
+            if node == self.goal:
+                self.goal = None
+            node.set_state(new_state)
+            # Drawn over, so it mustn't be rendered with its previous state's colour transition
+            self.previously_rendered_nodes.pop(node, None)
+            nodes_to_render.append(node)
+        self.render_nodes(nodes_to_render)
+
+    def set_origin(self, pos: Pos) -> None:
+        '''
+        Sets the node at the given position as the origin, and the previous origin (if any) back to NodeState.VACANT.
+        Unlike change_node_state_on_user_input(), doesn't depend on draw_mode.
+        '''
+
+        if self.origin:
+            self.update_node_state_and_render(self.origin, NodeState.VACANT)
+        self.origin = self.get_node(pos.r, pos.c)
+        self.update_node_state_and_render(self.origin, NodeState.ORIGIN)
+
+    def set_goal(self, pos: Pos) -> None:
+        '''
+        Sets the node at the given position as the goal, and the previous goal (if any) back to NodeState.VACANT.
+        Unlike change_node_state_on_user_input(), doesn't depend on draw_mode.
+        '''
+
+        if self.goal:
+            self.update_node_state_and_render(self.goal, NodeState.VACANT)
+        self.goal = self.get_node(pos.r, pos.c)
+        self.update_node_state_and_render(self.goal, NodeState.GOAL)
+
     def get_neighbours(self, node: Node) -> List[Node]:
         '''
         Given a node, returns a list of all the neighbouring nodes.
@@ -241,13 +565,13 @@ class Lattice:
         neighbours = []
         r, c = node.get_pos().r, node.get_pos().c
         if r > 0:
-            neighbours.append(self.values[r - 1][c])
+            neighbours.append(self.get_node(r - 1, c))
         if r < self.nrows - 1:
-            neighbours.append(self.values[r + 1][c])
+            neighbours.append(self.get_node(r + 1, c))
         if c > 0:
-            neighbours.append(self.values[r][c - 1])
+            neighbours.append(self.get_node(r, c - 1))
         if c < self.ncols - 1:
-            neighbours.append(self.values[r][c + 1])
+            neighbours.append(self.get_node(r, c + 1))
         return neighbours
 
     def display_path_to_origin(self, node) -> None:
@@ -258,18 +582,28 @@ class Lattice:
         step is added to a list which would be reversed, and then would be visualized.
         '''
 
-        path = []
-        while node.get_predecessor():  # Prints the path from goal to origin
+        for node in self.get_path(node):
             if node.get_state() not in [
                 NodeState.ORIGIN,
                 NodeState.GOAL,
             ]:  # Doesn't overrwrite states of the origin and the goal
-                path.append(node)
-            node = node.get_predecessor()
+                self.mark_search_result(node, NodeState.PATH)
 
+    def get_path(self, node: Node) -> List[Node]:
+        '''
+        Returns the path found by the last search from the origin to the given node (both included), by following the
+        node's predecessors back to the origin. Empty if the node wasn't reached.
+        '''
+
+        path = []
+        index = self.get_flat_index(node)
+        if not self.scratch.is_reached(index):
+            return path
+        while index is not None:  # Goes through the path from the node to origin
+            path.append(self.get_node_from_flat_index(index))
+            index = self.scratch.get_predecessor(index)
         path.reverse()
-        for node in path:
-            self.update_node_state_and_render(node, NodeState.PATH)
+        return path
 
     def dfs(self) -> bool:
         '''
@@ -278,29 +612,39 @@ class Lattice:
         the order of the if conditions, this direction might be changed.
         '''
 
+        self.scratch.update(self.get_flat_index(self.origin), 0, None)
         stack = [self.origin]
+        if self.stats:
+            self.stats.update_frontier(len(stack))
         while stack:
             node = stack.pop()
+            if self.stats:
+                self.stats.frontier_pops += 1
             if node == self.goal:
                 self.display_path_to_origin(node)
                 return True
-            if node and node.get_state() not in [
-                NodeState.WALL,
-                NodeState.VISITED,
-            ]:  # The `if node` is just to suppress mypy warnings
-                self.update_node_state_and_render(
+            index = self.get_flat_index(node)
+            if not self.scratch.is_visited(
+                index
+            ):  # A node can be on the stack more than once, so it might have been visited since it was pushed
+                self.scratch.mark_visited(index)
+                if self.stats:
+                    self.stats.nodes_expanded += 1
+                self.mark_search_result(
                     node, NodeState.VISITED
                 ) if node.get_state() != NodeState.ORIGIN else ''
                 for neighbour in self.get_neighbours(node):
-                    if neighbour.get_state() not in [
-                        NodeState.WALL,
-                        NodeState.VISITED,
-                        NodeState.ORIGIN,
-                    ]:
-                        neighbour.set_predecessor(
-                            node
+                    neighbour_index = self.get_flat_index(neighbour)
+                    if (
+                        neighbour.get_state() != NodeState.WALL
+                        and not self.scratch.is_visited(neighbour_index)
+                    ):
+                        self.scratch.update(
+                            neighbour_index, self.scratch.get_g(index) + 1, index
                         )  # When adding a neighbour to the stack, mark the predecessor as the current node so that we have a route back to the origin once the goal is found
                         stack.append(neighbour)
+                        if self.stats:
+                            self.stats.update_frontier(len(stack))
         return False
 
     def bfs(self) -> bool:
@@ -308,33 +652,35 @@ class Lattice:
         Does a Breadth-first Search from the given origin node to the goal node.
         '''
 
-        queue = [self.origin]
+        self.scratch.update(self.get_flat_index(self.origin), 0, None)
+        queue = deque([self.origin])
+        if self.stats:
+            self.stats.update_frontier(len(queue))
         while queue:
-            for _ in range(len(queue)):
-                node = queue.pop(0)
-                if node == self.goal:
-                    self.display_path_to_origin(node)
-                    return True
-                if node and node.get_state() not in [
-                    NodeState.WALL,
-                    NodeState.VISITED,
-                ]:  # If node isn't visited or isn't a wall, mark as visited, if isn't isn't an origin node. Also, note to self: I was confused as to why we need to check if
-                    # a node is visited or not again when we're already checking for that below when adding the neighbours into the queue. The reason is because a particular
-                    # node might exist in the queue at a certain point in time more than once. I.e. node c being a neighbour of a, node c being a neighbour of b, and node
-                    # b being a neighbour of a. When a is being processed, c will be added. Next, when b is processed, c will also be added. Since the same node can be added
-                    # multiple times into the queue, we need to check if it's visited again.
-                    self.update_node_state_and_render(
-                        node, NodeState.VISITED
-                    ) if node.get_state() != NodeState.ORIGIN else ''
-                    for neighbour in self.get_neighbours(node):
-                        if neighbour.get_state() not in [
-                            NodeState.WALL,
-                            NodeState.VISITED,
-                            NodeState.ORIGIN,  # As far as I can tell, the last state (NodeState.ORIGIN) is only in this list for BFS because a predecessor was being set on the origin node,
-                            # which isn't supposed to happen. We don't need to check if state is NodeState.GOAL because algorithm terminates immediately when the goal node is found
-                        ]:
-                            neighbour.set_predecessor(node)
-                            queue.append(neighbour)
+            node = queue.popleft()
+            if self.stats:
+                self.stats.frontier_pops += 1
+            if node == self.goal:
+                self.display_path_to_origin(node)
+                return True
+            index = self.get_flat_index(node)
+            self.scratch.mark_visited(index)
+            if self.stats:
+                self.stats.nodes_expanded += 1
+            self.mark_search_result(
+                node, NodeState.VISITED
+            ) if node.get_state() != NodeState.ORIGIN else ''
+            for neighbour in self.get_neighbours(node):
+                neighbour_index = self.get_flat_index(neighbour)
+                if neighbour.get_state() != NodeState.WALL and not self.scratch.is_reached(
+                    neighbour_index
+                ):  # Only the first time a node is reached sets its predecessor, which is what makes the path a shortest one. It also means every node is added to the queue at most once.
+                    self.scratch.update(
+                        neighbour_index, self.scratch.get_g(index) + 1, index
+                    )
+                    queue.append(neighbour)
+                    if self.stats:
+                        self.stats.update_frontier(len(queue))
         return False
 
     def dijkstra(self) -> bool:
@@ -342,49 +688,12 @@ class Lattice:
         Finds a path from origin to goal. Currently, squares on a grid cannot be assigned weights (they can, but it's hard to visualize).
         Because of this, weights between nodes are all by default to 1.
 
-        This implementation, instead of using a priority queue, uses a mapping (defauldict with default distance of infinity) of a node to its distance.
-        A Node object's state is internal, so we do not need to check externally whether or node a node has been visited through the use of a typical priority queue.
-        We can just check if a node's state has been marked as visited, compared to the typical implementation where we check if it exists in a priority queue.
+        Distances (g-values) and predecessors live in the search scratch buffers, and the frontier is a binary heap of
+        (distance, flat index) entries. Instead of decreasing keys, a node is pushed again whenever a shorter distance to it
+        is found, and entries of nodes that have already been visited are skipped when popped.
         '''
 
-        dist = defaultdict(lambda: float('inf'))
-        dist[self.origin] = 0
-        node = self.origin
-        while True:
-            if node.get_state() != NodeState.ORIGIN:
-                self.update_node_state_and_render(node, NodeState.VISITED)
-            neighbours = self.get_neighbours(node)
-            unvisited_neighbours = list(
-                filter(
-                    lambda n: n.get_state()
-                    not in [NodeState.VISITED, NodeState.ORIGIN, NodeState.WALL],
-                    neighbours,
-                )
-            )
-            for neighbour in unvisited_neighbours:
-                if (
-                    dist[node] + 1 < dist[neighbour]
-                ):  # If current distance to a node is smaller than any previous possible distance, update it. Every node is only 1 node away from other nodes due to the fact that this is a nxn grid with no weights.
-                    dist[neighbour] = dist[node] + 1
-                    neighbour.set_predecessor(
-                        node
-                    )  # Whenever we visit a node, mark the predecessor so that when a path is found, we can backtrack back to origin.
-                if neighbour == self.goal:
-                    self.display_path_to_origin(neighbour)
-                    return True
-            # "Priority Queue"
-            smallest_path_dist, smallest_path_node = float('inf'), None
-            for node in dist.keys():
-                if dist[node] < smallest_path_dist and node.get_state() not in [
-                    NodeState.VISITED,
-                    NodeState.ORIGIN,
-                    NodeState.WALL,
-                ]:
-                    smallest_path_dist = dist[node]
-                    smallest_path_node = node
-            node = smallest_path_node
-            if not node:
-                break
+        return self.best_first_search(lambda node: 0)
 
     def a_star(self) -> bool:
         '''
@@ -392,90 +701,345 @@ class Lattice:
         Because of this, weights between nodes are all by default to 1. Heuristic is euclidean distance, by assuming lattice nodes exist
         in the 4th quadrant of an axis. This is why the y co-ords are negated, although I'm not sure it makes much of a difference.
 
-        The heuristic is only considered when choosing which node to select out of a node's neighbours. We do not add it to the distance
-        when updating distance from origin node.
+        The heuristic is only considered when choosing which node to select from the frontier. We do not add it to the distance
+        when updating distance from origin node. It is calculated when a node is first pushed, instead of for every node up front.
         '''
 
-        dist = defaultdict(lambda: float('inf'))
-        dist[self.origin] = 0
-        node = self.origin
-
-        # Calculating the initial heuristic values using Euclidean distances
         goal_pos = self.get_goal().get_pos()
         x1, y1 = goal_pos.r, -goal_pos.c
-        for r in range(self.nrows):
-            for c in range(self.ncols):
-                node_pos = self.get_node(r, c).get_pos()
-                x2, y2 = node_pos.r, -node_pos.c
-                euclid_distance = math.sqrt(((x2 - x1) ** 2) + ((y2 - y1) ** 2))
-                self.get_node(r, c).set_heuristic(euclid_distance)
 
-        while True:
+        def euclidean_distance(node: Node) -> float:
+            node_pos = node.get_pos()
+            x2, y2 = node_pos.r, -node_pos.c
+            return math.sqrt(((x2 - x1) ** 2) + ((y2 - y1) ** 2))
+
+        return self.best_first_search(euclidean_distance)
+
+    def alt(self) -> bool:
+        '''
+        A* with the ALT heuristic (see Landmarks), which is a lower bound on the distance to the goal that takes walls
+        into account, so far fewer nodes are expanded than with the Euclidean distance on mazes and other lattices
+        with long detours. The landmarks are built the first time they're needed, and rebuilt after walls change.
+        '''
+
+        heuristic = self.get_landmarks().get_heuristic(self.get_flat_index(self.goal))
+        return self.best_first_search(lambda node: heuristic(self.get_flat_index(node)))
+
+    def get_landmarks(self) -> Landmarks:
+        '''
+        Returns the landmarks for the ALT heuristic, (re)building them with self.num_landmarks landmarks if they
+        haven't been built yet or the walls changed since they were.
+        '''
+
+        self.check_dense('ALT')
+        if self.landmarks is None or self.landmarks.is_stale():
+            self.landmarks = Landmarks.build(self, self.num_landmarks)
+        return self.landmarks
+
+    def best_first_search(self, heuristic) -> bool:
+        '''
+        Shared implementation of dijkstra() and a_star(). The frontier is ordered by distance from the origin plus the
+        heuristic value of a node (ties are broken in favour of the smaller heuristic value, i.e. nodes closer to the goal).
+        The search stops when the goal is popped from the frontier, which guarantees the path is a shortest one as long as
+        the heuristic never overestimates.
+        '''
+
+        origin_index = self.get_flat_index(self.origin)
+        self.scratch.update(origin_index, 0, None)
+        origin_heuristic = heuristic(self.origin)
+        heap = [(origin_heuristic, origin_heuristic, origin_index)]
+        if self.stats:
+            self.stats.update_frontier(len(heap))
+        while heap:
+            _, _, index = heapq.heappop(heap)
+            if self.stats:
+                self.stats.frontier_pops += 1
+            if self.scratch.is_visited(index):
+                continue
+            node = self.get_node_from_flat_index(index)
+            if node == self.goal:
+                self.display_path_to_origin(node)
+                return True
+            self.scratch.mark_visited(index)
+            if self.stats:
+                self.stats.nodes_expanded += 1
             if node.get_state() != NodeState.ORIGIN:
-                self.update_node_state_and_render(node, NodeState.VISITED)
-            neighbours = self.get_neighbours(node)
-            unvisited_neighbours = list(
-                filter(
-                    lambda n: n.get_state()
-                    not in [NodeState.VISITED, NodeState.ORIGIN, NodeState.WALL],
-                    neighbours,
-                )
-            )
-            for neighbour in unvisited_neighbours:
-                if (
-                    dist[node] + 1 < dist[neighbour]
+                self.mark_search_result(node, NodeState.VISITED)
+            new_dist = self.scratch.get_g(index) + 1
+            for neighbour in self.get_neighbours(node):
+                neighbour_index = self.get_flat_index(neighbour)
+                if neighbour.get_state() == NodeState.WALL or self.scratch.is_visited(
+                    neighbour_index
+                ):
+                    continue
+                if new_dist < self.scratch.get_g(
+                    neighbour_index
                 ):  # If current distance to a node is smaller than any previous possible distance, update it. Every node is only 1 node away from other nodes due to the fact that this is a nxn grid with no weights.
-                    dist[neighbour] = dist[node] + 1
-                    neighbour.set_predecessor(
-                        node
-                    )  # Whenever we visit a node, mark the predecessor so that when a path is found, we can backtrack back to origin.
-                if neighbour == self.goal:
-                    self.display_path_to_origin(neighbour)
+                    self.scratch.update(
+                        neighbour_index, new_dist, index
+                    )  # Whenever we find a shorter distance to a node, mark the predecessor so that when a path is found, we can backtrack back to origin.
+                    neighbour_heuristic = heuristic(neighbour)
+                    heapq.heappush(
+                        heap,
+                        (
+                            new_dist + neighbour_heuristic,
+                            neighbour_heuristic,
+                            neighbour_index,
+                        ),
+                    )
+                    if self.stats:
+                        self.stats.update_frontier(len(heap))
+        return False
+
+    def get_passable_neighbour_indices(self, index: int) -> List[int]:
+        '''
+        Given a node's flat index, returns the flat indices of its neighbours which aren't walls. Reads the state array
+        directly, so unlike get_neighbours() it doesn't create Node objects.
+        '''
+
+        r, c = divmod(index, self.ncols)
+        neighbours = []
+        for neighbour_r, neighbour_c in [
+            (r - 1, c),
+            (r + 1, c),
+            (r, c - 1),
+            (r, c + 1),
+        ]:
+            if (
+                0 <= neighbour_r < self.nrows
+                and 0 <= neighbour_c < self.ncols
+                and self.states[neighbour_r, neighbour_c] != NodeState.WALL.value
+            ):
+                neighbours.append(neighbour_r * self.ncols + neighbour_c)
+        return neighbours
+
+    def get_manhattan_distance(self, index: int, goal_index: int) -> int:
+        '''
+        Returns the Manhattan distance between two nodes given by their flat indices, which never overestimates the
+        distance between them as moves are horizontal or vertical, and is an integer, so thresholds grow in whole
+        steps (see fringe_search() and ida_star()).
+        '''
+
+        r, c = divmod(index, self.ncols)
+        goal_r, goal_c = divmod(goal_index, self.ncols)
+        return abs(r - goal_r) + abs(c - goal_c)
+
+    def mark_expanded(self, index: int) -> None:
+        '''
+        Counts a node as expanded by fringe_search() or ida_star(), and sets it to NodeState.VISITED if it's vacant.
+        Nodes are only looked up (and therefore created) if search results are being recorded. Nothing is stored in
+        the search scratch data, so that ida_star() doesn't keep an entry for every node it expands.
+        '''
+
+        if self.stats:
+            self.stats.nodes_expanded += 1
+        if self.record_search_results:
+            node = self.get_node_from_flat_index(index)
+            if node.get_state() == NodeState.VACANT:
+                self.mark_search_result(node, NodeState.VISITED)
+
+    def fringe_search(self) -> bool:
+        '''
+        Fringe Search (Björnsson et al., 2005): finds a shortest path with the same threshold iterations as IDA* (see
+        ida_star()), but keeps the frontier between iterations, so nodes aren't generated again in every iteration.
+        The frontier is two plain lists instead of a heap: nodes within the threshold (f = g + h <= threshold) are
+        expanded depth-first from the "now" list, and the others are moved to the "later" list, which becomes the
+        "now" list of the next iteration with the smallest f that was over the threshold as its threshold. Distances
+        and predecessors are cached in the search scratch data, as with the other searches, and the heuristic is the
+        Manhattan distance.
+
+        Entries are (flat index, g) pairs. A node is added again whenever a shorter distance to it is found, and
+        entries whose g isn't the node's current distance anymore are skipped.
+        '''
+
+        origin_index = self.get_flat_index(self.origin)
+        goal_index = self.get_flat_index(self.goal)
+        self.scratch.update(origin_index, 0, None)
+        now = [(origin_index, 0)]
+        later = []
+        threshold = self.get_manhattan_distance(origin_index, goal_index)
+        if self.stats:
+            self.stats.update_frontier(len(now))
+        while now:
+            next_threshold = float('inf')
+            while now:
+                index, g = now.pop()
+                if self.stats:
+                    self.stats.frontier_pops += 1
+                # Skips the entry if a shorter distance to the node was found since it was added
+                if g != self.scratch.get_g(index):
+                    continue
+                f = g + self.get_manhattan_distance(index, goal_index)
+                if f > threshold:
+                    next_threshold = min(next_threshold, f)
+                    later.append((index, g))
+                    continue
+                if index == goal_index:
+                    self.display_path_to_origin(self.goal)
                     return True
-            # "Priority Queue"
-            smallest_path_dist, smallest_path_node = float('inf'), None
-            for node in dist.keys():
-                if dist[
-                    node
-                ] + node.get_heuristic() < smallest_path_dist and node.get_state() not in [
-                    NodeState.VISITED,
-                    NodeState.ORIGIN,
-                    NodeState.WALL,
-                ]:
-                    smallest_path_dist = dist[node] + node.get_heuristic()
-                    smallest_path_node = node
-            node = smallest_path_node
-            if not node:
-                break
-
-    def randomize(self, density: float) -> None:
+                self.mark_expanded(index)
+                for neighbour_index in self.get_passable_neighbour_indices(index):
+                    if g + 1 < self.scratch.get_g(neighbour_index):
+                        self.scratch.update(neighbour_index, g + 1, index)
+                        now.append((neighbour_index, g + 1))
+                        if self.stats:
+                            self.stats.update_frontier(len(now) + len(later))
+            threshold = next_threshold
+            now, later = later, now
+        return False
+
+    def ida_star(self) -> bool:
+        '''
+        Iterative deepening A* (Korf, 1985): repeated depth-first searches from the origin, each of which only follows
+        paths whose f = g + h (Manhattan distance) is at most a threshold. The threshold starts at the origin's
+        heuristic value, and every iteration that doesn't find the goal raises it to the smallest f that was over it,
+        so the first path found is a shortest one.
+
+        Only the current path is kept (with the neighbours left to try at every step of it), so memory grows with the
+        length of the path instead of the number of nodes reached. The search scratch data is only used to store the
+        path once it's found. On lattices, many paths lead to the same node, which
+        without any memory of them get explored over and over. To cut these down, every iteration keeps a
+        transposition table of the shortest distance each node was reached with, up to
+        self.transposition_table_size entries (0 for none, None for no limit), and a node isn't followed again unless
+        it's reached with a shorter distance. Once the table is full, only the nodes already in it are pruned.
+        '''
+
+        origin_index = self.get_flat_index(self.origin)
+        goal_index = self.get_flat_index(self.goal)
+        threshold = self.get_manhattan_distance(origin_index, goal_index)
+        while threshold != float('inf'):
+            path = self.bounded_dfs(origin_index, goal_index, threshold)
+            if isinstance(path, list):
+                for g, index in enumerate(path):
+                    self.scratch.update(index, g, path[g - 1] if g else None)
+                self.display_path_to_origin(self.goal)
+                return True
+            threshold = path
+        return False
+
+    def bounded_dfs(
+        self, origin_index: int, goal_index: int, threshold: int
+    ) -> Union[List[int], float]:
+        '''
+        One iteration of ida_star(): an iterative depth-first search from the origin, which only follows paths whose
+        f is at most the threshold. Returns the path to the goal (flat indices) if it's found, else the smallest f
+        that was over the threshold (infinity if there was none, i.e. the goal can't be reached).
+        '''
+
+        table_size = self.transposition_table_size
+        table: Dict[int, int] = {}
+        next_threshold = float('inf')
+        path = [origin_index]
+        on_path = {origin_index}
+        # Neighbours left to try for every node on the path, closest to the goal last (they're popped)
+        untried = []
+        if origin_index == goal_index:
+            return path
+        while True:
+            index = path[-1]
+            if len(untried) < len(path):  # Expands the node at the end of the path
+                self.mark_expanded(index)
+                untried.append(
+                    sorted(
+                        self.get_passable_neighbour_indices(index),
+                        key=lambda neighbour_index: -self.get_manhattan_distance(
+                            neighbour_index, goal_index
+                        ),
+                    )
+                )
+                if self.stats:
+                    self.stats.update_frontier(len(path))
+            if not untried[-1]:  # Backtracks
+                untried.pop()
+                on_path.remove(path.pop())
+                if not path:
+                    return next_threshold
+                continue
+            neighbour_index = untried[-1].pop()
+            if self.stats:
+                self.stats.frontier_pops += 1
+            if neighbour_index in on_path:
+                continue
+            g = len(path)
+            f = g + self.get_manhattan_distance(neighbour_index, goal_index)
+            if f > threshold:
+                next_threshold = min(next_threshold, f)
+                continue
+            if g >= table.get(neighbour_index, float('inf')):
+                continue
+            if (
+                table_size is None
+                or len(table) < table_size
+                or neighbour_index in table
+            ):
+                table[neighbour_index] = g
+            path.append(neighbour_index)
+            if neighbour_index == goal_index:
+                return path
+            on_path.add(neighbour_index)
+
+    def randomize(
+        self, density: float, seed: Optional[int] = None, cluster_size: int = 0
+    ) -> None:
         '''
         Randomly sets a node to a wall, depending on the density amount specified. Think of
         this as the probability of a certain node being set to a wall.
+
+        The whole wall mask is generated in one go by a numpy.random.Generator, written straight into the state array
+        and rendered once. The same seed always reproduces the same layout. If cluster_size is above 0, the noise is
+        smoothed that many times over each node's 3x3 neighbourhood before thresholding, which clumps the walls into
+        blobs (i.e. clustered obstacles) instead of scattering them. In that case, exactly the given fraction of nodes
+        (rounded down) become walls.
         '''
 
-        self.clear()
-        new_rects = []
-        for r in range(self.nrows):
-            for c in range(self.ncols):
-                if random.uniform(0, 1) < density:
-                    node = self.get_node(r, c)
-                    node.set_state(NodeState.WALL)
-                    new_rect = self.get_rect_from_node(node)
-                    new_rects.append(new_rect)
-        pg.display.update(new_rects)  # type: ignore
+        self.check_dense('randomize()')
+        rng = np.random.default_rng(seed)
+        noise = rng.random((self.nrows, self.ncols))
+        if cluster_size > 0:
+            noise = self.smooth_noise(noise, cluster_size)
+            num_walls = int(density * noise.size)
+            walls = np.zeros(noise.size, dtype=bool)
+            walls[np.argsort(noise, axis=None, kind='stable')[:num_walls]] = True
+            walls = walls.reshape(noise.shape)
+        else:
+            walls = noise < density
+
+        self.origin, self.goal = None, None
+        self.previously_rendered_nodes = {}
+        self.clear_search_scratch()
+        self.states[...] = np.where(walls, NodeState.WALL.value, NodeState.VACANT.value)
+        self.draw()
+
+    @staticmethod
+    def smooth_noise(noise: np.ndarray, num_passes: int) -> np.ndarray:
+        '''
+        Replaces every value with the mean of its 3x3 neighbourhood (edges are padded by repeating the border),
+        num_passes times. Each pass spreads the noise further, so neighbouring values end up correlated.
+        '''
+
+        nrows, ncols = noise.shape
+        for _ in range(num_passes):
+            padded = np.pad(noise, 1, mode='edge')
+            noise = (
+                sum(
+                    padded[dr : dr + nrows, dc : dc + ncols]
+                    for dr in range(3)
+                    for dc in range(3)
+                )
+                / 9
+            )
+        return noise
 
     def fill(self) -> None:
         '''
         Fills the entire grid with walls, i.e. sets all nodes to the state NodeState.WALL.
         '''
 
+        self.check_dense('fill()')
         self.clear()
         self.origin = None
         self.goal = None
-        for r in range(self.nrows):
-            for c in range(self.ncols):
-                self.values[r][c].set_state(NodeState.WALL)
+        self.states.fill(NodeState.WALL.value)
         self.draw()
 
     def get_one_off_neighbours(self, node: Node) -> List:
@@ -485,17 +1049,28 @@ class Lattice:
         vacant from an initially fully filled maze.
         '''
 
-        neighbours = []
-        r, c = node.get_pos().r, node.get_pos().c
+        pos = node.get_pos()
+        return [
+            self.get_node(r, c) for r, c in self.get_one_off_neighbour_positions(pos)
+        ]
+
+    def get_one_off_neighbour_positions(self, pos: Pos) -> List[Pos]:
+        '''
+        Same as get_one_off_neighbours(), but works on positions only so that headless maze generation doesn't
+        have to go through Node objects.
+        '''
+
+        r, c = pos
+        positions = []
         if r > 1:
-            neighbours.append(self.get_node(r - 2, c))
+            positions.append(Pos(r - 2, c))
         if r < self.nrows - 2:
-            neighbours.append(self.get_node(r + 2, c))
+            positions.append(Pos(r + 2, c))
         if c > 1:
-            neighbours.append(self.get_node(r, c - 2))
+            positions.append(Pos(r, c - 2))
         if c < self.ncols - 2:
-            neighbours.append(self.get_node(r, c + 2))
-        return neighbours
+            positions.append(Pos(r, c + 2))
+        return positions
 
     def get_node_between(self, node_a: Node, node_b: Node) -> Node:
         '''
@@ -517,7 +1092,27 @@ class Lattice:
             )  # If both nodes are on the same row, return the node in the middle (i.e. different row)
         return self.get_node(r, c)
 
-    def generate_maze(self) -> None:
+    def generate_maze(
+        self,
+        option: MazeOption = MazeOption.RECURSIVE_BACKTRACKING,
+        record_path: Optional[str] = None,
+    ) -> None:
+        '''
+        Generates a maze using the given maze generation algorithm. Recursive backtracking is animated node by node,
+        Kruskal's and Wilson's algorithms run headless on the state array and render the finished maze in one go. If
+        record_path is given, the generation is recorded to an event log there (see recording()).
+        '''
+
+        self.check_dense('generate_maze()')
+        with self.recording(record_path):
+            if option == MazeOption.RECURSIVE_BACKTRACKING:
+                self.recursive_backtracking_maze()
+            elif option == MazeOption.KRUSKAL:
+                self.kruskal_maze()
+            elif option == MazeOption.WILSON:
+                self.wilson_maze()
+
+    def recursive_backtracking_maze(self) -> None:
         '''
         Generates a maze using an iterative version of recrusive backtracking (using DFS). Usually, maze generation
         algorithms shown on Wikipedia were algorithms meant for walls with "0" thickness, but since in my implementation
@@ -567,6 +1162,102 @@ class Lattice:
                 stack.append(rand_unvisited_neighbour)
         self.draw()
 
+    def reset_to_maze_grid(self) -> None:
+        '''
+        Prepares the lattice for headless maze generation: every node becomes a wall, except the maze cells, which
+        are the nodes with an odd row and an odd column index (the same nodes recursive_backtracking_maze() carves
+        out, starting from (1, 1)). Nothing is rendered.
+        '''
+
+        self.origin, self.goal = None, None
+        self.previously_rendered_nodes = {}
+        self.clear_search_scratch()
+        self.states.fill(NodeState.WALL.value)
+        self.states[1::2, 1::2] = NodeState.VACANT.value
+
+    def get_maze_cell_index(self, pos: Pos) -> int:
+        '''
+        Given the position of a maze cell (odd row and odd column), returns its index among all the maze cells.
+        '''
+
+        return (pos.r // 2) * (self.ncols // 2) + (pos.c // 2)
+
+    def kruskal_maze(self) -> None:
+        '''
+        Generates a maze using randomized Kruskal's algorithm. Every maze cell starts off in a set of its own, and the
+        walls between neighbouring cells are visited in a random order. A wall is removed only if the two cells it
+        separates are in different sets, in which case the sets are merged. Set membership is kept in a DisjointSet,
+        so each check and merge is near constant time, and there's no stack that grows with the size of the maze.
+
+        Compared to recursive backtracking, the resulting mazes have lots of short dead ends and a much higher
+        branching factor.
+        '''
+
+        self.reset_to_maze_grid()
+        walls = []
+        for r in range(1, self.nrows, 2):
+            for c in range(1, self.ncols, 2):
+                for neighbour_pos in self.get_one_off_neighbour_positions(Pos(r, c)):
+                    if neighbour_pos > (r, c):  # Each wall is only added once
+                        walls.append((Pos(r, c), neighbour_pos))
+        random.shuffle(walls)
+
+        cells = DisjointSet((self.nrows // 2) * (self.ncols // 2))
+        for pos_a, pos_b in walls:
+            if cells.union(
+                self.get_maze_cell_index(pos_a), self.get_maze_cell_index(pos_b)
+            ):
+                self.states[
+                    (pos_a.r + pos_b.r) // 2, (pos_a.c + pos_b.c) // 2
+                ] = NodeState.VACANT.value
+        self.draw()
+
+    def wilson_maze(self) -> None:
+        '''
+        Generates a maze using Wilson's algorithm, which picks uniformly at random from all possible mazes (i.e.
+        generates a uniform spanning tree of the maze cells). Mazes generated this way have no bias towards long
+        corridors (like recursive backtracking) or short dead ends (like Kruskal's).
+
+        Algorithm:
+
+        1) Add a random cell to the maze
+        2) For every cell not in the maze yet:
+            1) Do a random walk from that cell until a cell in the maze is hit. For every cell, only the direction it
+               was last left in is remembered, which erases any loops the walk made.
+            2) Retrace the walk from the starting cell using the remembered directions, adding every cell on the way
+               to the maze and removing the walls in between.
+        '''
+
+        self.reset_to_maze_grid()
+        self.states[1::2, 1::2] = NodeState.WALL.value
+        cells = [
+            Pos(r, c) for r in range(1, self.nrows, 2) for c in range(1, self.ncols, 2)
+        ]
+        if not cells:
+            return
+        in_maze = np.zeros((self.nrows, self.ncols), dtype=bool)
+        first_cell = random.choice(cells)
+        in_maze[first_cell] = True
+        self.states[first_cell] = NodeState.VACANT.value
+
+        for start_pos in cells:
+            exits = {}  # Maps a cell to the cell the walk last moved to from it
+            pos = start_pos
+            while not in_maze[pos]:
+                next_pos = random.choice(self.get_one_off_neighbour_positions(pos))
+                exits[pos] = next_pos
+                pos = next_pos
+            pos = start_pos
+            while not in_maze[pos]:
+                next_pos = exits[pos]
+                in_maze[pos] = True
+                self.states[pos] = NodeState.VACANT.value
+                self.states[
+                    (pos.r + next_pos.r) // 2, (pos.c + next_pos.c) // 2
+                ] = NodeState.VACANT.value
+                pos = next_pos
+        self.draw()
+
     def get_num_live_neighbours(self, neighbour_indices: List[Tuple[int, int]]) -> int:
         '''
         From all the neighbours of a particular cell, returns the number of cells which have the state NodeState.WALL.
@@ -575,7 +1266,7 @@ class Lattice:
         num_live_neighbours = 0
         for neighbour_index in neighbour_indices:
             r, c = neighbour_index
-            if self.values[r][c].get_state() == NodeState.WALL:
+            if self.states[r, c] == NodeState.WALL.value:
                 num_live_neighbours += 1
         return num_live_neighbours
 
@@ -586,15 +1277,16 @@ class Lattice:
 
         for r in range(self.nrows):
             for c in range(self.ncols):
-                node = self.values[r][c]
+                node = self.get_node(r, c)
                 if node.get_state() in states_to_clear:
                     node.set_state(NodeState.VACANT)
         self.draw()
 
-    def game_of_life(self) -> None:
+    def game_of_life(self, record_path: Optional[str] = None) -> None:
         '''
         Starts an emulation of Conway's Game of Life. NodeState.WALL is considered a live cell, NodeState.VACANT
-        is considered a dead cell.
+        is considered a dead cell. If record_path is given, every generation is recorded to an event log there (see
+        recording()).
 
         Rules:
         1) Any live cell with fewer than two live neighbours dies, as if by underpopulation.
@@ -603,12 +1295,43 @@ class Lattice:
         4) Any dead cell with exactly three live neighbours becomes a live cell, as if by reproduction.
         '''
 
+        self.check_dense('game_of_life()')
+        with self.recording(record_path):
+            self.run_game_of_life()
+
+    def run_game_of_life(self) -> None:
+        '''
+        Runs the Game of Life until evolution stops (see game_of_life()).
+        '''
+
         # 2 lines immediately below are in case someone starts a visualization after doing a pathfinding visualization
         self.origin, self.goal = None, None
         self.clear_certain_state_nodes(
             [NodeState.VISITED, NodeState.PATH, NodeState.ORIGIN, NodeState.GOAL]
         )
 
+        all_neighbour_indices = self.get_all_neighbour_indices()
+        prev_nodes_to_update = []  # Checks if evolution has stopped.
+        evolution_stopped = False
+        while not evolution_stopped:
+            nodes_to_update = self.next_generation(all_neighbour_indices)
+
+            # Takes care of termination state. I wrote this in a jiffy and I don't know how it works and I'm too lazy to try understanding. But hey, it works. So I'm not touching it.
+            for item in prev_nodes_to_update:
+                if nodes_to_update == item:
+                    evolution_stopped = True
+            if len(prev_nodes_to_update) == 1:
+                prev_nodes_to_update.pop(0)
+            prev_nodes_to_update.append(nodes_to_update)
+
+            self.render_nodes(nodes_to_update)
+
+    def get_all_neighbour_indices(self) -> Dict[Node, List[List[int]]]:
+        '''
+        Returns a mapping of every node to the indices of its (up to 8) neighbours, including diagonal ones. Used by
+        next_generation().
+        '''
+
         # Pre-calculating neighbour indices, so that it isn't done every generation. Sure, uses a lot more storage but that isn't a bottleneck.
         positions = [
             [0, 1],
@@ -634,43 +1357,38 @@ class Lattice:
                         and new_c < self.ncols
                     ):
                         neighbour_indices.append([new_r, new_c])
-                all_neighbour_indices[self.values[r][c]] = neighbour_indices
+                all_neighbour_indices[self.get_node(r, c)] = neighbour_indices
+        return all_neighbour_indices
 
-        prev_nodes_to_update = []  # Checks if evolution has stopped.
-        evolution_stopped = False
-        while not evolution_stopped:
-            batch_update_list = (
-                []
-            )  # Since each generation is a pure function of the preceding one, we have to update the node states only after going through all of them once.
-            # A node's next-generation state shouldn't influence any current-generation node's state.
-            for r in range(self.nrows):
-                for c in range(self.ncols):
-                    node = self.get_node(r, c)
-                    neighbour_indices = all_neighbour_indices[node]
-                    num_live_neighbours = self.get_num_live_neighbours(
-                        neighbour_indices
-                    )
-                    is_node_alive = node.get_state() == NodeState.WALL
-                    if is_node_alive:
-                        if num_live_neighbours < 2 or num_live_neighbours > 3:
-                            batch_update_list.append([node, NodeState.VACANT])
-                    elif not is_node_alive and num_live_neighbours == 3:
-                        batch_update_list.append([node, NodeState.WALL])
-            nodes_to_update = []
-            for item in batch_update_list:
-                node, new_state = item
-                node.set_state(new_state)
-                nodes_to_update.append(node)
-
-            # Takes care of termination state. I wrote this in a jiffy and I don't know how it works and I'm too lazy to try understanding. But hey, it works. So I'm not touching it.
-            for item in prev_nodes_to_update:
-                if nodes_to_update == item:
-                    evolution_stopped = True
-            if len(prev_nodes_to_update) == 1:
-                prev_nodes_to_update.pop(0)
-            prev_nodes_to_update.append(nodes_to_update)
+    def next_generation(
+        self, all_neighbour_indices: Dict[Node, List[List[int]]]
+    ) -> List[Node]:
+        '''
+        Advances the Game of Life by one generation (see game_of_life() for the rules), without rendering. Returns
+        the nodes whose state changed.
+        '''
 
-            self.render_nodes(nodes_to_update)
+        batch_update_list = (
+            []
+        )  # Since each generation is a pure function of the preceding one, we have to update the node states only after going through all of them once.
+        # A node's next-generation state shouldn't influence any current-generation node's state.
+        for r in range(self.nrows):
+            for c in range(self.ncols):
+                node = self.get_node(r, c)
+                neighbour_indices = all_neighbour_indices[node]
+                num_live_neighbours = self.get_num_live_neighbours(neighbour_indices)
+                is_node_alive = node.get_state() == NodeState.WALL
+                if is_node_alive:
+                    if num_live_neighbours < 2 or num_live_neighbours > 3:
+                        batch_update_list.append([node, NodeState.VACANT])
+                elif not is_node_alive and num_live_neighbours == 3:
+                    batch_update_list.append([node, NodeState.WALL])
+        nodes_to_update = []
+        for item in batch_update_list:
+            node, new_state = item
+            node.set_state(new_state)
+            nodes_to_update.append(node)
+        return nodes_to_update
 
     def clear(self) -> None:
         '''
@@ -680,24 +1398,464 @@ class Lattice:
 
         self.origin, self.goal = None, None
         self.previously_rendered_nodes = {}
-        for r in range(self.nrows):
-            for c in range(self.ncols):
-                self.values[r][c].reset()
+        self.states.fill(NodeState.VACANT.value)
+        self.clear_search_scratch()
+        self.evict_vacant_nodes()
         self.draw()
 
-    def visualize(self, option: PathfindingOption):
+    def clear_search_scratch(self) -> None:
+        '''
+        Invalidates the scratch data (visited flags, predecessors and distances) of the previous search. This is a
+        single epoch increment, so it doesn't depend on the size of the lattice.
+        '''
+
+        self.scratch.new_search()
+        self.search_result_nodes = []
+
+    def clear_search_results(self) -> None:
+        '''
+        Clears the results of the previous search: invalidates its scratch data, resets the nodes it set to one of
+        SEARCH_RESULT_STATES to NodeState.VACANT and redraws only those nodes. On a chunked lattice, the Node objects
+        and chunks that were only needed by the search are freed too (see evict_vacant_nodes() and ChunkedStates).
+        '''
+
+        nodes_to_clear = [
+            node
+            for node in self.search_result_nodes
+            if node.get_state() in SEARCH_RESULT_STATES
+        ]  # Nodes which have been drawn over (e.g. with walls) since the search aren't search results anymore
+        for node in nodes_to_clear:
+            node.set_state(NodeState.VACANT)
+        self.clear_search_scratch()
+        self.render_nodes(nodes_to_clear)
+        self.evict_vacant_nodes()
+
+    def save(self, path: str) -> None:
+        '''
+        Saves the lattice to a file in a compact, versioned binary format:
+
+        1) Header (LATTICE_FILE_HEADER): magic bytes, format version, flags, dimensions, node size, origin and goal
+        2) Walls, one bit per node (row-major, see numpy.packbits())
+        3) Cost layer, one little-endian float32 per node (row-major), only if self.costs is set
+
+        Each layer is padded to start at a multiple of LATTICE_FILE_ALIGNMENT bytes. Only walls, origin and goal are
+        saved, search results are not. The file is written next to path first and then moved over it, so a cost layer
+        memory-mapped from path (see load()) stays readable while it's being saved, and an interrupted save doesn't
+        leave a truncated file behind. If landmarks for ALT have been built, they're saved next to the lattice, at
+        path + LANDMARKS_FILE_SUFFIX (see Landmarks.save()), else a landmarks file left there by an earlier save is
+        removed.
+        '''
+
+        self.check_dense('save()')
+        flags = LATTICE_FILE_HAS_COSTS if self.costs is not None else 0
+        origin_pos = self.origin.get_pos() if self.origin else Pos(-1, -1)
+        goal_pos = self.goal.get_pos() if self.goal else Pos(-1, -1)
+        header = LATTICE_FILE_HEADER.pack(
+            LATTICE_FILE_MAGIC,
+            LATTICE_FILE_VERSION,
+            flags,
+            self.nrows,
+            self.ncols,
+            self.info.node_size,
+            *origin_pos,
+            *goal_pos,
+        )
+        walls = np.packbits(self.states == NodeState.WALL.value, axis=None)
+        temp_path = f'{path}.tmp'
+        with open(temp_path, 'wb') as f:
+            f.write(header)
+            f.write(bytes(get_padding(f.tell())))
+            f.write(walls.tobytes())
+            if self.costs is not None:
+                f.write(bytes(get_padding(f.tell())))
+                f.write(self.costs.astype('<f4').tobytes())
+        os.replace(temp_path, path)
+        if self.landmarks is not None:
+            self.get_landmarks().save(path + LANDMARKS_FILE_SUFFIX)
+        elif os.path.exists(path + LANDMARKS_FILE_SUFFIX):
+            # Left by an earlier save to the same path, so it's for other walls (or even dimensions)
+            os.remove(path + LANDMARKS_FILE_SUFFIX)
+
+    @classmethod
+    def load_movingai_map(
+        cls,
+        path: str,
+        pg_screen: Optional[pg.surface.Surface] = None,
+        node_size: int = 1,
+    ) -> Lattice:
+        '''
+        Loads a map in the Moving AI grid benchmark format (https://movingai.com/benchmarks/formats.html):
+
+            type octile
+            height <h>
+            width <w>
+            map
+            <h rows of w characters>
+
+        The file is streamed row by row, and each row is translated into the state array in one vectorized step.
+        '.', 'G' and 'S' are passable (NodeState.VACANT), everything else ('@', 'O', 'T', 'W') is a wall. Row y and
+        column x of the map become node (y, x). Raises ValueError on a malformed header or map.
+        '''
+
+        with open(path, 'rb') as f:
+            header = {}
+            for line in f:
+                line = line.strip()
+                if line == b'map':
+                    break
+                key, _, value = line.partition(b' ')
+                header[key] = value
+            try:
+                nrows, ncols = int(header[b'height']), int(header[b'width'])
+            except (KeyError, ValueError):
+                raise ValueError(f'{path} is not a Moving AI map')
+
+            lattice_info = LatticeInfo(
+                ScreenDim(ncols * node_size, nrows * node_size), node_size
+            )
+            lattice = cls(pg_screen, lattice_info)
+            for r in range(nrows):
+                row = np.frombuffer(f.readline().rstrip(b'\r\n'), dtype=np.uint8)
+                if len(row) != ncols:
+                    raise ValueError(f'Row {r} of {path} is not {ncols} wide')
+                lattice.states[r] = MOVINGAI_CHAR_TO_STATE_VALUE[row]
+        lattice.draw()
+        return lattice
+
+    @classmethod
+    def load(cls, path: str, pg_screen: Optional[pg.surface.Surface] = None) -> Lattice:
+        '''
+        Loads a lattice saved with save(). The file is memory-mapped instead of read, so only the pages that are
+        needed get loaded: the walls are unpacked straight from the mapping into the state array in one vectorized
+        pass, and the cost layer (if any) is a copy-on-write view of the file, i.e. it isn't copied at all unless
+        it's written to. Together with nodes being created lazily, this makes opening large lattices close to instant.
+
+        The screen dimensions of the returned lattice are derived from its dimensions and node size. Landmarks saved
+        along with it are loaded too, unless they're corrupt or for other dimensions, in which case they're rebuilt
+        when needed. Raises ValueError if the file isn't a lattice file, is of an unsupported version, or has its
+        origin or goal outside the lattice.
+        '''
+
+        with open(path, 'rb') as f:
+            header = f.read(LATTICE_FILE_HEADER.size)
+        if len(header) < LATTICE_FILE_HEADER.size:
+            raise ValueError(f'{path} is not a lattice file')
+        (
+            magic,
+            version,
+            flags,
+            nrows,
+            ncols,
+            node_size,
+            origin_r,
+            origin_c,
+            goal_r,
+            goal_c,
+        ) = LATTICE_FILE_HEADER.unpack(header)
+        if magic != LATTICE_FILE_MAGIC:
+            raise ValueError(f'{path} is not a lattice file')
+        if version != LATTICE_FILE_VERSION:
+            raise ValueError(f'Unsupported lattice file version {version}')
+        for name, r, c in [('origin', origin_r, origin_c), ('goal', goal_r, goal_c)]:
+            # (-1, -1) if it isn't set
+            if (r, c) != (-1, -1) and not (0 <= r < nrows and 0 <= c < ncols):
+                raise ValueError(
+                    f'{path} has its {name} ({r}, {c}) outside the lattice'
+                )
+
+        num_nodes = nrows * ncols
+        walls_offset = LATTICE_FILE_HEADER.size + get_padding(LATTICE_FILE_HEADER.size)
+        walls_size = (num_nodes + 7) // 8
+        data = np.memmap(path, dtype=np.uint8, mode='r')
+        if len(data) < walls_offset + walls_size:
+            raise ValueError(f'{path} is truncated')
+
+        lattice_info = LatticeInfo(
+            ScreenDim(ncols * node_size, nrows * node_size), node_size
+        )
+        lattice = cls(pg_screen, lattice_info)
+        walls = np.unpackbits(
+            data[walls_offset : walls_offset + walls_size], count=num_nodes
+        ).reshape(nrows, ncols)
+        lattice.states[...] = np.where(
+            walls, NodeState.WALL.value, NodeState.VACANT.value
+        )
+        if flags & LATTICE_FILE_HAS_COSTS:
+            costs_offset = walls_offset + walls_size
+            costs_offset += get_padding(costs_offset)
+            lattice.costs = np.memmap(
+                path,
+                dtype='<f4',
+                mode='c',
+                offset=costs_offset,
+                shape=(nrows, ncols),
+            )
+        if origin_r >= 0:
+            lattice.origin = lattice.get_node(origin_r, origin_c)
+            lattice.origin.set_state(NodeState.ORIGIN)
+        if goal_r >= 0:
+            lattice.goal = lattice.get_node(goal_r, goal_c)
+            lattice.goal.set_state(NodeState.GOAL)
+        try:
+            lattice.landmarks = Landmarks.load(path + LANDMARKS_FILE_SUFFIX, lattice)
+        except (OSError, ValueError):
+            # Missing, corrupt or not for this lattice, so they'll be built once they're needed
+            lattice.landmarks = None
+        return lattice
+
+    def search(self, option: PathfindingOption) -> bool:
+        '''
+        Runs the given pathfinding algorithm from the origin to the goal, and returns whether a path was found. Doesn't
+        clear the results of a previous search first (see clear_search_results()), so that it can be timed on its own.
+        Once it returns, the length of the path is the g-value of the goal in self.scratch.
+        '''
+
+        path_found = False
+        if option == PathfindingOption.DFS:
+            path_found = self.dfs()
+        elif option == PathfindingOption.BFS:
+            path_found = self.bfs()
+        elif option == PathfindingOption.DIJKSTRA:
+            path_found = self.dijkstra()
+        elif option == PathfindingOption.A_STAR:
+            path_found = self.a_star()
+        elif option == PathfindingOption.ALT:
+            path_found = self.alt()
+        elif option == PathfindingOption.FRINGE:
+            path_found = self.fringe_search()
+        elif option == PathfindingOption.IDA_STAR:
+            path_found = self.ida_star()
+        return path_found
+
+    def get_path_cost(self) -> Optional[float]:
+        '''
+        Returns the cost of the path found by the last search, or None if no path was found.
+        '''
+
+        if not self.goal:
+            return None
+        cost = self.scratch.get_g(self.get_flat_index(self.goal))
+        return None if cost == float('inf') else cost
+
+    def build_flow_field(self, goal_pos: Optional[Pos] = None) -> FlowField:
+        '''
+        Builds a flow field (see FlowField) towards the given position, by default the goal. Call update() on it after
+        changing walls, to only rebuild the part of it they affect.
+        '''
+
+        self.check_dense('build_flow_field()')
+        if goal_pos is None:
+            goal_pos = self.get_goal().get_pos()
+        return FlowField(self, goal_pos)
+
+    def spawn_agents(
+        self, flow_field: FlowField, num_agents: int, seed: Optional[int] = None
+    ) -> np.ndarray:
+        '''
+        Returns num_agents agents on random cells from which the flow field's goal can be reached, as an array of
+        (r, c) rows. Empty if there are no such cells.
+        '''
+
+        reachable = np.argwhere(flow_field.get_distances() != UNREACHABLE)
+        if not len(reachable):
+            return reachable
+        rng = np.random.default_rng(seed)
+        return reachable[rng.integers(len(reachable), size=num_agents)]
+
+    def find_path(
+        self, origin_pos: Pos, goal_pos: Pos, option: PathfindingOption
+    ) -> Optional[List[Pos]]:
+        '''
+        Runs the given pathfinding algorithm between two positions without touching the state array, i.e. the origin
+        and goal don't have to be set, and nodes aren't set to SEARCH_RESULT_STATES. Returns the positions on the path
+        from origin to goal (both included), or None if there is no path or either end is a wall. Overwrites the
+        scratch data of the previous search.
+        '''
+
+        origin = self.get_node(origin_pos.r, origin_pos.c)
+        goal = self.get_node(goal_pos.r, goal_pos.c)
+        if NodeState.WALL in [origin.get_state(), goal.get_state()]:
+            return None
+        previous_origin, previous_goal = self.origin, self.goal
+        self.origin, self.goal = origin, goal
+        self.record_search_results = False
+        try:
+            # Only the scratch data, the previous visualization's results are still on the lattice
+            self.scratch.new_search()
+            path_found = self.search(option)
+        finally:
+            self.origin, self.goal = previous_origin, previous_goal
+            self.record_search_results = True
+        path = [node.get_pos() for node in self.get_path(goal)] if path_found else None
+        self.evict_vacant_nodes()
+        return path
+
+    def solve_many(
+        self,
+        pairs: List[Tuple[Pos, Pos]],
+        option: PathfindingOption,
+        workers: Optional[int] = None,
+    ) -> List[Optional[List[Pos]]]:
+        '''
+        Finds paths (see find_path()) for many (origin, goal) pairs across a pool of worker processes (as many as there
+        are CPUs if workers is None), and returns them in the order of the pairs. The walls are published to the
+        workers once, through shared memory, and every worker searches on its own scratch buffers. With a single
+        worker, the pairs are solved in this process instead.
+        '''
+
+        self.check_dense('solve_many()')
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if workers <= 1 or len(pairs) <= 1:
+            return [self.find_path(origin, goal, option) for origin, goal in pairs]
+
+        from shared_lattice import solve_shared  # Imports Lattice itself
+
+        return solve_shared(self, pairs, option, workers)
+
+    def find_path_through_life(
+        self,
+        origin_pos: Pos,
+        goal_pos: Pos,
+        max_generations: int = DEFAULT_MAX_GENERATIONS,
+    ) -> Optional[List[Pos]]:
+        '''
+        Finds the earliest-arriving path from origin to goal while the walls evolve as a Game of Life (see
+        game_of_life()), starting from the current walls. Every generation, the agent either moves to a neighbour or
+        waits where it is, and the cell it's on must be dead (not a wall) in that generation. Returns the agent's
+        position in every generation from 0 until it reaches the goal (repeated while it waits), or None if it can't
+        reach the goal within max_generations. Doesn't touch the state array.
+
+        The search runs over (cell, generation) space one generation at a time, so it's a breadth-first search in
+        which every step takes one generation: the cells the agent can be on in the next generation are the ones it
+        can be on now and their neighbours, minus the live cells of the next generation, which is a few vectorized
+        operations on the whole lattice. Generations come from a GenerationCache, so they're only computed as far
+        ahead as the search has got, and evicted once the search is past them. The cells reachable in every generation
+        are kept (one bit per cell), to walk the path back from the goal once it's reached.
+        '''
+
+        self.check_dense('find_path_through_life()')
+        nrows, ncols = self.get_dim()
+        cache = GenerationCache(self.states == NodeState.WALL.value)
+        if cache.get(0)[origin_pos]:
+            return None
+        reachable = np.zeros((nrows, ncols), dtype=bool)
+        reachable[origin_pos] = True
+        reachable_history = [np.packbits(reachable, axis=None)]
+        generation = 0
+        while not reachable[goal_pos]:
+            if generation == max_generations:
+                return None
+            next_reachable = reachable.copy()  # Waiting
+            next_reachable[1:] |= reachable[:-1]
+            next_reachable[:-1] |= reachable[1:]
+            next_reachable[:, 1:] |= reachable[:, :-1]
+            next_reachable[:, :-1] |= reachable[:, 1:]
+            board = cache.get(generation)
+            next_board = cache.get(generation + 1)
+            next_reachable &= ~next_board
+            # Stops if every cell the agent could be on died, or if nothing will change anymore
+            if not next_reachable.any() or (
+                (next_reachable == reachable).all() and (next_board == board).all()
+            ):
+                return None
+            # No state of the search is in an older generation anymore
+            cache.evict_before(generation + 1)
+            reachable = next_reachable
+            reachable_history.append(np.packbits(reachable, axis=None))
+            generation += 1
+
+        def was_reachable(pos: Pos, generation: int) -> bool:
+            index = pos.r * ncols + pos.c
+            return bool(
+                reachable_history[generation][index >> 3] >> (7 - (index & 7)) & 1
+            )
+
+        # Walks back from the goal, to a cell the agent could have been on in the previous generation
+        path = [goal_pos]
+        for generation in range(generation - 1, -1, -1):
+            r, c = path[-1]
+            for previous_pos in [
+                Pos(r, c),
+                Pos(r - 1, c),
+                Pos(r + 1, c),
+                Pos(r, c - 1),
+                Pos(r, c + 1),
+            ]:
+                if (
+                    0 <= previous_pos.r < nrows
+                    and 0 <= previous_pos.c < ncols
+                    and was_reachable(previous_pos, generation)
+                ):
+                    path.append(previous_pos)
+                    break
+        path.reverse()
+        return path
+
+    def visualize_path_through_life(
+        self, max_generations: int = DEFAULT_MAX_GENERATIONS
+    ) -> Optional[List[Pos]]:
+        '''
+        Finds the earliest-arriving path from the origin to the goal through the Game of Life (see
+        find_path_through_life()), and plays it back: every generation is rendered, with the agent on its cell. The
+        origin and goal stay marked, even if they come alive. Returns the path, or None if there is none. Only the walls
+        are left on the lattice afterwards, as the last generation.
+        '''
+
+        if not self.get_goal() or not self.get_origin():
+            print('Origin and goal not set!')
+            return None
+        self.clear_search_results()
+        origin_pos, goal_pos = self.get_origin().get_pos(), self.get_goal().get_pos()
+        path = self.find_path_through_life(origin_pos, goal_pos, max_generations)
+        if path is None:
+            print('Path not found!')
+            return None
+
+        cache = GenerationCache(self.states == NodeState.WALL.value)
+        previous_agents = None
+        for generation, pos in enumerate(path):
+            board = cache.get(generation)
+            cache.evict_before(generation)
+            walls = self.states == NodeState.WALL.value
+            changed = board != walls
+            changed[origin_pos] = changed[goal_pos] = False
+            positions = np.argwhere(changed)
+            self.states[changed] = np.where(
+                board[changed], NodeState.WALL.value, NodeState.VACANT.value
+            )
+            self.render_nodes([self.get_node(r, c) for r, c in positions.tolist()])
+            agents = np.array([pos])
+            self.render_agents(agents, previous_agents)
+            previous_agents = agents
+            if self.pg_screen is not None:
+                time.sleep(LIFE_PATH_STEP_DELAY)
+        print(f'Path found, arriving in generation {len(path) - 1}')
+        return path
+
+    def visualize(
+        self,
+        option: PathfindingOption,
+        instrument: bool = False,
+        record_path: Optional[str] = None,
+    ) -> Optional[SearchStats]:
+        '''
+        Clears the previous search's results and visualizes the given pathfinding algorithm from the origin to the
+        goal. If instrument is True, returns a SearchStats with the search counters, and the wall time split into time
+        spent searching, rendering (including the colour transitions) and in pg.display.update(). If record_path is
+        given, the visualization is recorded to an event log there (see recording()).
+        '''
+
         if self.get_goal() and self.get_origin():
-            path_found = None
             self.previously_rendered_nodes = {}
-            self.clear_certain_state_nodes([NodeState.VISITED, NodeState.PATH])
-            if option == PathfindingOption.DFS:
-                path_found = self.dfs()
-            elif option == PathfindingOption.BFS:
-                path_found = self.bfs()
-            elif option == PathfindingOption.DIJKSTRA:
-                path_found = self.dijkstra()
-            elif option == PathfindingOption.A_STAR:
-                path_found = self.a_star()
+            if instrument:
+                self.stats = SearchStats()
+            with self.recording(record_path), self.span('search'):
+                self.clear_search_results()
+                path_found = self.search(option)
+            stats, self.stats = self.stats, None
+            if stats:
+                stats.path_length = self.get_path_cost()
             # I decided to not transition the colours in the end because of two reasons: 1)
             # You can't give input to the game even after the path has been found and while
             # the animations are still happening. This is bad use experience. And 2) It can
@@ -705,5 +1863,53 @@ class Lattice:
             # If you want to enable, just uncomment the line below.
             # self.handle_end_transitions()
             print('Path found') if path_found else print('Path not found!')
+            return stats
         else:
             print('Origin and goal not set!')
+            return None
+
+
+def get_padding(offset: int) -> int:
+    '''
+    Returns the number of bytes needed after the given offset for the next layer of a lattice file to be aligned to
+    LATTICE_FILE_ALIGNMENT.
+    '''
+
+    return -offset % LATTICE_FILE_ALIGNMENT
+
+
+def get_line_positions(start: Pos, end: Pos) -> List[Pos]:
+    '''
+    Returns the positions on the line from start to end (both included), using Bresenham's line algorithm, i.e. each
+    consecutive pair of positions are neighbours (including diagonally).
+    '''
+
+    dr, dc = abs(end.r - start.r), -abs(end.c - start.c)
+    step_r = 1 if start.r < end.r else -1
+    step_c = 1 if start.c < end.c else -1
+    error = dr + dc
+    r, c = start
+    positions = [Pos(r, c)]
+    while (r, c) != (end.r, end.c):
+        double_error = 2 * error
+        if double_error >= dc:
+            error += dc
+            r += step_r
+        if double_error <= dr:
+            error += dr
+            c += step_c
+        positions.append(Pos(r, c))
+    return positions
+
+
+def get_brush_offsets(brush_radius: int) -> List[Tuple[int, int]]:
+    '''
+    Returns the (dr, dc) offsets of the nodes covered by a round brush of the given radius, centered on (0, 0).
+    '''
+
+    return [
+        (dr, dc)
+        for dr in range(-brush_radius, brush_radius + 1)
+        for dc in range(-brush_radius, brush_radius + 1)
+        if dr * dr + dc * dc <= brush_radius * brush_radius
+    ]
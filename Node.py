@@ -1,14 +1,19 @@
 from __future__ import (
     annotations,
 )  # Used for type hinting to set type of class method to class itself, i.e. in set_predecessor() function below.
-from colour import Color
+import os
+import zipfile
+import numpy as np
 from collections import namedtuple
 
 from enums import NodeState
-from typing import Optional
+from typing import Dict, List, Optional, Tuple
 
 Pos = namedtuple('Pos', ['r', 'c'])
 
+# NodeState members indexed by their value, so that raw values read from a lattice's state array can be turned back into NodeStates cheaply
+NODE_STATES_BY_VALUE = tuple(sorted(NodeState, key=lambda node_state: node_state.value))
+
 NUM_COLOURS_IN_TRANSITION = (
     999  # Make sure this is an odd number lol, else program might go kaboom
 )
@@ -16,8 +21,9 @@ NUM_COLOURS_IN_TRANSITION = (
 node_colour_ranges = {
     NodeState.WALL: ['#000500'],
     NodeState.VACANT: ['#FAF0CA'],
-    NodeState.ORIGIN: ['green'],
-    NodeState.GOAL: ['red'],
+    # pygame's 'green' and 'red', which colour.Color would parse differently (e.g. its 'green' is #008000)
+    NodeState.ORIGIN: ['#00FF00'],
+    NodeState.GOAL: ['#FF0000'],
     NodeState.VISITED: [
         '16DB65',
         '058C42',
@@ -26,40 +32,136 @@ node_colour_ranges = {
     NodeState.PATH: ['#ffd100', '#ffee32'],
 }
 
-# Code below generates the appropriate number of transition colours depending on the number of colours specified in the range above
-node_colours = {}
-for node_state, colour_range_colours in node_colour_ranges.items():
-    num_colours_in_colour_range = len(colour_range_colours)
-    if num_colours_in_colour_range > 1:
+# Type of a colour in the palette, i.e. an (r, g, b) tuple of ints in the range [0, 255]
+RGB = Tuple[int, int, int]
+
+# If this environment variable is set, the palette is persisted to (and loaded from) the .npz file at that path, so that
+# it doesn't have to be generated every time the program starts
+PALETTE_CACHE_PATH_ENV_VAR = 'LATTICE_PALETTE_CACHE'
+
+node_colours: Optional[
+    Dict[NodeState, List[RGB]]
+] = None  # Built on first use by get_node_colours(), so that importing this module doesn't have to
+
+
+def get_node_colours() -> Dict[NodeState, List[RGB]]:
+    '''
+    Returns the palette, i.e. a mapping of every NodeState to its colour(s). NodeStates which have more than one colour
+    in node_colour_ranges map to NUM_COLOURS_IN_TRANSITION colours. The palette is built (or loaded from the cache file,
+    see PALETTE_CACHE_PATH_ENV_VAR) the first time this is called.
+    '''
+
+    global node_colours
+    if node_colours is None:
+        cache_path = os.environ.get(PALETTE_CACHE_PATH_ENV_VAR)
+        if cache_path:
+            node_colours = load_palette(cache_path)
+        if node_colours is None:
+            node_colours = build_palette()
+            if cache_path:
+                save_palette(node_colours, cache_path)
+    return node_colours
+
+
+def build_palette() -> Dict[NodeState, List[RGB]]:
+    '''
+    Generates the appropriate number of transition colours depending on the number of colours specified in
+    node_colour_ranges, and converts every colour to an RGB tuple so that it doesn't have to be parsed when rendering.
+    '''
+
+    from colour import Color  # Only needed to build the palette
+
+    palette = {}
+    for node_state, colour_range_colours in node_colour_ranges.items():
+        num_colours_in_colour_range = len(colour_range_colours)
         colours = []
-        for i in range(num_colours_in_colour_range):
-            if i + 1 < num_colours_in_colour_range:
+        if num_colours_in_colour_range > 1:
+            for i in range(num_colours_in_colour_range - 1):
                 start_colour = colour_range_colours[i]
                 start_colour = f'{"#" if "#" not in start_colour else ""}{start_colour}'  # Handles case if # is not present in specified colour range hex value
                 end_colour = colour_range_colours[i + 1]
                 end_colour = f'{"#" if "#" not in end_colour else ""}{end_colour}'
                 colours.extend(
-                    map(
-                        lambda color: color.hex_l,
-                        Color(start_colour).range_to(
-                            Color(end_colour),
-                            NUM_COLOURS_IN_TRANSITION
-                            // (num_colours_in_colour_range - 1)
-                            if num_colours_in_colour_range > 2
-                            else NUM_COLOURS_IN_TRANSITION,
-                        ),
+                    Color(start_colour).range_to(
+                        Color(end_colour),
+                        NUM_COLOURS_IN_TRANSITION // (num_colours_in_colour_range - 1)
+                        if num_colours_in_colour_range > 2
+                        else NUM_COLOURS_IN_TRANSITION,
                     )
                 )
-        # The 3 lines below are only needed because if there are more than 2 colours in a given NodeState's colour transition,
-        # the above code that adds the colour gradient between two colours doesn't exactly sum up to NUM_COLOURS_IN_TRANSITION
-        # at the end. This means the last few colours in a given transition will be the same, but it is pretty much
-        # unnoticeable if the value of NUM_COLOURS_IN_TRANSITION is high
-        num_colours_left = NUM_COLOURS_IN_TRANSITION - len(colours)
-        fillers = [colours[len(colours) - 1] for _ in range(num_colours_left)]
-        colours.extend(fillers)
-        node_colours[node_state] = colours
-    else:
-        node_colours[node_state] = colour_range_colours
+            # The 3 lines below are only needed because if there are more than 2 colours in a given NodeState's colour transition,
+            # the above code that adds the colour gradient between two colours doesn't exactly sum up to NUM_COLOURS_IN_TRANSITION
+            # at the end. This means the last few colours in a given transition will be the same, but it is pretty much
+            # unnoticeable if the value of NUM_COLOURS_IN_TRANSITION is high
+            num_colours_left = NUM_COLOURS_IN_TRANSITION - len(colours)
+            fillers = [colours[len(colours) - 1] for _ in range(num_colours_left)]
+            colours.extend(fillers)
+        else:
+            colours = [Color(colour_range_colours[0])]
+        palette[node_state] = [
+            tuple(int(round(channel * 255)) for channel in colour.rgb)
+            for colour in colours
+        ]
+    return palette
+
+
+def get_palette_key() -> str:
+    '''
+    Returns a string identifying the palette that build_palette() would generate, used to detect stale cache files.
+    '''
+
+    return repr(
+        (
+            NUM_COLOURS_IN_TRANSITION,
+            [
+                (node_state.name, colours)
+                for node_state, colours in node_colour_ranges.items()
+            ],
+        )
+    )
+
+
+def load_palette(path: str) -> Optional[Dict[NodeState, List[RGB]]]:
+    '''
+    Loads a palette saved with save_palette(). Returns None if the file doesn't exist, can't be read, is corrupt, or
+    was saved for a different palette.
+    '''
+
+    try:
+        with np.load(path) as cache:
+            if str(cache['key']) != get_palette_key():
+                return None
+            return {
+                node_state: [
+                    tuple(colour) for colour in cache[node_state.name].tolist()
+                ]
+                for node_state in node_colour_ranges
+            }
+    except (OSError, KeyError, ValueError, zipfile.BadZipFile):
+        return None
+
+
+def save_palette(palette: Dict[NodeState, List[RGB]], path: str) -> None:
+    '''
+    Saves the palette to a .npz file, as one (number of colours, 3) uint8 array per NodeState. Failing to write the
+    cache isn't an error, the palette just gets built again next time. The file is written next to path first and then
+    moved over it, so a save that's interrupted doesn't leave a corrupt cache behind.
+    '''
+
+    temp_path = f'{path}.tmp'
+    try:
+        with open(temp_path, 'wb') as f:
+            np.savez(
+                f,
+                key=np.array(get_palette_key()),
+                **{
+                    node_state.name: np.array(colours, dtype=np.uint8)
+                    for node_state, colours in palette.items()
+                },
+            )
+        os.replace(temp_path, path)
+    except OSError:
+        pass
 
 
 class Node:
@@ -70,13 +172,24 @@ class Node:
     # Type hints
     predecessor: Optional[Node]
 
-    def __init__(self, pos: Pos, state: NodeState = NodeState.VACANT) -> None:
+    def __init__(
+        self,
+        pos: Pos,
+        state: NodeState = NodeState.VACANT,
+        states: Optional[np.ndarray] = None,
+    ) -> None:
         '''
-        Initializes the node with the value NodeState.VACANT.
+        Initializes the node with the value NodeState.VACANT. If the state array of a lattice is given, the node
+        doesn't hold its own state but reads and writes its cell of that array instead (and state is ignored).
         '''
 
-        self.state = state
         self.pos = pos
+        if states is None:
+            self.states = np.array([[state.value]], dtype=np.uint8)
+            self.index = (0, 0)
+        else:
+            self.states = states
+            self.index = (pos.r, pos.c)
         self.heuristic = None
         self.predecessor = None
         self.already_rendered = False
@@ -86,14 +199,14 @@ class Node:
         Returns the node's state, which is of type NodeState.
         '''
 
-        return self.state
+        return NODE_STATES_BY_VALUE[self.states[self.index]]
 
     def set_state(self, new_state: NodeState) -> None:
         '''
         Sets the node's state to the new provided NodeState.
         '''
 
-        self.state = new_state
+        self.states[self.index] = new_state.value
 
     def get_pos(self) -> Pos:
         '''
@@ -134,22 +247,22 @@ class Node:
 
         return self.predecessor
 
-    def get_colour(self, render_number: int) -> str:
+    def get_colour(self, render_number: Optional[int]) -> RGB:
         '''
         Given the number which represents it's nth render, returns the appropriate colour.
         render_number exists in the range (1, NUM_COLOURS_IN_TRANSITION - 1).
         '''
 
         if render_number is None:
-            return node_colours[self.state][0]
-        return node_colours[self.state][render_number - 1]
+            return get_node_colours()[self.get_state()][0]
+        return get_node_colours()[self.get_state()][render_number - 1]
 
     def reset(self) -> None:
         '''
         Resets the node by setting state to NodeState.VACANT and setting predecessor to None.
         '''
 
-        self.state = NodeState.VACANT
+        self.set_state(NodeState.VACANT)
         self.predecessor = None
 
     def __repr__(self) -> str:
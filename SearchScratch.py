@@ -0,0 +1,172 @@
+import numpy as np
+from typing import Dict, Optional, Set
+
+# Epochs are stored as uint32, so once the epoch counter reaches this value the stamps are wiped and counting restarts
+MAX_EPOCH = np.iinfo(np.uint32).max
+
+
+class SearchScratch:
+    '''
+    Per-search scratch data for a lattice: whether a node has been visited, its predecessor and its distance from the
+    origin (g-value). Nodes are addressed by their flat index, i.e. r * ncols + c.
+
+    Every entry is stamped with the epoch (search number) it was written in, and entries with an older stamp are
+    treated as unset. Starting a new search therefore doesn't touch the buffers at all, it just increments the epoch.
+    '''
+
+    def __init__(self, size: int) -> None:
+        '''
+        Initializes the buffers for a lattice with the given number of nodes.
+        '''
+
+        self.epoch = 1
+        self.visited = np.zeros(size, dtype=np.uint32)
+        self.reached = np.zeros(
+            size, dtype=np.uint32
+        )  # Stamp for the g-value and predecessor buffers below
+        self.g = np.zeros(size, dtype=np.float64)
+        self.predecessor = np.zeros(size, dtype=np.int64)
+
+    def new_search(self) -> None:
+        '''
+        Invalidates all the scratch data from the previous search in O(1).
+        '''
+
+        self.epoch += 1
+        if self.epoch == MAX_EPOCH:
+            self.visited.fill(0)
+            self.reached.fill(0)
+            self.epoch = 1
+
+    def is_visited(self, index: int) -> bool:
+        '''
+        Returns whether the node has been visited (expanded) in the current search.
+        '''
+
+        return self.visited[index] == self.epoch
+
+    def mark_visited(self, index: int) -> None:
+        '''
+        Marks the node as visited (expanded) in the current search.
+        '''
+
+        self.visited[index] = self.epoch
+
+    def get_num_visited(self) -> int:
+        '''
+        Returns the number of nodes visited (expanded) in the current search.
+        '''
+
+        return int(np.count_nonzero(self.visited == self.epoch))
+
+    def is_reached(self, index: int) -> bool:
+        '''
+        Returns whether a g-value and predecessor have been set for the node in the current search.
+        '''
+
+        return self.reached[index] == self.epoch
+
+    def get_g(self, index: int) -> float:
+        '''
+        Returns the distance from the origin to the node found so far in the current search, infinity if the node
+        hasn't been reached yet.
+        '''
+
+        if self.reached[index] != self.epoch:
+            return float('inf')
+        return float(self.g[index])
+
+    def get_predecessor(self, index: int) -> Optional[int]:
+        '''
+        Returns the flat index of the node that came before the given node on the path found in the current search.
+        '''
+
+        if self.reached[index] != self.epoch or self.predecessor[index] < 0:
+            return None
+        return int(self.predecessor[index])
+
+    def update(self, index: int, g: float, predecessor: Optional[int]) -> None:
+        '''
+        Sets the g-value and the predecessor (flat index, or None for the origin) of a node for the current search.
+        '''
+
+        self.reached[index] = self.epoch
+        self.g[index] = g
+        self.predecessor[index] = -1 if predecessor is None else predecessor
+
+
+class SparseSearchScratch:
+    '''
+    Same as SearchScratch, but keeps the data in dicts holding only the nodes the current search has touched, for
+    lattices too large to have buffers the size of the whole lattice (see Lattice(chunked=True)). Starting a new search
+    clears the dicts, so it depends on the number of nodes the previous search touched instead of being O(1).
+    '''
+
+    def __init__(self) -> None:
+        '''
+        Initializes empty scratch data.
+        '''
+
+        self.visited: Set[int] = set()
+        self.g: Dict[int, float] = {}
+        self.predecessor: Dict[int, Optional[int]] = {}
+
+    def new_search(self) -> None:
+        '''
+        Invalidates all the scratch data from the previous search.
+        '''
+
+        self.visited.clear()
+        self.g.clear()
+        self.predecessor.clear()
+
+    def is_visited(self, index: int) -> bool:
+        '''
+        Returns whether the node has been visited (expanded) in the current search.
+        '''
+
+        return index in self.visited
+
+    def mark_visited(self, index: int) -> None:
+        '''
+        Marks the node as visited (expanded) in the current search.
+        '''
+
+        self.visited.add(index)
+
+    def get_num_visited(self) -> int:
+        '''
+        Returns the number of nodes visited (expanded) in the current search.
+        '''
+
+        return len(self.visited)
+
+    def is_reached(self, index: int) -> bool:
+        '''
+        Returns whether a g-value and predecessor have been set for the node in the current search.
+        '''
+
+        return index in self.g
+
+    def get_g(self, index: int) -> float:
+        '''
+        Returns the distance from the origin to the node found so far in the current search, infinity if the node
+        hasn't been reached yet.
+        '''
+
+        return self.g.get(index, float('inf'))
+
+    def get_predecessor(self, index: int) -> Optional[int]:
+        '''
+        Returns the flat index of the node that came before the given node on the path found in the current search.
+        '''
+
+        return self.predecessor.get(index)
+
+    def update(self, index: int, g: float, predecessor: Optional[int]) -> None:
+        '''
+        Sets the g-value and the predecessor (flat index, or None for the origin) of a node for the current search.
+        '''
+
+        self.g[index] = g
+        self.predecessor[index] = predecessor
@@ -0,0 +1,126 @@
+import json
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+# Phases the wall time of a visualization is split into. Each phase's time excludes the time of phases nested in it,
+# e.g. the time spent in pg.display.update() while rendering counts towards 'display' only.
+PHASES = ['search', 'render', 'display']
+
+
+class SearchStats:
+    '''
+    Statistics recorded during an instrumented visualization (see Lattice.visualize()): search counters, and wall time
+    split into PHASES. Also records every timed span, so that the run can be exported as a timeline.
+    '''
+
+    # Type hints
+    path_length: Optional[float]
+
+    def __init__(self, timed: bool = True) -> None:
+        '''
+        Initializes all counters and times to 0. If timed is False, only the counters are recorded, and spans aren't
+        timed at all (see Lattice.counting()).
+        '''
+
+        self.timed = timed
+        self.nodes_expanded = 0
+        self.frontier_peak = 0  # Largest size of the stack/queue/heap during the search
+        # Heap pushes and pops for Dijkstra and A*, stack/queue pushes and pops for DFS/BFS
+        self.frontier_pushes = 0
+        self.frontier_pops = 0
+        self.path_length = None  # None if no path was found
+        self.times = {phase: 0.0 for phase in PHASES}
+        self.trace_events: List[Dict] = []
+        self.start_time = time.perf_counter()
+        # Time spent in nested spans so far, for every span that hasn't ended yet
+        self.open_spans: List[float] = []
+
+    def update_frontier(self, frontier_size: int) -> None:
+        '''
+        Records a push onto the frontier, which is of the given size after the push.
+        '''
+
+        self.frontier_pushes += 1
+        if frontier_size > self.frontier_peak:
+            self.frontier_peak = frontier_size
+
+    @contextmanager
+    def span(self, phase: str) -> Iterator[None]:
+        '''
+        Context manager which adds the time spent in it to the given phase, excluding time spent in spans nested in
+        it, and records it as a trace event.
+        '''
+
+        start_time = time.perf_counter()
+        self.open_spans.append(0.0)
+        try:
+            yield
+        finally:
+            end_time = time.perf_counter()
+            duration = end_time - start_time
+            self.times[phase] += duration - self.open_spans.pop()
+            if self.open_spans:
+                self.open_spans[-1] += duration
+            self.trace_events.append(
+                {
+                    'name': phase,
+                    'ph': 'X',  # Complete event, i.e. with a duration
+                    'ts': (start_time - self.start_time) * 1e6,
+                    'dur': duration * 1e6,
+                    'pid': 0,
+                    'tid': 0,
+                }
+            )
+
+    def get_total_time(self) -> float:
+        '''
+        Returns the total wall time of all phases.
+        '''
+
+        return sum(self.times.values())
+
+    def to_dict(self) -> Dict:
+        '''
+        Returns the counters and phase times as a (JSON serializable) dictionary.
+        '''
+
+        return {
+            'nodes_expanded': self.nodes_expanded,
+            'frontier_peak': self.frontier_peak,
+            'frontier_pushes': self.frontier_pushes,
+            'frontier_pops': self.frontier_pops,
+            'path_length': self.path_length,
+            **{f'{phase}_time': self.times[phase] for phase in PHASES},
+        }
+
+    def export_chrome_trace(self, path: str) -> None:
+        '''
+        Writes the recorded spans as a Chrome trace (Trace Event Format) JSON file, which can be opened in
+        chrome://tracing or https://ui.perfetto.dev. The counters are attached to the file as metadata.
+        '''
+
+        with open(path, 'w') as f:
+            json.dump(
+                {
+                    'traceEvents': sorted(
+                        self.trace_events, key=lambda event: event['ts']
+                    ),
+                    'displayTimeUnit': 'ms',
+                    'otherData': self.to_dict(),
+                },
+                f,
+            )
+
+    def __repr__(self) -> str:
+        '''
+        Returns the counters and phase times in a readable format. Used for console output.
+        '''
+
+        return (
+            f'{self.nodes_expanded} nodes expanded, frontier peak {self.frontier_peak}, '
+            f'{self.frontier_pushes} pushes, {self.frontier_pops} pops, path length {self.path_length}, '
+            + ', '.join(
+                f'{phase} {self.times[phase] * 1000:.3f} ms' for phase in PHASES
+            )
+        )
@@ -0,0 +1,201 @@
+'''
+Headless batch solver. Solves many map files in parallel (one map file per worker process at a time), and streams the
+results to standard output (or a file) as JSON lines, one line per origin/goal pair, in the order they finish.
+
+Usage: python batch.py <map files and/or directories> [--algorithm A_STAR] [--workers N] [--output <path>]
+                       [--measure-memory]
+
+Map files can be:
+
+* Lattice files (.lat, see Lattice.save()), which are solved from their saved origin to their saved goal
+* Moving AI maps (.map), whose origin/goal pairs are read from the scenario file next to them (<map>.scen)
+
+Every line holds the map path, algorithm, origin, goal, whether a path was found, the path (list of [r, c]), its cost,
+the number of expansions and the search time in seconds. With --measure-memory, it also holds the peak number of bytes
+allocated during the search, on top of the scratch buffers allocated once per lattice (see scenarios.run_scenario(),
+the search time is inflated then). If a map can't be solved at all, its line holds an error instead, and so does the
+line of every pair which can't be solved (e.g. because its origin or goal is outside the map or a wall). pygame is
+never imported.
+'''
+
+import os
+import sys
+import json
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from enums import PathfindingOption
+from Lattice import Lattice
+from scenarios import Scenario, read_scenarios, run_scenario
+
+MAP_FILE_EXTENSIONS = ['.lat', '.map']
+SCENARIO_FILE_EXTENSION = '.scen'
+
+
+def get_map_paths(paths: List[str]) -> Iterator[str]:
+    '''
+    Yields the given map files, and the map files (see MAP_FILE_EXTENSIONS) in the given directories.
+    '''
+
+    for path in paths:
+        if os.path.isdir(path):
+            for file_name in sorted(os.listdir(path)):
+                if os.path.splitext(file_name)[1] in MAP_FILE_EXTENSIONS:
+                    yield os.path.join(path, file_name)
+        else:
+            yield path
+
+
+def load_map(map_path: str) -> Tuple[Lattice, List[Scenario]]:
+    '''
+    Loads a map file headless, and returns it along with the origin/goal pairs to solve on it.
+    '''
+
+    if os.path.splitext(map_path)[1] == '.map':
+        lattice = Lattice.load_movingai_map(map_path)
+        scenarios = list(read_scenarios(map_path + SCENARIO_FILE_EXTENSION))
+    else:
+        lattice = Lattice.load(map_path)
+        if not lattice.get_origin() or not lattice.get_goal():
+            raise ValueError(f'Origin and goal not set in {map_path}')
+        scenarios = [
+            Scenario(
+                0,
+                os.path.basename(map_path),
+                lattice.get_origin().get_pos(),
+                lattice.get_goal().get_pos(),
+                None,
+            )
+        ]
+    return lattice, scenarios
+
+
+def solve_map(
+    map_path: str, option: PathfindingOption, measure_memory: bool = False
+) -> List[Dict]:
+    '''
+    Solves every origin/goal pair of a map file, and returns a result (JSON serializable dictionary) for each. Runs in
+    a worker process.
+    '''
+
+    try:
+        lattice, scenarios = load_map(map_path)
+    except Exception as e:
+        return [
+            {
+                'map': map_path,
+                'algorithm': option.name,
+                'error': str(e) or type(e).__name__,
+            }
+        ]
+
+    results = []
+    for scenario in scenarios:
+        result = {
+            'map': map_path,
+            'algorithm': option.name,
+            'origin': list(scenario.origin),
+            'goal': list(scenario.goal),
+        }
+        try:
+            scenario_result = run_scenario(lattice, scenario, option, measure_memory)
+            if scenario.origin == scenario.goal:
+                path = [list(scenario.origin)]
+            else:
+                path = [
+                    list(node.get_pos())
+                    for node in lattice.get_path(lattice.get_goal())
+                ]
+        except Exception as e:
+            # Any failure of a single pair is reported on its line, and the other pairs are still solved
+            result['error'] = str(e) or type(e).__name__
+        else:
+            result.update(
+                {
+                    'path_found': scenario_result.path_found,
+                    'path': path,
+                    'cost': scenario_result.path_cost,
+                    'optimal_length': scenario.optimal_length,
+                    'expansions': scenario_result.expansions,
+                    'time': scenario_result.time,
+                }
+            )
+            if measure_memory:
+                result['peak_memory'] = scenario_result.peak_memory
+        results.append(result)
+    return results
+
+
+def solve_maps(
+    map_paths: List[str],
+    option: PathfindingOption,
+    workers: Optional[int] = None,
+    measure_memory: bool = False,
+) -> Iterator[Dict]:
+    '''
+    Solves the map files across a pool of worker processes (as many as there are CPUs if workers is None), yielding
+    results as soon as each map is done. If solving a map fails altogether (e.g. its worker dies), it gets a single
+    result with the error, and the other maps are still solved.
+    '''
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(solve_map, map_path, option, measure_memory): map_path
+            for map_path in map_paths
+        }
+        for future in as_completed(futures):
+            try:
+                results = future.result()
+            except Exception as e:
+                results = [
+                    {
+                        'map': futures[future],
+                        'algorithm': option.name,
+                        'error': str(e) or type(e).__name__,
+                    }
+                ]
+            yield from results
+
+
+def main(argv: List[str]) -> None:
+    parser = argparse.ArgumentParser(
+        description='Solves map files in parallel, writing results as JSON lines.'
+    )
+    parser.add_argument('paths', nargs='+', help='Map files and/or directories')
+    parser.add_argument(
+        '--algorithm',
+        choices=[option.name for option in PathfindingOption],
+        default=PathfindingOption.A_STAR.name,
+    )
+    parser.add_argument(
+        '--workers', type=int, help='Number of worker processes (default: CPUs)'
+    )
+    parser.add_argument(
+        '--output', help='File to write the results to, else standard output'
+    )
+    parser.add_argument(
+        '--measure-memory',
+        action='store_true',
+        help='Also report the peak memory allocated by every search (slows searches down)',
+    )
+    args = parser.parse_args(argv)
+
+    map_paths = list(get_map_paths(args.paths))
+    output = open(args.output, 'w') if args.output else sys.stdout
+    try:
+        for result in solve_maps(
+            map_paths,
+            PathfindingOption[args.algorithm],
+            args.workers,
+            args.measure_memory,
+        ):
+            output.write(json.dumps(result) + '\n')
+            output.flush()
+    finally:
+        if args.output:
+            output.close()
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
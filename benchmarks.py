@@ -0,0 +1,362 @@
+'''
+Headless benchmark suite. Every benchmark is timed a number of times (repeats) with time.perf_counter(), and the results
+are written as JSON, so that results of different versions can be compared to track regressions.
+
+Usage: python benchmarks.py [--sizes 100 500 1000] [--repeat 3] [--filter <regex>] [--output <path>]
+
+Benchmark names are of the form <group>/<variant>/<size>, e.g. search/A_STAR/maze/500. Only the operation being
+measured is timed, i.e. not setting up the lattice for it. The startup benchmarks don't depend on the size: startup/import
+measures cold start in a fresh interpreter, and startup/palette/* building the colour palette vs. loading it from a cache
+file.
+'''
+
+import os
+
+# Rendering benchmarks draw on an off-screen surface, so that no window is needed. pygame's import message would end up
+# in the JSON results on standard output, so it's hidden.
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+import re
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+import tempfile
+import subprocess
+from collections import namedtuple
+from typing import Callable, Dict, Iterator, List, Optional
+
+import pygame as pg
+
+from enums import MazeOption, PathfindingOption
+from Node import Pos, build_palette, load_palette, save_palette
+from Lattice import Lattice, LatticeInfo, ScreenDim
+from FlowField import UNREACHABLE
+
+DEFAULT_SIZES = [100, 500, 1000]
+DEFAULT_REPEAT = 3
+GRID_KINDS = ['open', 'random', 'maze']
+RANDOM_DENSITY = 0.25
+NUM_GENERATIONS = 3  # Game of Life generations timed per repeat
+NUM_AGENTS = 100000
+NUM_AGENT_STEPS = 10  # Flow field agent steps timed per repeat
+SEED = 0
+# IDA* explores a maze's long corridors again in every iteration, so it's only benchmarked on mazes up to this size
+MAX_IDA_STAR_MAZE_SIZE = 100
+PROJECT_PATH = os.path.dirname(os.path.abspath(__file__))
+
+# Run in a fresh interpreter to measure cold start: importing the lattice and creating a headless one
+STARTUP_SCRIPT = '''
+import sys
+import time
+start_time = time.perf_counter()
+from Lattice import Lattice, LatticeInfo, ScreenDim
+from FlowField import UNREACHABLE
+Lattice(None, LatticeInfo(ScreenDim(1000, 1000), 1))
+print(time.perf_counter() - start_time, 'pygame' in sys.modules)
+'''
+
+# A benchmark's setup() prepares everything and returns a function, which is the operation that gets timed. That
+# function may return a dict of extra (numeric) results, such as the number of expansions of a search.
+Benchmark = namedtuple('Benchmark', ['name', 'setup'])
+BenchmarkResult = namedtuple('BenchmarkResult', ['name', 'times', 'extra'])
+
+
+def make_lattice(size: int, pg_screen: Optional[pg.surface.Surface] = None) -> Lattice:
+    '''
+    Returns a size x size lattice with a node size of 1.
+    '''
+
+    return Lattice(pg_screen, LatticeInfo(ScreenDim(size, size), 1))
+
+
+def make_search_lattice(size: int, grid_kind: str) -> Lattice:
+    '''
+    Returns a lattice of one of GRID_KINDS, with the origin and goal in opposite corners. Seeded, so every version
+    benchmarks the same layout.
+    '''
+
+    lattice = make_lattice(size)
+    if grid_kind == 'random':
+        lattice.randomize(RANDOM_DENSITY, seed=SEED)
+    elif grid_kind == 'maze':
+        random.seed(SEED)
+        lattice.generate_maze(MazeOption.KRUSKAL)
+    first, last = 0, size - 1
+    if grid_kind == 'maze':
+        first, last = 1, (size - 2) | 1  # Maze cells have odd indices
+    lattice.set_origin(Pos(first, first))
+    lattice.set_goal(Pos(last, last))
+    return lattice
+
+
+def search_benchmark(
+    option: PathfindingOption, grid_kind: str, size: int
+) -> Callable[[], Callable[[], Dict]]:
+    def setup() -> Callable[[], Dict]:
+        lattice = make_search_lattice(size, grid_kind)
+        if option == PathfindingOption.ALT:
+            lattice.get_landmarks()  # Built once per lattice, see landmarks_benchmark()
+
+        def run() -> Dict:
+            with lattice.counting() as stats:
+                path_found = lattice.search(option)
+            return {
+                'path_found': path_found,
+                'path_cost': lattice.get_path_cost(),
+                'expansions': stats.nodes_expanded,
+            }
+
+        return run
+
+    return setup
+
+
+def maze_benchmark(option: MazeOption, size: int) -> Callable[[], Callable[[], Dict]]:
+    def setup() -> Callable[[], Dict]:
+        lattice = make_lattice(size)
+        random.seed(SEED)
+        return lambda: lattice.generate_maze(option)
+
+    return setup
+
+
+def randomize_benchmark(size: int) -> Callable[[], Callable[[], Dict]]:
+    def setup() -> Callable[[], Dict]:
+        lattice = make_lattice(size)
+        return lambda: lattice.randomize(RANDOM_DENSITY, seed=SEED)
+
+    return setup
+
+
+def game_of_life_benchmark(size: int) -> Callable[[], Callable[[], Dict]]:
+    def setup() -> Callable[[], Dict]:
+        lattice = make_lattice(size)
+        lattice.randomize(RANDOM_DENSITY, seed=SEED)
+        all_neighbour_indices = lattice.get_all_neighbour_indices()
+
+        def run() -> Dict:
+            start_time = time.perf_counter()
+            for _ in range(NUM_GENERATIONS):
+                lattice.next_generation(all_neighbour_indices)
+            return {
+                'generations_per_sec': NUM_GENERATIONS
+                / (time.perf_counter() - start_time)
+            }
+
+        return run
+
+    return setup
+
+
+def flow_field_benchmark(size: int) -> Callable[[], Callable[[], Dict]]:
+    def setup() -> Callable[[], Dict]:
+        lattice = make_search_lattice(size, 'random')
+        return lambda: {
+            'reachable': int(
+                (lattice.build_flow_field().get_distances() != UNREACHABLE).sum()
+            )
+        }
+
+    return setup
+
+
+def landmarks_benchmark(size: int) -> Callable[[], Callable[[], Dict]]:
+    def setup() -> Callable[[], Dict]:
+        lattice = make_search_lattice(size, 'maze')
+
+        def run() -> Dict:
+            lattice.landmarks = None
+            landmarks = lattice.get_landmarks()
+            return {
+                'num_landmarks': len(landmarks.positions),
+                'table_bytes': landmarks.distances.nbytes,
+            }
+
+        return run
+
+    return setup
+
+
+def agents_benchmark(size: int) -> Callable[[], Callable[[], Dict]]:
+    def setup() -> Callable[[], Dict]:
+        lattice = make_search_lattice(size, 'random')
+        flow_field = lattice.build_flow_field()
+        agents = lattice.spawn_agents(flow_field, NUM_AGENTS, seed=SEED)
+
+        def run() -> Dict:
+            nonlocal agents
+            for _ in range(NUM_AGENT_STEPS):
+                agents = flow_field.step_agents(agents)
+            return {'num_agents': NUM_AGENTS}
+
+        return run
+
+    return setup
+
+
+def draw_benchmark(size: int) -> Callable[[], Callable[[], Dict]]:
+    def setup() -> Callable[[], Dict]:
+        pg.display.init()
+        screen = pg.display.set_mode((size, size))
+        lattice = make_lattice(size, screen)
+        lattice.randomize(RANDOM_DENSITY, seed=SEED)
+        return lattice.draw
+
+    return setup
+
+
+def startup_benchmark() -> Callable[[], Callable[[], Dict]]:
+    def setup() -> Callable[[], Dict]:
+        def run() -> Dict:
+            import_time, imports_pygame = subprocess.run(
+                [sys.executable, '-c', STARTUP_SCRIPT],
+                capture_output=True,
+                text=True,
+                check=True,
+                cwd=PROJECT_PATH,
+            ).stdout.split()
+            return {
+                'import_time': float(import_time),
+                'imports_pygame': imports_pygame == 'True',
+            }
+
+        return run
+
+    return setup
+
+
+def palette_benchmark(cached: bool) -> Callable[[], Callable[[], Dict]]:
+    def setup() -> Callable[[], Dict]:
+        cache_path = os.path.join(tempfile.mkdtemp(), 'palette.npz')
+        save_palette(build_palette(), cache_path)
+
+        def run() -> Dict:
+            palette = load_palette(cache_path) if cached else build_palette()
+            return {'num_colours': sum(len(colours) for colours in palette.values())}
+
+        return run
+
+    return setup
+
+
+def get_benchmarks(sizes: List[int]) -> Iterator[Benchmark]:
+    '''
+    Yields every benchmark in the suite: the startup benchmarks, and the rest for each of the given lattice sizes.
+    '''
+
+    yield Benchmark('startup/import', startup_benchmark())
+    yield Benchmark('startup/palette/build', palette_benchmark(False))
+    yield Benchmark('startup/palette/load', palette_benchmark(True))
+    for size in sizes:
+        for option in PathfindingOption:
+            for grid_kind in GRID_KINDS:
+                if (
+                    option == PathfindingOption.IDA_STAR
+                    and grid_kind == 'maze'
+                    and size > MAX_IDA_STAR_MAZE_SIZE
+                ):
+                    continue
+                yield Benchmark(
+                    f'search/{option.name}/{grid_kind}/{size}',
+                    search_benchmark(option, grid_kind, size),
+                )
+        for option in MazeOption:
+            yield Benchmark(f'maze/{option.name}/{size}', maze_benchmark(option, size))
+        yield Benchmark(f'randomize/{size}', randomize_benchmark(size))
+        yield Benchmark(f'game_of_life/{size}', game_of_life_benchmark(size))
+        yield Benchmark(f'flow_field/build/{size}', flow_field_benchmark(size))
+        yield Benchmark(f'flow_field/agents/{size}', agents_benchmark(size))
+        yield Benchmark(f'landmarks/build/{size}', landmarks_benchmark(size))
+        yield Benchmark(f'draw/{size}', draw_benchmark(size))
+
+
+def run_benchmark(benchmark: Benchmark, repeat: int) -> BenchmarkResult:
+    '''
+    Sets up and times a benchmark repeat times. Extra results are taken from the last repeat.
+    '''
+
+    times = []
+    extra = {}
+    for _ in range(repeat):
+        run = benchmark.setup()
+        start_time = time.perf_counter()
+        extra = run() or {}
+        times.append(time.perf_counter() - start_time)
+    return BenchmarkResult(benchmark.name, times, extra)
+
+
+def get_version() -> Optional[str]:
+    '''
+    Returns the git description of the version being benchmarked, if available.
+    '''
+
+    try:
+        return subprocess.run(
+            ['git', 'describe', '--always', '--dirty'],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def to_json(results: List[BenchmarkResult]) -> Dict:
+    '''
+    Returns the machine-readable form of the results, along with information about the environment they were
+    measured in.
+    '''
+
+    return {
+        'version': get_version(),
+        'timestamp': time.time(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'benchmarks': [
+            {
+                'name': result.name,
+                'times': result.times,
+                'min': min(result.times),
+                'mean': sum(result.times) / len(result.times),
+                **result.extra,
+            }
+            for result in results
+        ],
+    }
+
+
+def main(argv: List[str]) -> None:
+    parser = argparse.ArgumentParser(description='Runs the benchmark suite.')
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES)
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT)
+    parser.add_argument(
+        '--filter', default='', help='Only runs benchmarks whose name matches this'
+    )
+    parser.add_argument(
+        '--output', help='File to write the JSON results to, else standard output'
+    )
+    args = parser.parse_args(argv)
+
+    results = []
+    for benchmark in get_benchmarks(args.sizes):
+        if not re.search(args.filter, benchmark.name):
+            continue
+        result = run_benchmark(benchmark, args.repeat)
+        print(f'{result.name}: {min(result.times):.6f} s', file=sys.stderr)
+        results.append(result)
+
+    output = json.dumps(to_json(results), indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output)
+    else:
+        print(output)
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
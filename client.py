@@ -0,0 +1,134 @@
+'''
+Client for the path query service (see server.py). Requests can be pipelined: every call sends its request right
+away and waits for the response to it only, so many calls can be in flight at once (e.g. with asyncio.gather()).
+
+    client = await PathClient.connect(socket_path='/tmp/lattice.sock')
+    await client.load('maps/arena.map')
+    await client.set_cells([Pos(3, 4)], NodeState.WALL)
+    path = await client.find_path(Pos(1, 1), Pos(20, 30))
+    await client.close()
+'''
+
+import json
+import asyncio
+from typing import Dict, List, Optional
+
+from enums import NodeState, PathfindingOption
+from Node import Pos
+from server import DEFAULT_HOST, DEFAULT_PORT, MAX_LINE_LENGTH
+
+
+class ServerError(Exception):
+    '''
+    Raised when the server responds to a request with an error.
+    '''
+
+
+class PathClient:
+    '''
+    A connection to a path query server. Responses are matched to their requests by id, so they can arrive in any
+    order.
+    '''
+
+    def __init__(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        self.reader = reader
+        self.writer = writer
+        self.next_id = 0
+        self.pending: Dict[int, asyncio.Future] = {}
+        self.receive_task = asyncio.create_task(self.receive())
+
+    @classmethod
+    async def connect(
+        cls,
+        socket_path: Optional[str] = None,
+        host: str = DEFAULT_HOST,
+        port: int = DEFAULT_PORT,
+    ) -> 'PathClient':
+        '''
+        Connects to the server on the Unix socket at socket_path if given, else on TCP host:port.
+        '''
+
+        if socket_path:
+            reader, writer = await asyncio.open_unix_connection(
+                socket_path, limit=MAX_LINE_LENGTH
+            )
+        else:
+            reader, writer = await asyncio.open_connection(
+                host, port, limit=MAX_LINE_LENGTH
+            )
+        return cls(reader, writer)
+
+    async def receive(self) -> None:
+        '''
+        Reads responses until the connection is closed, and hands each to the request waiting for it.
+        '''
+
+        try:
+            while line := await self.reader.readline():
+                response = json.loads(line)
+                future = self.pending.pop(response.get('id'), None)
+                if future and not future.done():
+                    future.set_result(response)
+        finally:
+            for future in self.pending.values():
+                if not future.done():
+                    future.set_exception(ConnectionError('Connection closed'))
+            self.pending.clear()
+
+    async def request(self, op: str, **fields) -> Dict:
+        '''
+        Sends a request and returns the response to it. Raises ServerError if the server responded with an error.
+        '''
+
+        request_id = self.next_id
+        self.next_id += 1
+        future = asyncio.get_running_loop().create_future()
+        self.pending[request_id] = future
+        self.writer.write(
+            json.dumps({'id': request_id, 'op': op, **fields}).encode() + b'\n'
+        )
+        await self.writer.drain()  # Waits here if the server isn't keeping up
+        response = await future
+        if 'error' in response:
+            raise ServerError(response['error'])
+        return response
+
+    async def load(self, path: str) -> Dict:
+        '''
+        Makes the server load a map file (a path on the server's machine). Returns its 'nrows' and 'ncols'.
+        '''
+
+        return await self.request('load', path=path)
+
+    async def set_cells(self, cells: List[Pos], state: NodeState) -> None:
+        '''
+        Sets the given cells to NodeState.WALL or NodeState.VACANT.
+        '''
+
+        await self.request(
+            'set_cells', cells=[list(pos) for pos in cells], state=state.name
+        )
+
+    async def find_path(
+        self,
+        origin: Pos,
+        goal: Pos,
+        option: PathfindingOption = PathfindingOption.A_STAR,
+    ) -> Optional[List[Pos]]:
+        '''
+        Returns the path from origin to goal (both included), or None if there is none.
+        '''
+
+        response = await self.request(
+            'find_path', origin=list(origin), goal=list(goal), algorithm=option.name
+        )
+        if response['path'] is None:
+            return None
+        return [Pos(*pos) for pos in response['path']]
+
+    async def close(self) -> None:
+        self.writer.close()
+        await self.writer.wait_closed()
+        await self.receive_task
@@ -21,4 +21,13 @@ class PathfindingOption(Enum):
     BFS = 1
     DFS = 2
     DIJKSTRA = 3
-    A_STAR = 4
\ No newline at end of file
+    A_STAR = 4
+    ALT = 5
+    FRINGE = 6
+    IDA_STAR = 7
+
+
+class MazeOption(Enum):
+    RECURSIVE_BACKTRACKING = 1
+    KRUSKAL = 2
+    WILSON = 3
@@ -0,0 +1,129 @@
+'''
+Load generator for the path query service (see server.py). Makes the server load a map, then sends path queries
+between random passable cells over a number of connections, each keeping a number of queries in flight (pipelined),
+and reports the throughput and latency percentiles.
+
+Usage: python loadgen.py <map> [--socket <path> | --host 127.0.0.1 --port 7878] [--connections 4] [--pipeline 16]
+                         [--queries 10000] [--algorithm A_STAR] [--seed 0]
+
+The map is also loaded here (headless) to pick the cells, so its path has to be valid for both processes.
+'''
+
+import sys
+import time
+import asyncio
+import argparse
+from typing import List
+
+import numpy as np
+
+from enums import NodeState, PathfindingOption
+from Node import Pos
+from client import PathClient
+from server import DEFAULT_HOST, DEFAULT_PORT, load_lattice
+
+DEFAULT_CONNECTIONS = 4
+DEFAULT_PIPELINE = 16
+DEFAULT_QUERIES = 10000
+PERCENTILES = [50, 90, 99]
+
+
+def get_random_pairs(map_path: str, num_pairs: int, seed: int) -> np.ndarray:
+    '''
+    Returns num_pairs random (origin, goal) pairs of passable cells of the map, as an array of shape (num_pairs, 2, 2).
+    '''
+
+    lattice = load_lattice(map_path)
+    passable = np.argwhere(lattice.states != NodeState.WALL.value)
+    if not len(passable):
+        raise ValueError(f'{map_path} has no passable cells')
+    rng = np.random.default_rng(seed)
+    return passable[rng.integers(len(passable), size=(num_pairs, 2))]
+
+
+async def run_connection(
+    client: PathClient,
+    pairs: np.ndarray,
+    pipeline: int,
+    option: PathfindingOption,
+    latencies: List[float],
+) -> None:
+    '''
+    Sends the queries for the given pairs over a single connection, with up to pipeline of them in flight at once,
+    and adds the latency of each to latencies.
+    '''
+
+    next_pair = 0
+
+    async def send_queries() -> None:
+        nonlocal next_pair
+        while next_pair < len(pairs):
+            origin, goal = pairs[next_pair]
+            next_pair += 1
+            start_time = time.perf_counter()
+            await client.find_path(Pos(*origin.tolist()), Pos(*goal.tolist()), option)
+            latencies.append(time.perf_counter() - start_time)
+
+    await asyncio.gather(*(send_queries() for _ in range(pipeline)))
+
+
+async def run(args: argparse.Namespace) -> None:
+    pairs = get_random_pairs(args.map, args.queries, args.seed)
+    clients = [
+        await PathClient.connect(args.socket, args.host, args.port)
+        for _ in range(args.connections)
+    ]
+    await clients[0].load(args.map)
+    option = PathfindingOption[args.algorithm]
+    latencies: List[float] = []
+    start_time = time.perf_counter()
+    await asyncio.gather(
+        *(
+            run_connection(client, connection_pairs, args.pipeline, option, latencies)
+            for client, connection_pairs in zip(
+                clients, np.array_split(pairs, args.connections)
+            )
+        )
+    )
+    elapsed_time = time.perf_counter() - start_time
+    for client in clients:
+        await client.close()
+
+    percentiles = np.percentile(latencies, PERCENTILES) * 1000
+    print(
+        f'{len(latencies)} queries in {elapsed_time:.3f} s: {len(latencies) / elapsed_time:.1f} queries/s, latency '
+        + ', '.join(
+            f'p{percentile} {latency:.3f} ms'
+            for percentile, latency in zip(PERCENTILES, percentiles)
+        )
+        + f', max {max(latencies) * 1000:.3f} ms'
+    )
+
+
+def main(argv: List[str]) -> None:
+    parser = argparse.ArgumentParser(
+        description='Measures throughput and latency of a path query server.'
+    )
+    parser.add_argument('map', help='Map file for the server to load')
+    parser.add_argument('--socket', help='Unix socket the server listens on')
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--connections', type=int, default=DEFAULT_CONNECTIONS)
+    parser.add_argument(
+        '--pipeline',
+        type=int,
+        default=DEFAULT_PIPELINE,
+        help='Queries in flight per connection',
+    )
+    parser.add_argument('--queries', type=int, default=DEFAULT_QUERIES)
+    parser.add_argument(
+        '--algorithm',
+        choices=[option.name for option in PathfindingOption],
+        default=PathfindingOption.A_STAR.name,
+    )
+    parser.add_argument('--seed', type=int, default=0)
+    asyncio.run(run(parser.parse_args(argv)))
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -1,10 +1,7 @@
 import sys
 import pygame as pg
-
-pg.init()
-
 from typing import Dict
-from enums import DrawMode, PathfindingOption
+from enums import DrawMode, MazeOption, PathfindingOption
 from Node import Pos
 from Lattice import Lattice, LatticeInfo, ScreenDim
 
@@ -22,14 +19,38 @@ event_key_to_pathfinding_mapping = {
     pg.K_b: PathfindingOption.BFS,
     pg.K_k: PathfindingOption.DIJKSTRA,
     pg.K_a: PathfindingOption.A_STAR,
+    pg.K_t: PathfindingOption.ALT,
+    pg.K_n: PathfindingOption.FRINGE,
+    pg.K_h: PathfindingOption.IDA_STAR,
+}
+
+EventKeyToMazeOptionMapping = Dict[int, MazeOption]
+event_key_to_maze_option_mapping: EventKeyToMazeOptionMapping = {
+    pg.K_1: MazeOption.RECURSIVE_BACKTRACKING,
+    pg.K_2: MazeOption.KRUSKAL,
+    pg.K_3: MazeOption.WILSON,
 }
 
 NODE_SIZE = 10
 SCREEN_SIDE_LEN = 1000
-
-screen_dim = ScreenDim(SCREEN_SIDE_LEN, SCREEN_SIDE_LEN)
-lattice_info = LatticeInfo(screen_dim, NODE_SIZE)
-
+DEFAULT_LATTICE_FILE_PATH = 'lattice.lat'
+TRACE_FILE_PATH = 'trace.json'
+RECORDING_FILE_PATH = 'recording.levt'
+NUM_AGENTS = 2000
+AGENT_STEPS_PER_SEC = 30
+MAX_BRUSH_RADIUS = 20
+
+# If a lattice file is given (python main.py <path>), it's loaded and the window is sized to fit it. S saves to the same file.
+lattice_file_path = sys.argv[1] if len(sys.argv) > 1 else None
+if lattice_file_path:
+    lattice = Lattice.load(lattice_file_path)
+    lattice_info = lattice.get_info()
+else:
+    screen_dim = ScreenDim(SCREEN_SIDE_LEN, SCREEN_SIDE_LEN)
+    lattice_info = LatticeInfo(screen_dim, NODE_SIZE)
+
+# Only the display is initialized (not the other pygame modules, e.g. audio), and only once the lattice is ready
+pg.display.init()
 clock = pg.time.Clock()
 mouse = pg.mouse.set_cursor(pg.cursors.tri_left)
 pg.display.set_caption('Lattice')
@@ -38,24 +59,51 @@ screen = pg.display.set_mode(
 )
 
 mouse_pressed = False
-
-lattice = Lattice(screen, lattice_info)
+# Mouse positions (nodes) since the last frame while drawing, which are drawn as one stroke at the end of the frame,
+# continuing from the last position drawn in the previous frame (None at the start of a stroke)
+stroke_positions = []
+last_stroke_pos = None
+brush_radius = 0
+maze_option = MazeOption.RECURSIVE_BACKTRACKING
+instrument = False
+# If True, visualizations, maze generations and Games of Life are recorded to RECORDING_FILE_PATH (see replay.py)
+record = False
+# While agents are moving towards the goal (F), their positions, and the flow field they follow
+agents = None
+flow_field = None
+
+if lattice_file_path:
+    lattice.set_pg_screen(screen)
+else:
+    lattice = Lattice(screen, lattice_info)
 lattice.draw()
 
 '''
 Event mapping:
 
 C - Clear Lattice
-M - Generate maze (using randomized DFS)
+M - Generate maze (using the selected maze generation algorithm, randomized DFS by default)
+1 - Select randomized DFS (recursive backtracking) for maze generation
+2 - Select randomized Kruskal's algorithm for maze generation
+3 - Select Wilson's algorithm for maze generation
 E - Erases wall nodes (Have to hold down key when clicking mouse)
 O - Sets origin node (Have to hold down key when clicking mouse, can only set 1 origin)
 G - Sets goal node (Have to hold down key when clicking mouse, can only set 1 goal)
 R - Generate random walls
+S - Save lattice (to the file it was loaded from, else to lattice.lat)
+I - Toggle search instrumentation (prints statistics after each visualization, and writes a timeline to trace.json)
+V - Toggle recording (visualizations, maze generations and Games of Life are recorded to recording.levt, see replay.py)
 L - Begin Game of Life simulation
+P - Find a path from the origin to the goal through a Game of Life, and play it back
+F - Spawn agents which move towards the goal along a flow field (walls can be drawn while they move)
+[ / ] - Decrease / increase the brush radius
 D - Begin DFS visualization (only starts if Origin and Goal are both set)
 B - Begin BFS visualization (only starts if Origin and Goal are both set)
 K - Begin Dijkstra's Pathfinding visualization
 A - Begin A* Search Visualization
+T - Begin A* Search Visualization with the ALT (landmark) heuristic
+N - Begin Fringe Search visualization
+H - Begin IDA* visualization
 Q - Quit
 '''
 
@@ -65,20 +113,52 @@ while True:
             sys.exit()
         if event.type == pg.MOUSEBUTTONDOWN and event.button == 1:
             mouse_pressed = True
+            # A new stroke, so it isn't joined to the end of the previous one
+            last_stroke_pos = None
         if event.type == pg.MOUSEBUTTONUP and event.button == 1:
             mouse_pressed = False
         if event.type == pg.KEYDOWN:
+            record_path = RECORDING_FILE_PATH if record else None
             if event.key == pg.K_c:
                 lattice.clear()
+            if event.key in event_key_to_maze_option_mapping.keys():
+                maze_option = event_key_to_maze_option_mapping[event.key]
             if event.key == pg.K_m:
-                lattice.generate_maze()
+                lattice.generate_maze(maze_option, record_path)
             if event.key == pg.K_r:
                 lattice.randomize(0.25)
             if event.key in event_key_to_pathfinding_mapping.keys():
                 pathfinding_option = event_key_to_pathfinding_mapping[event.key]
-                lattice.visualize(pathfinding_option)
+                stats = lattice.visualize(pathfinding_option, instrument, record_path)
+                if stats:
+                    print(stats)
+                    stats.export_chrome_trace(TRACE_FILE_PATH)
+            if event.key == pg.K_i:
+                instrument = not instrument
+                print(f'Instrumentation {"on" if instrument else "off"}')
+            if event.key == pg.K_s:
+                lattice.save(lattice_file_path or DEFAULT_LATTICE_FILE_PATH)
+                print('Lattice saved')
+            if event.key == pg.K_v:
+                record = not record
+                print(f'Recording {"on" if record else "off"}')
             if event.key == pg.K_l:
-                lattice.game_of_life()
+                lattice.game_of_life(record_path)
+            if event.key == pg.K_p:
+                lattice.visualize_path_through_life()
+            if event.key == pg.K_f:
+                if lattice.get_goal():
+                    flow_field = lattice.build_flow_field()
+                    agents = lattice.spawn_agents(flow_field, NUM_AGENTS)
+                    lattice.render_agents(agents)
+                else:
+                    print('Goal not set!')
+            if event.key == pg.K_LEFTBRACKET:
+                brush_radius = max(0, brush_radius - 1)
+                print(f'Brush radius {brush_radius}')
+            if event.key == pg.K_RIGHTBRACKET:
+                brush_radius = min(MAX_BRUSH_RADIUS, brush_radius + 1)
+                print(f'Brush radius {brush_radius}')
             if event.key == pg.K_q:
                 exit()
             else:
@@ -91,11 +171,26 @@ while True:
         if event.type == pg.KEYUP:
             lattice.set_draw_mode(DrawMode.SET_WALL)
 
-        if mouse_pressed:
-            x, y = pg.mouse.get_pos()
-            r = x // lattice_info.node_size
-            c = y // lattice_info.node_size
-            pos = Pos(r, c)
-            lattice.change_node_state_on_user_input(pos)
+        if mouse_pressed and event.type in [pg.MOUSEBUTTONDOWN, pg.MOUSEMOTION]:
+            x, y = event.pos
+            pos = Pos(x // lattice_info.node_size, y // lattice_info.node_size)
+            stroke_positions.append(pos)
+
+    if stroke_positions:  # All of this frame's mouse input is drawn at once
+        if last_stroke_pos:
+            stroke_positions.insert(0, last_stroke_pos)
+        lattice.draw_stroke(stroke_positions, brush_radius)
+        last_stroke_pos = stroke_positions[-1]
+        stroke_positions = []
+
+    if agents is not None:
+        flow_field.update()  # Only rebuilds the part of the field affected by walls drawn since the last step
+        new_agents = flow_field.step_agents(agents)
+        lattice.render_agents(new_agents, agents)
+        if (new_agents == agents).all():  # Every agent has arrived, or is stuck
+            agents = None
+        else:
+            agents = new_agents
+        clock.tick(AGENT_STEPS_PER_SEC)
 
     # clock.tick(60)
@@ -0,0 +1,103 @@
+'''
+Replays an event log recorded with Lattice.visualize(), generate_maze() or game_of_life() (record_path=..., or V in
+the visualizer) in a window, without recomputing anything. Only the nodes that changed are drawn every frame, so the
+cost of playback depends on the number of changes, not on the size of the lattice. Seeking backwards replays the log
+from its start (see EventLog.Replay), and compares the whole state array before and after the seek, so that only the
+nodes that differ are drawn.
+
+Usage: python replay.py <event log> [--fps 60] [--speed 1]
+
+Controls:
+
+SPACE - Pause / resume
+LEFT / RIGHT - Seek back / forward by SEEK_SECONDS of playback
+UP / DOWN - Double / halve the speed (frames of the log per frame on screen)
+HOME - Restart
+Q - Quit
+'''
+
+import sys
+import argparse
+import numpy as np
+import pygame as pg
+
+from Lattice import Lattice, LatticeInfo, ScreenDim
+from EventLog import EventLogReader, Replay
+
+DEFAULT_FPS = 60
+SEEK_SECONDS = 5
+MAX_SPEED = 2**16
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Replays a recorded event log.')
+    parser.add_argument('path', help='Event log file')
+    parser.add_argument(
+        '--fps', type=int, default=DEFAULT_FPS, help='Frames drawn per second'
+    )
+    parser.add_argument(
+        '--speed', type=int, default=1, help='Frames of the log per frame drawn'
+    )
+    args = parser.parse_args()
+
+    reader = EventLogReader(args.path)
+    nrows, ncols = reader.get_dim()
+    lattice_info = LatticeInfo(
+        ScreenDim(ncols * reader.node_size, nrows * reader.node_size),
+        reader.node_size,
+    )
+
+    pg.display.init()
+    clock = pg.time.Clock()
+    pg.display.set_caption('Lattice - Replay')
+    screen = pg.display.set_mode(
+        (lattice_info.screen_dim.w, lattice_info.screen_dim.h), pg.DOUBLEBUF
+    )
+    lattice = Lattice(screen, lattice_info)
+    replay = Replay(reader, lattice.states)
+    lattice.draw()
+
+    speed = max(1, args.speed)
+    paused = False
+    while True:
+        for event in pg.event.get():
+            if event.type == pg.QUIT:
+                sys.exit()
+            if event.type != pg.KEYDOWN:
+                continue
+            if event.key == pg.K_SPACE:
+                paused = not paused
+            if event.key in [pg.K_LEFT, pg.K_RIGHT, pg.K_HOME]:
+                previous_states = lattice.states.copy()
+                if event.key == pg.K_HOME:
+                    replay.seek(0)
+                else:
+                    step = speed * args.fps * SEEK_SECONDS
+                    replay.seek(
+                        replay.frame + (step if event.key == pg.K_RIGHT else -step)
+                    )
+                indices = np.flatnonzero(lattice.states != previous_states)
+                lattice.render_nodes(
+                    [lattice.get_node_from_flat_index(int(index)) for index in indices]
+                )
+            if event.key == pg.K_UP:
+                speed = min(MAX_SPEED, speed * 2)
+            if event.key == pg.K_DOWN:
+                speed = max(1, speed // 2)
+            if event.key == pg.K_q:
+                sys.exit()
+            pg.display.set_caption(
+                f'Lattice - Replay - frame {replay.frame}/{reader.get_num_frames()}'
+                f' - speed {speed}x{" (paused)" if paused else ""}'
+            )
+
+        if not paused and not replay.is_done():
+            indices = np.unique(replay.advance(speed))
+            lattice.render_nodes(
+                [lattice.get_node_from_flat_index(int(index)) for index in indices]
+            )
+        clock.tick(args.fps)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,166 @@
+import sys
+import time
+import tracemalloc
+from collections import namedtuple
+from typing import Iterator, List, Optional
+
+from enums import NodeState, PathfindingOption
+from Node import Pos
+from Lattice import Lattice
+
+Scenario = namedtuple(
+    'Scenario', ['bucket', 'map_name', 'origin', 'goal', 'optimal_length']
+)
+# expansions counts every expansion, including repeated ones (see Lattice.counting()). peak_memory is the peak number
+# of bytes allocated during the search on top of the lattice's preallocated scratch buffers, None if it wasn't measured
+ScenarioResult = namedtuple(
+    'ScenarioResult',
+    ['scenario', 'path_found', 'path_cost', 'expansions', 'time', 'peak_memory'],
+    defaults=[None],
+)
+
+# Path costs within this distance of the optimal length in a scenario file count as optimal (lengths are rounded there)
+OPTIMAL_LENGTH_TOLERANCE = 1e-4
+
+
+def read_scenarios(path: str) -> Iterator[Scenario]:
+    '''
+    Streams the scenarios (origin/goal pairs) from a Moving AI .scen file (https://movingai.com/benchmarks/formats.html).
+    After an optional 'version' line, every line holds tab separated: bucket, map, map width, map height, start x,
+    start y, goal x, goal y and optimal length. x is the column and y the row, so (x, y) becomes Pos(y, x).
+    '''
+
+    with open(path) as f:
+        for line in f:
+            fields = line.split()
+            if not fields or fields[0] == 'version':
+                continue
+            if len(fields) != 9:
+                raise ValueError(f'Malformed scenario in {path}: {line!r}')
+            bucket, map_name = int(fields[0]), fields[1]
+            origin_c, origin_r, goal_c, goal_r = map(int, fields[4:8])
+            yield Scenario(
+                bucket,
+                map_name,
+                Pos(origin_r, origin_c),
+                Pos(goal_r, goal_c),
+                float(fields[8]),
+            )
+
+
+def run_scenario(
+    lattice: Lattice,
+    scenario: Scenario,
+    option: PathfindingOption,
+    measure_memory: bool = False,
+) -> ScenarioResult:
+    '''
+    Runs a single scenario on the (headless) lattice. Only the search itself is timed, not setting the origin and goal
+    or clearing the previous search's results. Scenarios whose origin or goal is outside the lattice or a wall can't be
+    run, so they raise a ValueError. A scenario whose origin is its goal isn't searched, its path has length 0. If
+    measure_memory is True, the peak memory allocated during the search is measured with tracemalloc (not including
+    the scratch buffers a regular lattice allocates once, see SearchScratch),
+    which slows the search down (and therefore inflates its time) considerably.
+    '''
+
+    lattice.clear_search_results()
+    nrows, ncols = lattice.get_dim()
+    for pos in [scenario.origin, scenario.goal]:
+        if not (0 <= pos.r < nrows and 0 <= pos.c < ncols):
+            raise ValueError(f'{pos} is outside the lattice in {scenario}')
+        if lattice.get_node(pos.r, pos.c).get_state() == NodeState.WALL:
+            raise ValueError(f'{pos} is not passable in {scenario}')
+    if scenario.origin == scenario.goal:
+        # Setting the goal on the origin would unset the origin
+        return ScenarioResult(scenario, True, 0, 0, 0.0, 0 if measure_memory else None)
+    lattice.set_origin(scenario.origin)
+    lattice.set_goal(scenario.goal)
+    peak_memory: Optional[int] = None
+    if measure_memory:
+        tracemalloc.start()
+    with lattice.counting() as stats:
+        start_time = time.perf_counter()
+        path_found = lattice.search(option)
+        elapsed_time = time.perf_counter() - start_time
+    if measure_memory:
+        peak_memory = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return ScenarioResult(
+        scenario,
+        path_found,
+        lattice.get_path_cost(),
+        stats.nodes_expanded,
+        elapsed_time,
+        peak_memory,
+    )
+
+
+def run_scenarios(
+    lattice: Lattice, scenarios: Iterator[Scenario], option: PathfindingOption
+) -> Iterator[ScenarioResult]:
+    '''
+    Runs every scenario on the lattice with the given pathfinding algorithm, yielding a result for each as soon as
+    it's done.
+    '''
+
+    for scenario in scenarios:
+        yield run_scenario(lattice, scenario, option)
+
+
+def is_optimal(result: ScenarioResult) -> bool:
+    '''
+    Returns whether the path found has the optimal length given in the scenario. Note that Moving AI scenario files
+    list octile (8-connected) optimal lengths, while the lattice is 4-connected, so paths which need a diagonal move
+    will be longer than that even if they're shortest on the lattice.
+    '''
+
+    return (
+        result.path_cost is not None
+        and abs(result.path_cost - result.scenario.optimal_length)
+        <= OPTIMAL_LENGTH_TOLERANCE
+    )
+
+
+def print_results(results: List[ScenarioResult]) -> None:
+    '''
+    Prints a line per scenario result, followed by a summary.
+    '''
+
+    for i, result in enumerate(results):
+        print(
+            f'{i}: {result.scenario.origin} -> {result.scenario.goal}, '
+            f'cost {result.path_cost} (optimal {result.scenario.optimal_length}), '
+            f'{result.expansions} expansions, {result.time * 1000:.3f} ms'
+            + (
+                f', peak memory {result.peak_memory / 1024:.1f} KiB on top of the scratch buffers'
+                if result.peak_memory is not None
+                else ''
+            )
+        )
+    num_optimal = sum(is_optimal(result) for result in results)
+    total_time = sum(result.time for result in results)
+    print(
+        f'{len(results)} scenarios, {num_optimal} optimal, '
+        f'{sum(result.expansions for result in results)} expansions, {total_time:.3f} s'
+    )
+
+
+USAGE = (
+    'Usage: python scenarios.py <map file> <scenario file> '
+    f'<{"|".join(option.name for option in PathfindingOption)}>'
+)
+
+if __name__ == '__main__':
+    if len(sys.argv) != 4 or sys.argv[3] not in PathfindingOption.__members__:
+        sys.exit(USAGE)
+    map_path, scenario_path, option_name = sys.argv[1:4]
+    lattice = Lattice.load_movingai_map(map_path)
+    print_results(
+        list(
+            run_scenarios(
+                lattice,
+                read_scenarios(scenario_path),
+                PathfindingOption[option_name],
+            )
+        )
+    )
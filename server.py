@@ -0,0 +1,371 @@
+'''
+Path query service. Serves a single lattice over a local socket (a Unix socket, or TCP on localhost), so that a game
+backend can use the pathfinder without importing any of the visualizer. pygame is never imported.
+
+Usage: python server.py [--socket <path> | --host 127.0.0.1 --port 7878] [--map <path>] [--workers N]
+                        [--max-pipeline N]
+
+Requests and responses are JSON objects, one per line. Every request has an 'op', and optionally an 'id' which is
+copied to its response:
+
+* {"op": "load", "path": <map>} loads a lattice file (.lat) or Moving AI map (.map), replacing the current lattice.
+  Responds with its "nrows" and "ncols".
+* {"op": "set_cells", "cells": [[r, c], ...], "state": "WALL" | "VACANT"} edits cells of the current lattice.
+* {"op": "find_path", "origin": [r, c], "goal": [r, c], "algorithm": "A_STAR"} responds with the "path" (list of
+  [r, c], from origin to goal), or null if there is none. The algorithm is optional, A* by default.
+
+A request that fails gets a response with an "error" instead. Path queries are answered by a pool of worker processes,
+which search on the lattice's walls in shared memory (see shared_lattice.py). Requests can be pipelined: a client
+can send many without waiting for responses, and responses to queries are sent as soon as they're done, so they can
+arrive out of order (match them by id). Edits and loads wait for queries sent before them to finish, and queries sent
+after them wait for them, so every query sees the lattice as of when it was sent. Once a connection has max-pipeline
+requests in flight, the server stops reading from it until one of them is done, so a client sending faster than it's
+served is slowed down by its socket instead of queueing requests in the server without limit.
+'''
+
+import os
+import sys
+import json
+import asyncio
+import argparse
+from contextlib import asynccontextmanager
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+import numpy as np
+
+from enums import NodeState, PathfindingOption
+from Node import Pos
+from Lattice import Lattice
+from shared_lattice import find_path_in_worker, publish_walls, release_walls
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 7878
+DEFAULT_MAX_PIPELINE = 64
+MAX_LINE_LENGTH = 2**24  # Longest request line accepted, in bytes
+EDITABLE_STATES = [NodeState.WALL, NodeState.VACANT]
+
+
+def load_lattice(path: str) -> Lattice:
+    '''
+    Loads a lattice file (.lat) or Moving AI map (.map) headless.
+    '''
+
+    if os.path.splitext(path)[1] == '.map':
+        return Lattice.load_movingai_map(path)
+    return Lattice.load(path)
+
+
+class RequestError(Exception):
+    '''
+    Raised while handling a request that can't be served. Its message is sent back as the response's error.
+    '''
+
+
+class GridLock:
+    '''
+    Lets any number of path queries search the lattice at once, but edits (and loads) only one at a time and while
+    no query is searching. Waiting edits go before queries that arrive after them, so that a steady stream of queries
+    can't hold them off.
+    '''
+
+    def __init__(self) -> None:
+        self.condition = asyncio.Condition()
+        self.num_readers = 0
+        self.num_waiting_writers = 0
+        self.writing = False
+
+    @asynccontextmanager
+    async def read(self) -> AsyncIterator[None]:
+        async with self.condition:
+            await self.condition.wait_for(
+                lambda: not self.writing and not self.num_waiting_writers
+            )
+            self.num_readers += 1
+        try:
+            yield
+        finally:
+            async with self.condition:
+                self.num_readers -= 1
+                self.condition.notify_all()
+
+    @asynccontextmanager
+    async def write(self) -> AsyncIterator[None]:
+        async with self.condition:
+            self.num_waiting_writers += 1
+            try:
+                await self.condition.wait_for(
+                    lambda: not self.writing and not self.num_readers
+                )
+            finally:
+                self.num_waiting_writers -= 1
+            self.writing = True
+        try:
+            yield
+        finally:
+            async with self.condition:
+                self.writing = False
+                self.condition.notify_all()
+
+
+class PathServer:
+    '''
+    Holds the served lattice, whose state array lives in shared memory so that edits are seen by the workers without
+    copying anything, and the pool of worker processes that answer path queries on it.
+    '''
+
+    def __init__(
+        self, workers: Optional[int] = None, max_pipeline: int = DEFAULT_MAX_PIPELINE
+    ) -> None:
+        self.executor = ProcessPoolExecutor(max_workers=workers)
+        self.max_pipeline = max_pipeline
+        self.lattice: Optional[Lattice] = None
+        self.shared_memory: Optional[SharedMemory] = None
+        self.grid_lock = GridLock()
+
+    def load(self, path: str) -> None:
+        '''
+        Loads a map file, publishes its walls and replaces the current lattice with a headless one backed by them.
+        '''
+
+        lattice = load_lattice(path)
+        shared_memory = publish_walls(lattice)
+        states = np.ndarray(
+            lattice.states.shape, dtype=np.uint8, buffer=shared_memory.buf
+        )
+        self.close_lattice()
+        self.lattice = Lattice(None, lattice.get_info(), states=states)
+        self.shared_memory = shared_memory
+
+    def close_lattice(self) -> None:
+        '''
+        Releases the shared memory of the current lattice, if any. Workers still attached to it keep their mapping
+        until they attach to the next one.
+        '''
+
+        if self.shared_memory is None:
+            return
+        self.lattice = None  # Releases the views of the block, so that it can be closed
+        release_walls(self.shared_memory, unlink=True)
+        self.shared_memory = None
+
+    def close(self) -> None:
+        self.executor.shutdown(cancel_futures=True)
+        self.close_lattice()
+
+    def get_lattice(self) -> Lattice:
+        if self.lattice is None:
+            raise RequestError('No map loaded')
+        return self.lattice
+
+    def get_pos(self, value: Any, name: str) -> Pos:
+        '''
+        Returns the position given as [r, c] in a request, checking that it's on the lattice. name is used in the
+        error message if it isn't.
+        '''
+
+        nrows, ncols = self.get_lattice().get_dim()
+        try:
+            r, c = value
+            pos = Pos(int(r), int(c))
+        except (TypeError, ValueError):
+            raise RequestError(f'{name} must be [r, c]')
+        if not (0 <= pos.r < nrows and 0 <= pos.c < ncols):
+            raise RequestError(f'{name} {list(pos)} is outside the lattice')
+        return pos
+
+    async def handle_load(self, request: Dict) -> Dict:
+        async with self.grid_lock.write():
+            if 'path' not in request:
+                raise RequestError('path missing')
+            if not isinstance(request['path'], str):
+                raise RequestError('path must be a string')
+            try:
+                self.load(request['path'])
+            except (OSError, ValueError) as e:
+                raise RequestError(str(e))
+            nrows, ncols = self.lattice.get_dim()
+            return {'nrows': nrows, 'ncols': ncols}
+
+    async def handle_set_cells(self, request: Dict) -> Dict:
+        async with self.grid_lock.write():
+            lattice = self.get_lattice()
+            try:
+                state = NodeState[request.get('state', NodeState.WALL.name)]
+            except (KeyError, TypeError):
+                state = None
+            if state not in EDITABLE_STATES:
+                raise RequestError(
+                    f'state must be one of {[state.name for state in EDITABLE_STATES]}'
+                )
+            if not isinstance(request.get('cells', []), list):
+                raise RequestError('cells must be a list of [r, c]')
+            cells = [self.get_pos(cell, 'cell') for cell in request.get('cells', [])]
+            if cells:
+                rows, cols = zip(*cells)
+                lattice.states[rows, cols] = state.value
+            return {'num_cells': len(cells)}
+
+    async def handle_find_path(self, request: Dict) -> Dict:
+        try:
+            option = PathfindingOption[
+                request.get('algorithm', PathfindingOption.A_STAR.name)
+            ]
+        except (KeyError, TypeError):
+            raise RequestError(f'Unknown algorithm {request["algorithm"]!r}')
+        async with self.grid_lock.read():
+            lattice = self.get_lattice()
+            origin = self.get_pos(request.get('origin'), 'origin')
+            goal = self.get_pos(request.get('goal'), 'goal')
+            path = await asyncio.get_running_loop().run_in_executor(
+                self.executor,
+                find_path_in_worker,
+                self.shared_memory.name,
+                lattice.get_info(),
+                origin,
+                goal,
+                option,
+            )
+        return {'path': None if path is None else [list(pos) for pos in path]}
+
+    async def handle_request(self, request: Any) -> Dict:
+        '''
+        Handles a single (parsed) request, and returns the response to it.
+        '''
+
+        if not isinstance(request, dict):
+            return {'error': 'Request must be a JSON object'}
+        response = {'id': request['id']} if 'id' in request else {}
+        handlers = {
+            'load': self.handle_load,
+            'set_cells': self.handle_set_cells,
+            'find_path': self.handle_find_path,
+        }
+        try:
+            handler = handlers[request.get('op')]
+        except (KeyError, TypeError):
+            response['error'] = f'Unknown op {request.get("op")!r}'
+            return response
+        try:
+            response.update(await handler(request))
+        except RequestError as e:
+            response['error'] = str(e)
+        except Exception as e:
+            # A request the checks above missed still gets its response, and doesn't end the connection
+            response['error'] = f'{type(e).__name__}: {e}'
+        return response
+
+    async def handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        '''
+        Serves a single client connection. Path queries are handled concurrently (up to max_pipeline at once), while
+        edits and loads are handled one at a time, once the queries sent before them are done.
+        '''
+
+        pipeline_slots = asyncio.Semaphore(self.max_pipeline)
+        write_lock = asyncio.Lock()
+        tasks = set()
+
+        async def respond(response: Dict) -> None:
+            async with write_lock:
+                writer.write(json.dumps(response).encode() + b'\n')
+                await writer.drain()
+
+        async def handle_and_respond(request: Any) -> None:
+            try:
+                await respond(await self.handle_request(request))
+            except ConnectionError:
+                pass
+            finally:
+                pipeline_slots.release()
+
+        try:
+            while True:
+                await pipeline_slots.acquire()  # Stops reading until a request is done
+                line = await reader.readline()
+                if not line:
+                    pipeline_slots.release()
+                    break
+                if not line.strip():
+                    pipeline_slots.release()
+                    continue
+                try:
+                    request = json.loads(line)
+                except ValueError:
+                    request = None
+                if isinstance(request, dict) and request.get('op') == 'find_path':
+                    task = asyncio.create_task(handle_and_respond(request))
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+                else:
+                    # Everything else is handled in order: after the queries before it, and before reading on
+                    if tasks:
+                        await asyncio.gather(*tasks)
+                    await handle_and_respond(request)
+            if tasks:
+                await asyncio.gather(*tasks)
+        except (ConnectionError, ValueError):  # ValueError if a line is too long
+            pass
+        finally:
+            for task in tasks:
+                task.cancel()
+            writer.close()
+
+    async def serve(
+        self,
+        socket_path: Optional[str] = None,
+        host: str = DEFAULT_HOST,
+        port: int = DEFAULT_PORT,
+        ready: Optional[asyncio.Event] = None,
+    ) -> None:
+        '''
+        Serves clients on the Unix socket at socket_path if given, else on TCP host:port, until cancelled. Sets ready
+        (if given) once clients can connect.
+        '''
+
+        if socket_path:
+            server = await asyncio.start_unix_server(
+                self.handle_connection, socket_path, limit=MAX_LINE_LENGTH
+            )
+        else:
+            server = await asyncio.start_server(
+                self.handle_connection, host, port, limit=MAX_LINE_LENGTH
+            )
+        async with server:
+            if ready:
+                ready.set()
+            await server.serve_forever()
+
+
+def main(argv: List[str]) -> None:
+    parser = argparse.ArgumentParser(description='Serves path queries on a lattice.')
+    parser.add_argument('--socket', help='Path of a Unix socket to listen on')
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--map', help='Map file to load on startup')
+    parser.add_argument(
+        '--workers', type=int, help='Number of worker processes (default: CPUs)'
+    )
+    parser.add_argument(
+        '--max-pipeline',
+        type=int,
+        default=DEFAULT_MAX_PIPELINE,
+        help='Requests in flight per connection before it stops being read',
+    )
+    args = parser.parse_args(argv)
+
+    server = PathServer(args.workers, args.max_pipeline)
+    try:
+        if args.map:
+            server.load(args.map)
+        asyncio.run(server.serve(args.socket, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,140 @@
+'''
+Solves path queries on one lattice across a pool of worker processes (see Lattice.solve_many()). The walls are
+published once into a block of shared memory, and every worker attaches to it when it starts and wraps it in a
+read-only headless lattice of its own. Only the (origin, goal) pairs and the resulting paths are sent between
+processes, never the grid itself.
+'''
+
+import numpy as np
+from multiprocessing.shared_memory import SharedMemory
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple
+
+from enums import NodeState, PathfindingOption
+from Node import Pos
+from Lattice import Lattice, LatticeInfo
+
+# Number of chunks of pairs handed out to every worker, so that workers which finish early can pick up more
+CHUNKS_PER_WORKER = 4
+
+# Set in every worker process by attach_worker_lattice() and init_worker()
+worker_shared_memory: Optional[SharedMemory] = None
+worker_lattice: Optional[Lattice] = None
+worker_option: Optional[PathfindingOption] = None
+
+
+def publish_walls(lattice: Lattice) -> SharedMemory:
+    '''
+    Copies the lattice's walls into a new block of shared memory (one byte per node, row-major, either
+    NodeState.WALL or NodeState.VACANT) and returns it. The caller has to close and unlink it.
+    '''
+
+    shared_memory = SharedMemory(create=True, size=max(lattice.states.nbytes, 1))
+    states = np.ndarray(lattice.states.shape, dtype=np.uint8, buffer=shared_memory.buf)
+    states[...] = np.where(
+        lattice.states == NodeState.WALL.value,
+        NodeState.WALL.value,
+        NodeState.VACANT.value,
+    )
+    return shared_memory
+
+
+def release_walls(shared_memory: SharedMemory, unlink: bool) -> None:
+    '''
+    Closes a block of published walls, and unlinks it too if unlink is True (only the process that published it
+    should). Views of the block (e.g. a lattice's state array) have to be released first. If it's still referenced
+    somewhere anyway, it's left to be closed when that's collected.
+    '''
+
+    if unlink:
+        shared_memory.unlink()
+    try:
+        shared_memory.close()
+    except BufferError:
+        pass
+
+
+def attach_worker_lattice(name: str, lattice_info: LatticeInfo) -> Lattice:
+    '''
+    Returns the worker's headless lattice backed by the published walls of the given name, attaching to them first if
+    the worker hasn't yet (or was attached to different ones, e.g. before a new map was loaded by the server).
+    '''
+
+    global worker_shared_memory, worker_lattice
+    if worker_shared_memory is None or worker_shared_memory.name != name:
+        if worker_shared_memory is not None:
+            # Releases the views of the old block, so that it can be closed
+            worker_lattice = None
+            release_walls(worker_shared_memory, unlink=False)
+        # Workers share the resource tracker of the process that created the block, which unlinks it only once
+        worker_shared_memory = SharedMemory(name=name)
+        shape = (
+            lattice_info.screen_dim.h // lattice_info.node_size,
+            lattice_info.screen_dim.w // lattice_info.node_size,
+        )
+        states = np.ndarray(shape, dtype=np.uint8, buffer=worker_shared_memory.buf)
+        # Shared by all workers, so searches mustn't write to it
+        states.flags.writeable = False
+        worker_lattice = Lattice(None, lattice_info, states=states)
+    return worker_lattice
+
+
+def init_worker(
+    name: str, lattice_info: LatticeInfo, option: PathfindingOption
+) -> None:
+    '''
+    Runs once in every worker process of solve_shared(): attaches to the published walls.
+    '''
+
+    global worker_option
+    attach_worker_lattice(name, lattice_info)
+    worker_option = option
+
+
+def solve_in_worker(pair: Tuple[Pos, Pos]) -> Optional[List[Pos]]:
+    '''
+    Finds the path for a single (origin, goal) pair on the worker's lattice.
+    '''
+
+    origin, goal = pair
+    return worker_lattice.find_path(Pos(*origin), Pos(*goal), worker_option)
+
+
+def find_path_in_worker(
+    name: str,
+    lattice_info: LatticeInfo,
+    origin: Pos,
+    goal: Pos,
+    option: PathfindingOption,
+) -> Optional[List[Pos]]:
+    '''
+    Finds the path between two positions on the published walls of the given name. Unlike solve_in_worker(), doesn't
+    need the pool to be set up for a single lattice, so that one pool can serve lattices that are replaced over time.
+    '''
+
+    lattice = attach_worker_lattice(name, lattice_info)
+    return lattice.find_path(origin, goal, option)
+
+
+def solve_shared(
+    lattice: Lattice,
+    pairs: List[Tuple[Pos, Pos]],
+    option: PathfindingOption,
+    workers: int,
+) -> List[Optional[List[Pos]]]:
+    '''
+    Publishes the lattice's walls and solves the pairs across the given number of worker processes. Returns the paths
+    in the order of the pairs.
+    '''
+
+    shared_memory = publish_walls(lattice)
+    try:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=init_worker,
+            initargs=(shared_memory.name, lattice.get_info(), option),
+        ) as executor:
+            chunksize = max(1, len(pairs) // (workers * CHUNKS_PER_WORKER))
+            return list(executor.map(solve_in_worker, pairs, chunksize=chunksize))
+    finally:
+        release_walls(shared_memory, unlink=True)
@@ -0,0 +1,89 @@
+import json
+import pytest
+
+from Node import Pos
+from enums import PathfindingOption
+from Lattice import Lattice, LatticeInfo, ScreenDim
+from batch import get_map_paths, main, solve_map, solve_maps
+
+MAP = '''type octile
+height 3
+width 4
+map
+....
+.@@.
+....
+'''
+
+SCENARIOS = '''version 1
+0\tgrid.map\t4\t3\t0\t0\t3\t2\t5
+0\tgrid.map\t4\t3\t1\t1\t3\t2\t3
+0\tgrid.map\t4\t3\t0\t2\t0\t2\t0
+0\tgrid.map\t4\t3\t0\t0\t9\t2\t9
+'''
+
+
+@pytest.fixture
+def map_dir(tmp_path) -> str:
+    (tmp_path / 'grid.map').write_text(MAP)
+    (tmp_path / 'grid.map.scen').write_text(SCENARIOS)
+    lattice = Lattice(None, LatticeInfo(ScreenDim(50, 50), 10))
+    lattice.set_origin(Pos(0, 0))
+    lattice.set_goal(Pos(4, 4))
+    lattice.save(str(tmp_path / 'open.lat'))
+    (tmp_path / 'notes.txt').write_text('Not a map')
+    return str(tmp_path)
+
+
+class TestBatch:
+    def test_get_map_paths(self, map_dir: str) -> None:
+        assert [path[len(map_dir) + 1 :] for path in get_map_paths([map_dir])] == [
+            'grid.map',
+            'open.lat',
+        ]
+
+    def test_solve_lattice_file(self, map_dir: str) -> None:
+        (result,) = solve_map(f'{map_dir}/open.lat', PathfindingOption.BFS)
+        assert result['path_found']
+        assert result['cost'] == 8
+        assert result['path'][0] == [0, 0]
+        assert result['path'][-1] == [4, 4]
+        assert len(result['path']) == 9
+
+    def test_solve_movingai_map(self, map_dir: str) -> None:
+        results = solve_map(f'{map_dir}/grid.map', PathfindingOption.A_STAR)
+        assert len(results) == 4
+        assert results[0]['cost'] == 5
+        assert 'error' in results[1]  # The origin is a wall
+        assert results[2]['cost'] == 0
+        assert results[2]['path'] == [[2, 0]]
+        assert 'outside' in results[3]['error']
+
+    def test_measure_memory(self, map_dir: str) -> None:
+        (result,) = solve_map(f'{map_dir}/open.lat', PathfindingOption.BFS)
+        assert 'peak_memory' not in result
+        for option in [PathfindingOption.A_STAR, PathfindingOption.IDA_STAR]:
+            (result,) = solve_map(f'{map_dir}/open.lat', option, measure_memory=True)
+            assert result['cost'] == 8
+            assert result['peak_memory'] > 0
+
+    def test_main(self, map_dir: str, tmp_path) -> None:
+        output_path = tmp_path / 'results.jsonl'
+        main([map_dir, '--workers', '2', '--output', str(output_path)])
+        results = [json.loads(line) for line in output_path.read_text().splitlines()]
+        assert len(results) == 5
+        assert {result['map'][len(map_dir) + 1 :] for result in results} == {
+            'grid.map',
+            'open.lat',
+        }
+
+    def test_missing_file(self, tmp_path) -> None:
+        (result,) = solve_map(str(tmp_path / 'missing.lat'), PathfindingOption.BFS)
+        assert 'error' in result
+
+    def test_worker_failure(self, map_dir: str, monkeypatch) -> None:
+        # A function which can't be sent to the workers fails the map's future, like a worker dying would
+        monkeypatch.setattr('batch.solve_map', lambda *args: [lambda: None])
+        (result,) = solve_maps([f'{map_dir}/open.lat'], PathfindingOption.BFS, 1)
+        assert result['map'] == f'{map_dir}/open.lat'
+        assert 'error' in result
@@ -0,0 +1,38 @@
+import json
+
+from benchmarks import get_benchmarks, main, run_benchmark
+
+
+class TestBenchmarks:
+    def test_all_benchmarks_run(self) -> None:
+        for benchmark in get_benchmarks([21]):
+            result = run_benchmark(benchmark, 1)
+            assert len(result.times) == 1
+            assert result.times[0] >= 0
+
+    def test_search_results(self) -> None:
+        benchmarks = {benchmark.name: benchmark for benchmark in get_benchmarks([21])}
+        bfs_result = run_benchmark(benchmarks['search/BFS/maze/21'], 1)
+        a_star_result = run_benchmark(benchmarks['search/A_STAR/maze/21'], 1)
+        assert bfs_result.extra['path_found']
+        assert bfs_result.extra['path_cost'] == a_star_result.extra['path_cost']
+
+    def test_json_output(self, tmp_path) -> None:
+        output_path = tmp_path / 'results.json'
+        main(
+            [
+                '--sizes',
+                '21',
+                '--repeat',
+                '2',
+                '--filter',
+                '^randomize/',
+                '--output',
+                str(output_path),
+            ]
+        )
+        results = json.loads(output_path.read_text())
+        assert [benchmark['name'] for benchmark in results['benchmarks']] == [
+            'randomize/21'
+        ]
+        assert len(results['benchmarks'][0]['times']) == 2
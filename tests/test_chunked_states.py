@@ -0,0 +1,54 @@
+import pytest
+
+from enums import NodeState
+from ChunkedStates import CHUNK_SIZE, ChunkedStates
+
+
+@pytest.fixture
+def states() -> ChunkedStates:
+    return ChunkedStates((10**6, 10**6))
+
+
+class TestChunkedStates:
+    def test_initial_state(self, states: ChunkedStates) -> None:
+        assert states[0, 0] == NodeState.VACANT.value
+        assert states[10**6 - 1, 10**6 - 1] == NodeState.VACANT.value
+        assert states.get_num_chunks() == 0
+
+    def test_allocate_on_write(self, states: ChunkedStates) -> None:
+        states[5, 5] = NodeState.VACANT.value
+        assert states.get_num_chunks() == 0
+        states[5, 5] = NodeState.WALL.value
+        states[CHUNK_SIZE - 1, 0] = NodeState.WALL.value
+        assert states.get_num_chunks() == 1
+        states[123456, 654321] = NodeState.GOAL.value
+        assert states.get_num_chunks() == 2
+        assert states.nbytes == 2 * CHUNK_SIZE * CHUNK_SIZE
+        assert states[5, 5] == NodeState.WALL.value
+        assert states[123456, 654321] == NodeState.GOAL.value
+        assert states[5, 6] == NodeState.VACANT.value
+
+    def test_fill(self) -> None:
+        states = ChunkedStates((100, 70))
+        states.fill(NodeState.WALL.value)
+        assert states.get_num_chunks() == 4
+        assert states[99, 69] == NodeState.WALL.value
+        states.fill(NodeState.VACANT.value)
+        assert states.get_num_chunks() == 0
+        assert states[99, 69] == NodeState.VACANT.value
+
+    def test_free_when_vacant(self, states: ChunkedStates) -> None:
+        states[5, 5] = NodeState.WALL.value
+        states[6, 6] = NodeState.VISITED.value
+        states[6, 6] = NodeState.PATH.value
+        states[5, 5] = NodeState.VACANT.value
+        assert states.get_num_chunks() == 1
+        states[6, 6] = NodeState.VACANT.value
+        assert states.get_num_chunks() == 0
+        assert states[6, 6] == NodeState.VACANT.value
+        edge_states = ChunkedStates((100, 70))
+        edge_states.fill(NodeState.WALL.value)
+        for r in range(CHUNK_SIZE, 100):
+            for c in range(CHUNK_SIZE, 70):
+                edge_states[r, c] = NodeState.VACANT.value
+        assert edge_states.get_num_chunks() == 3
@@ -0,0 +1,27 @@
+import pytest
+
+from DisjointSet import DisjointSet
+
+
+@pytest.fixture
+def disjoint_set() -> DisjointSet:
+    return DisjointSet(10)
+
+
+class TestDisjointSet:
+    def test_initial_state(self, disjoint_set: DisjointSet) -> None:
+        for x in range(10):
+            assert disjoint_set.find(x) == x
+
+    def test_union(self, disjoint_set: DisjointSet) -> None:
+        assert disjoint_set.union(0, 1)
+        assert disjoint_set.union(1, 2)
+        assert not disjoint_set.union(0, 2)
+        assert disjoint_set.connected(0, 2)
+        assert not disjoint_set.connected(0, 3)
+
+    def test_path_compression(self, disjoint_set: DisjointSet) -> None:
+        for x in range(9):
+            disjoint_set.union(x, x + 1)
+        root = disjoint_set.find(9)
+        assert all(disjoint_set.parent[x] == root for x in range(10))
@@ -0,0 +1,102 @@
+import pytest
+import numpy as np
+
+from Node import Pos
+from enums import MazeOption, NodeState, PathfindingOption
+from Lattice import Lattice, LatticeInfo, ScreenDim
+from EventLog import (
+    EventLogReader,
+    EventLogWriter,
+    Replay,
+    decode_varints,
+    encode_varints,
+)
+
+
+@pytest.fixture
+def lattice() -> Lattice:
+    return Lattice(None, LatticeInfo(ScreenDim(310, 230), 10))
+
+
+def test_varints() -> None:
+    values = np.array([0, 1, 127, 128, 300, 2**32, 2**63 - 1], dtype=np.uint64)
+    encoded = encode_varints(values)
+    assert len(encoded) == 1 + 1 + 1 + 2 + 2 + 5 + 9
+    assert (decode_varints(np.frombuffer(encoded, dtype=np.uint8)) == values).all()
+
+
+class TestEventLog:
+    def test_frames(self, tmp_path, lattice: Lattice) -> None:
+        path = str(tmp_path / 'log.levt')
+        writer = EventLogWriter(path, lattice.states, 10)
+        snapshots = [lattice.states.copy()]
+        rng = np.random.default_rng(0)
+        for _ in range(20):
+            indices = rng.integers(lattice.states.size, size=rng.integers(1, 50))
+            lattice.states.ravel()[indices] = rng.integers(6, size=len(indices))
+            writer.record(indices)
+            if (lattice.states != snapshots[-1]).any():
+                snapshots.append(lattice.states.copy())
+        writer.record(np.array([0]))  # Nothing changed, so no frame
+        writer.close()
+
+        reader = EventLogReader(path)
+        assert reader.get_dim() == lattice.get_dim()
+        assert reader.get_num_frames() == len(snapshots) - 1
+        states = np.zeros_like(lattice.states)
+        replay = Replay(reader, states)
+        for snapshot in snapshots[1:]:
+            replay.advance()
+            assert (states == snapshot).all()
+        assert replay.is_done()
+        assert not len(replay.advance())
+        for frame in [3, 1, 15, 0, len(snapshots) - 1]:
+            replay.seek(frame)
+            assert (states == snapshots[frame]).all()
+
+    def test_not_an_event_log(self, tmp_path, lattice: Lattice) -> None:
+        path = str(tmp_path / 'lattice.lat')
+        lattice.save(path)
+        with pytest.raises(ValueError, match='not an event log'):
+            EventLogReader(path)
+
+    def test_record_maze_and_search(self, tmp_path, lattice: Lattice) -> None:
+        path = str(tmp_path / 'maze.levt')
+        lattice.generate_maze(MazeOption.RECURSIVE_BACKTRACKING, record_path=path)
+        assert lattice.event_log is None
+        replay = Replay(EventLogReader(path), np.zeros_like(lattice.states))
+        replay.seek(replay.reader.get_num_frames())
+        assert (replay.states == lattice.states).all()
+
+        lattice.set_origin(Pos(1, 1))
+        lattice.set_goal(Pos(21, 29))
+        path = str(tmp_path / 'search.levt')
+        lattice.visualize(PathfindingOption.BFS, record_path=path)
+        reader = EventLogReader(path)
+        replay = Replay(reader, np.zeros_like(lattice.states))
+        visited = set()
+        while not replay.is_done():
+            indices = replay.advance()
+            changed = indices[replay.states.ravel()[indices] == NodeState.VISITED.value]
+            visited.update(changed.tolist())
+        assert (replay.states == lattice.states).all()
+        assert visited >= set(
+            np.flatnonzero(lattice.states == NodeState.VISITED.value).tolist()
+        )
+        # One node per frame with small deltas, so a few bytes per frame instead of a snapshot of the lattice
+        num_bytes = reader.frame_offsets[-1] - reader.frame_offsets[0]
+        assert num_bytes < 4 * reader.get_num_frames()
+
+    def test_record_game_of_life(self, tmp_path, lattice: Lattice) -> None:
+        lattice.randomize(0.3, seed=0)
+        path = str(tmp_path / 'life.levt')
+        lattice.game_of_life(record_path=path)
+        replay = Replay(EventLogReader(path), np.zeros_like(lattice.states))
+        replay.seek(replay.reader.get_num_frames())
+        assert (replay.states == lattice.states).all()
+
+    def test_chunked(self, tmp_path) -> None:
+        lattice = Lattice(None, LatticeInfo(ScreenDim(100, 100), 10), chunked=True)
+        with pytest.raises(ValueError, match='chunked'):
+            with lattice.recording(str(tmp_path / 'log.levt')):
+                pass
@@ -0,0 +1,82 @@
+import pytest
+import numpy as np
+
+from Node import Pos
+from enums import MazeOption, NodeState, PathfindingOption
+from Lattice import Lattice, LatticeInfo, ScreenDim
+from FlowField import NO_DIRECTION, UNREACHABLE, FlowField
+
+
+@pytest.fixture
+def lattice() -> Lattice:
+    lattice = Lattice(None, LatticeInfo(ScreenDim(310, 230), 10))
+    lattice.randomize(0.3, seed=0)
+    lattice.get_node(5, 5).set_state(NodeState.VACANT)
+    return lattice
+
+
+def check_directions(flow_field: FlowField) -> None:
+    '''
+    Checks that every cell with a direction moves to a cell one closer to the goal, and that no other cell has one.
+    '''
+
+    distances = flow_field.get_distances()
+    nrows, ncols = distances.shape
+    for r in range(nrows):
+        for c in range(ncols):
+            next_pos = flow_field.get_next_pos(Pos(r, c))
+            if distances[r, c] in [0, UNREACHABLE]:
+                assert next_pos is None
+            else:
+                assert distances[next_pos] == distances[r, c] - 1
+
+
+class TestFlowField:
+    def test_distances(self, lattice: Lattice) -> None:
+        flow_field = lattice.build_flow_field(Pos(5, 5))
+        distances = flow_field.get_distances()
+        assert distances[5, 5] == 0
+        assert (distances[lattice.states == NodeState.WALL.value] == UNREACHABLE).all()
+        for goal in [Pos(0, 0), Pos(20, 30), Pos(22, 1)]:
+            path = lattice.find_path(Pos(5, 5), goal, PathfindingOption.BFS)
+            expected = UNREACHABLE if path is None else len(path) - 1
+            assert distances[goal] == expected
+        check_directions(flow_field)
+
+    def test_wall_on_goal(self, lattice: Lattice) -> None:
+        lattice.get_node(5, 5).set_state(NodeState.WALL)
+        flow_field = lattice.build_flow_field(Pos(5, 5))
+        assert (flow_field.get_distances() == UNREACHABLE).all()
+        assert (flow_field.get_directions() == NO_DIRECTION).all()
+
+    @pytest.mark.parametrize('seed', range(5))
+    def test_update(self, lattice: Lattice, seed: int) -> None:
+        flow_field = lattice.build_flow_field(Pos(5, 5))
+        rng = np.random.default_rng(seed)
+        nrows, ncols = lattice.get_dim()
+        for _ in range(5):
+            for _ in range(rng.integers(1, 10)):
+                r, c = rng.integers(nrows), rng.integers(ncols)
+                if (r, c) != (5, 5):
+                    lattice.states[r, c] = 1 - lattice.states[r, c]
+            flow_field.update()
+            rebuilt_flow_field = lattice.build_flow_field(Pos(5, 5))
+            assert (
+                flow_field.get_distances() == rebuilt_flow_field.get_distances()
+            ).all()
+            check_directions(flow_field)
+        assert flow_field.update() == 0
+
+    def test_step_agents(self) -> None:
+        lattice = Lattice(None, LatticeInfo(ScreenDim(210, 210), 10))
+        lattice.generate_maze(MazeOption.KRUSKAL)
+        lattice.set_goal(Pos(1, 1))
+        flow_field = lattice.build_flow_field()
+        agents = lattice.spawn_agents(flow_field, 100, seed=0)
+        assert len(agents) == 100
+        max_distance = flow_field.get_distances()[tuple(agents.T)].max()
+        for _ in range(max_distance):
+            agents = flow_field.step_agents(agents)
+            assert (lattice.states[tuple(agents.T)] != NodeState.WALL.value).all()
+        assert (agents == [1, 1]).all()
+        assert (flow_field.step_agents(agents) == agents).all()
@@ -0,0 +1,55 @@
+import pytest
+import numpy as np
+
+from enums import NodeState
+from Lattice import Lattice, LatticeInfo, ScreenDim
+from GenerationCache import GenerationCache, get_next_generation
+
+
+@pytest.fixture
+def board() -> np.ndarray:
+    lattice = Lattice(None, LatticeInfo(ScreenDim(310, 230), 10))
+    lattice.randomize(0.3, seed=0)
+    return lattice.states == NodeState.WALL.value
+
+
+def test_next_generation_matches_lattice() -> None:
+    lattice = Lattice(None, LatticeInfo(ScreenDim(310, 230), 10))
+    lattice.randomize(0.3, seed=0)
+    all_neighbour_indices = lattice.get_all_neighbour_indices()
+    for _ in range(5):
+        expected = get_next_generation(lattice.states == NodeState.WALL.value)
+        lattice.next_generation(all_neighbour_indices)
+        assert (expected == (lattice.states == NodeState.WALL.value)).all()
+
+
+class TestGenerationCache:
+    def test_lazy(self, board: np.ndarray) -> None:
+        cache = GenerationCache(board, size=4)
+        assert (cache.get(0) == board).all()
+        assert cache.last == 0
+        assert (cache.get(2) == get_next_generation(get_next_generation(board))).all()
+        assert cache.last == 2
+        assert cache.get_num_held() == 3
+
+    def test_ring_buffer(self, board: np.ndarray) -> None:
+        cache = GenerationCache(board, size=3)
+        expected = board
+        for generation in range(10):
+            assert (cache.get(generation) == expected).all()
+            expected = get_next_generation(expected)
+        assert cache.get_num_held() == 3
+        assert cache.first == 7
+        with pytest.raises(ValueError, match='evicted'):
+            cache.get(6)
+
+    def test_evict_before(self, board: np.ndarray) -> None:
+        cache = GenerationCache(board)
+        cache.get(5)
+        cache.evict_before(4)
+        assert cache.get_num_held() == 2
+        with pytest.raises(ValueError, match='evicted'):
+            cache.get(3)
+        cache.evict_before(100)  # The newest generation is always kept
+        assert cache.get_num_held() == 1
+        cache.get(6)
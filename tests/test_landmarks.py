@@ -0,0 +1,134 @@
+import os
+import struct
+import pytest
+import random
+import numpy as np
+
+from Node import Pos
+from enums import MazeOption, NodeState, PathfindingOption
+from Lattice import Lattice, LatticeInfo, ScreenDim
+from Landmarks import (
+    LANDMARKS_FILE_HEADER,
+    LANDMARKS_FILE_SUFFIX,
+    Landmarks,
+    get_distances,
+)
+from FlowField import UNREACHABLE
+
+
+@pytest.fixture
+def lattice() -> Lattice:
+    random.seed(0)
+    lattice = Lattice(None, LatticeInfo(ScreenDim(410, 310), 10))
+    lattice.generate_maze(MazeOption.KRUSKAL)
+    return lattice
+
+
+def search(lattice: Lattice, origin: Pos, goal: Pos, option: PathfindingOption):
+    '''
+    Searches from origin to goal, and returns the path cost and the number of expansions.
+    '''
+
+    path = lattice.find_path(origin, goal, option)
+    cost = None if path is None else len(path) - 1
+    return cost, lattice.scratch.get_num_visited()
+
+
+class TestLandmarks:
+    def test_build(self, lattice: Lattice) -> None:
+        landmarks = lattice.get_landmarks()
+        assert len(landmarks.positions) == lattice.num_landmarks
+        assert len(set(landmarks.positions)) == len(landmarks.positions)
+        assert landmarks.distances.dtype == np.uint16
+        assert landmarks.distances.shape == (
+            lattice.states.size,
+            len(landmarks.positions),
+        )
+        for i, pos in enumerate(landmarks.positions):
+            assert lattice.states[pos] != NodeState.WALL.value
+            distances = get_distances(lattice, pos)
+            expected = np.where(
+                distances == UNREACHABLE, landmarks.unreachable, distances
+            )
+            assert (landmarks.distances[:, i] == expected).all()
+
+    def test_heuristic_is_admissible(self, lattice: Lattice) -> None:
+        goal = Pos(19, 29)
+        heuristic = lattice.get_landmarks().get_heuristic(
+            lattice.get_flat_index(lattice.get_node(*goal))
+        )
+        distances = get_distances(lattice, goal)
+        reachable = np.flatnonzero(distances != UNREACHABLE)
+        assert heuristic(int(reachable[0])) > 0
+        for index in reachable:
+            assert heuristic(int(index)) <= distances[index]
+
+    def test_fewer_expansions(self, lattice: Lattice) -> None:
+        for origin, goal in [(Pos(1, 1), Pos(29, 39)), (Pos(15, 3), Pos(1, 37))]:
+            alt_cost, alt_expansions = search(
+                lattice, origin, goal, PathfindingOption.ALT
+            )
+            a_star_cost, a_star_expansions = search(
+                lattice, origin, goal, PathfindingOption.A_STAR
+            )
+            assert alt_cost == a_star_cost
+            assert alt_expansions < a_star_expansions
+
+    def test_rebuilt_after_wall_edits(self, lattice: Lattice) -> None:
+        landmarks = lattice.get_landmarks()
+        assert lattice.get_landmarks() is landmarks
+        lattice.get_node(1, 2).set_state(NodeState.WALL)
+        lattice.get_node(2, 1).set_state(NodeState.WALL)
+        assert landmarks.is_stale()
+        assert lattice.get_landmarks() is not landmarks
+        cost, _ = search(lattice, Pos(3, 3), Pos(29, 39), PathfindingOption.ALT)
+        assert cost == search(lattice, Pos(3, 3), Pos(29, 39), PathfindingOption.BFS)[0]
+
+    def test_save_load(self, lattice: Lattice, tmp_path) -> None:
+        path = str(tmp_path / 'maze.lat')
+        lattice.save(path)
+        assert Lattice.load(path).landmarks is None
+        landmarks = lattice.get_landmarks()
+        lattice.save(path)
+        loaded = Lattice.load(path)
+        assert loaded.landmarks.positions == landmarks.positions
+        assert (loaded.landmarks.distances == landmarks.distances).all()
+        assert not loaded.landmarks.is_stale()
+        assert loaded.get_landmarks() is loaded.landmarks
+
+    def test_stale_file(self, lattice: Lattice, tmp_path) -> None:
+        path = str(tmp_path / 'maze.lat')
+        lattice.get_landmarks()
+        lattice.save(path)
+        other = Lattice(None, LatticeInfo(ScreenDim(100, 100), 10))
+        other.save(path)
+        assert not os.path.exists(path + LANDMARKS_FILE_SUFFIX)
+        lattice.save(path)
+        other.get_landmarks().save(path + LANDMARKS_FILE_SUFFIX)
+        loaded = Lattice.load(path)
+        assert loaded.landmarks is None
+        assert loaded.get_landmarks().positions == lattice.get_landmarks().positions
+
+    def test_invalid_file(self, lattice: Lattice, tmp_path) -> None:
+        path = str(tmp_path / f'maze.lat{LANDMARKS_FILE_SUFFIX}')
+        lattice.save(path)
+        with pytest.raises(ValueError, match='not a landmarks file'):
+            Landmarks.load(path, lattice)
+        other = Lattice(None, LatticeInfo(ScreenDim(100, 100), 10))
+        other.get_landmarks().save(path)
+        with pytest.raises(ValueError, match='different size'):
+            Landmarks.load(path, lattice)
+        lattice.get_landmarks().save(path)
+        with open(path, 'r+b') as f:
+            f.seek(6)  # Bytes per distance
+            f.write(struct.pack('<H', 3))
+        with pytest.raises(ValueError, match='invalid distances'):
+            Landmarks.load(path, lattice)
+        with open(path, 'wb') as f:
+            f.write(LANDMARKS_FILE_HEADER.pack(b'LLMK', 1, 2, 31, 41, 8))
+        with pytest.raises(ValueError, match='truncated'):
+            Landmarks.load(path, lattice)
+
+    def test_all_walls(self, lattice: Lattice) -> None:
+        lattice.fill()
+        assert lattice.get_landmarks().positions == []
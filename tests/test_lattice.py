@@ -1,14 +1,27 @@
+import os
 import pytest
 import random
+import numpy as np
+from typing import List, Optional
 
-from Node import Node
-from enums import DrawMode, NodeState
-from Lattice import Lattice, LatticeInfo, ScreenDim, draw_mode_to_node_state_mapping
+from Node import Node, Pos
+from enums import DrawMode, MazeOption, NodeState, PathfindingOption
+from GenerationCache import get_next_generation
+from Lattice import (
+    DEFAULT_MAX_GENERATIONS,
+    LATTICE_FILE_HEADER,
+    Lattice,
+    LatticeInfo,
+    ScreenDim,
+    draw_mode_to_node_state_mapping,
+    get_brush_offsets,
+    get_line_positions,
+)
 
 
 @pytest.fixture
 def lattice() -> Lattice:
-    return Lattice()
+    return Lattice(None, LatticeInfo(ScreenDim(210, 210), 10))
 
 
 class TestLattice:
@@ -33,7 +46,7 @@ class TestLattice:
     def test_get_origin(self, lattice: Lattice) -> None:
         assert lattice.get_origin() is None
 
-    def get_goal(self, lattice: Lattice) -> None:
+    def test_get_goal(self, lattice: Lattice) -> None:
         assert lattice.get_goal() is None
 
     def test_get_draw_mode(self, lattice: Lattice) -> None:
@@ -46,7 +59,7 @@ class TestLattice:
         assert lattice.get_draw_mode() == random_draw_mode
 
     def test_randomize(self, lattice: Lattice) -> None:
-        lattice.randomize()
+        lattice.randomize(0.25)
         nrows, ncols = lattice.get_dim()
         for r in range(nrows):
             for c in range(ncols):
@@ -57,10 +70,11 @@ class TestLattice:
     def test_change_node_state(self, lattice: Lattice) -> None:
         for draw_mode in DrawMode:
             lattice.set_draw_mode(draw_mode)
-            lattice.change_node_state(0, 0)
-            lattice.get_node(0, 0).get_state() == draw_mode_to_node_state_mapping[
-                draw_mode
-            ]
+            lattice.change_node_state_on_user_input(Pos(0, 0))
+            assert (
+                lattice.get_node(0, 0).get_state()
+                == draw_mode_to_node_state_mapping[draw_mode]
+            )
 
     def test_clear_lattice(self, lattice: Lattice) -> None:
         lattice.clear()
@@ -68,3 +82,481 @@ class TestLattice:
         for r in range(nrows):
             for c in range(ncols):
                 assert lattice.get_node(r, c).get_state() == NodeState.VACANT
+
+
+def assert_perfect_maze(lattice: Lattice) -> None:
+    '''
+    A perfect maze is a spanning tree of its vacant nodes: connected, and without loops.
+    '''
+
+    nrows, ncols = lattice.get_dim()
+    vacant = {
+        (r, c)
+        for r in range(nrows)
+        for c in range(ncols)
+        if lattice.get_node(r, c).get_state() == NodeState.VACANT
+    }
+    num_edges = sum(((r + 1, c) in vacant) + ((r, c + 1) in vacant) for r, c in vacant)
+    assert num_edges == len(vacant) - 1
+    reached, stack = {(1, 1)}, [(1, 1)]
+    while stack:
+        r, c = stack.pop()
+        for neighbour in [(r + 1, c), (r - 1, c), (r, c + 1), (r, c - 1)]:
+            if neighbour in vacant and neighbour not in reached:
+                reached.add(neighbour)
+                stack.append(neighbour)
+    assert reached == vacant
+
+
+class TestStroke:
+    def test_line_positions(self) -> None:
+        line = get_line_positions(Pos(0, 0), Pos(7, -3))
+        assert line[0] == Pos(0, 0) and line[-1] == Pos(7, -3)
+        assert len(line) == 8
+        for a, b in zip(line, line[1:]):  # No gaps
+            assert max(abs(a.r - b.r), abs(a.c - b.c)) == 1
+        assert get_line_positions(Pos(2, 2), Pos(2, 2)) == [Pos(2, 2)]
+
+    def test_brush_offsets(self) -> None:
+        assert get_brush_offsets(0) == [(0, 0)]
+        assert len(get_brush_offsets(1)) == 5
+        assert len(get_brush_offsets(3)) == 29
+
+    def test_draw_stroke(self, lattice: Lattice) -> None:
+        lattice.set_goal(Pos(10, 5))
+        lattice.draw_stroke([Pos(0, 5), Pos(20, 5)])
+        assert all(
+            lattice.get_node(r, 5).get_state() == NodeState.WALL for r in range(21)
+        )
+        assert count_nodes(lattice, NodeState.WALL) == 21
+        assert lattice.get_goal() is None
+        lattice.set_draw_mode(DrawMode.SET_VACANT)
+        lattice.draw_stroke([Pos(10, 5)], brush_radius=2)
+        assert count_nodes(lattice, NodeState.WALL) == 21 - 5
+
+    def test_draw_stroke_clipped(self, lattice: Lattice) -> None:
+        lattice.draw_stroke([Pos(0, 0), Pos(0, 20)], brush_radius=1)
+        assert count_nodes(lattice, NodeState.WALL) == 21 * 2
+
+    def test_draw_stroke_origin(self, lattice: Lattice) -> None:
+        lattice.set_draw_mode(DrawMode.SET_ORIGIN)
+        lattice.draw_stroke([Pos(0, 0), Pos(3, 3)], brush_radius=2)
+        assert lattice.get_origin().get_pos() == Pos(3, 3)
+        assert count_nodes(lattice, NodeState.ORIGIN) == 1
+
+
+class TestMazeGeneration:
+    @pytest.mark.parametrize('option', [option for option in MazeOption])
+    def test_generate_maze(self, lattice: Lattice, option: MazeOption) -> None:
+        lattice.generate_maze(option)
+        assert_perfect_maze(lattice)
+        for r in range(1, 21, 2):
+            for c in range(1, 21, 2):
+                assert lattice.get_node(r, c).get_state() == NodeState.VACANT
+
+
+class TestRandomize:
+    def test_same_seed_same_layout(self, lattice: Lattice) -> None:
+        lattice.randomize(0.3, seed=42)
+        first_layout = lattice.states.copy()
+        lattice.randomize(0.3, seed=7)
+        assert (lattice.states != first_layout).any()
+        lattice.randomize(0.3, seed=42)
+        assert (lattice.states == first_layout).all()
+
+    def test_only_walls_and_vacant(self, lattice: Lattice) -> None:
+        lattice.randomize(0.5, seed=0)
+        nrows, ncols = lattice.get_dim()
+        for r in range(nrows):
+            for c in range(ncols):
+                assert lattice.get_node(r, c).get_state() in [
+                    NodeState.VACANT,
+                    NodeState.WALL,
+                ]
+
+    def test_clustered_density(self, lattice: Lattice) -> None:
+        lattice.randomize(0.25, seed=0, cluster_size=3)
+        num_walls = (lattice.states == NodeState.WALL.value).sum()
+        assert num_walls == int(0.25 * lattice.states.size)
+
+
+def set_origin_and_goal(lattice: Lattice, origin: Pos, goal: Pos) -> None:
+    lattice.set_draw_mode(DrawMode.SET_ORIGIN)
+    lattice.change_node_state_on_user_input(origin)
+    lattice.set_draw_mode(DrawMode.SET_GOAL)
+    lattice.change_node_state_on_user_input(goal)
+    lattice.set_draw_mode(DrawMode.SET_WALL)
+
+
+def count_nodes(lattice: Lattice, state: NodeState) -> int:
+    return int((lattice.states == state.value).sum())
+
+
+class TestSearch:
+    @pytest.mark.parametrize('option', [option for option in PathfindingOption])
+    def test_path_found(self, lattice: Lattice, option: PathfindingOption) -> None:
+        set_origin_and_goal(lattice, Pos(0, 0), Pos(20, 20))
+        lattice.visualize(option)
+        assert count_nodes(lattice, NodeState.PATH) > 0
+
+    @pytest.mark.parametrize(
+        'option',
+        [
+            PathfindingOption.BFS,
+            PathfindingOption.DIJKSTRA,
+            PathfindingOption.A_STAR,
+            PathfindingOption.ALT,
+            PathfindingOption.FRINGE,
+            PathfindingOption.IDA_STAR,
+        ],
+    )
+    def test_shortest_path(self, lattice: Lattice, option: PathfindingOption) -> None:
+        lattice.generate_maze(MazeOption.KRUSKAL)
+        set_origin_and_goal(lattice, Pos(1, 1), Pos(19, 19))
+        lattice.visualize(PathfindingOption.BFS)
+        expected_path_length = count_nodes(lattice, NodeState.PATH)
+        lattice.visualize(option)
+        assert count_nodes(lattice, NodeState.PATH) == expected_path_length
+
+    def test_path_not_found(self, lattice: Lattice) -> None:
+        lattice.fill()
+        set_origin_and_goal(lattice, Pos(0, 0), Pos(20, 20))
+        lattice.visualize(PathfindingOption.BFS)
+        assert count_nodes(lattice, NodeState.PATH) == 0
+        assert count_nodes(lattice, NodeState.VISITED) == 0
+
+    def test_clear_search_results(self, lattice: Lattice) -> None:
+        set_origin_and_goal(lattice, Pos(0, 0), Pos(20, 20))
+        lattice.visualize(PathfindingOption.DIJKSTRA)
+        lattice.clear_search_results()
+        assert count_nodes(lattice, NodeState.VISITED) == 0
+        assert count_nodes(lattice, NodeState.PATH) == 0
+        assert lattice.get_origin().get_state() == NodeState.ORIGIN
+        assert lattice.get_goal().get_state() == NodeState.GOAL
+        assert (
+            lattice.scratch.get_predecessor(lattice.get_flat_index(lattice.get_goal()))
+            is None
+        )
+
+
+class TestMemoryBounded:
+    @pytest.mark.parametrize(
+        'option', [PathfindingOption.FRINGE, PathfindingOption.IDA_STAR]
+    )
+    @pytest.mark.parametrize('seed', range(5))
+    def test_shortest_paths(
+        self, lattice: Lattice, option: PathfindingOption, seed: int
+    ) -> None:
+        lattice.randomize(0.3, seed=seed)
+        rng = random.Random(seed)
+        for _ in range(5):
+            origin = Pos(rng.randrange(21), rng.randrange(21))
+            goal = Pos(rng.randrange(21), rng.randrange(21))
+            expected = lattice.find_path(origin, goal, PathfindingOption.BFS)
+            path = lattice.find_path(origin, goal, option)
+            if expected is None:
+                assert path is None
+                continue
+            assert len(path) == len(expected)
+            assert path[0] == origin and path[-1] == goal
+            for pos, next_pos in zip(path, path[1:]):
+                assert abs(pos.r - next_pos.r) + abs(pos.c - next_pos.c) == 1
+                assert lattice.states[next_pos] != NodeState.WALL.value
+
+    @pytest.mark.parametrize('table_size', [0, 10, None])
+    def test_transposition_table_size(
+        self, lattice: Lattice, table_size: Optional[int]
+    ) -> None:
+        lattice.randomize(0.2, seed=0)
+        lattice.transposition_table_size = table_size
+        set_origin_and_goal(lattice, Pos(0, 0), Pos(12, 12))
+        lattice.visualize(PathfindingOption.BFS)
+        expected_cost = lattice.get_path_cost()
+        lattice.visualize(PathfindingOption.IDA_STAR)
+        assert lattice.get_path_cost() == expected_cost
+        assert count_nodes(lattice, NodeState.PATH) == expected_cost - 1
+
+    def test_no_node_objects(self, lattice: Lattice) -> None:
+        path = lattice.find_path(Pos(0, 0), Pos(20, 20), PathfindingOption.IDA_STAR)
+        assert len(path) == 41
+        # Only the origin and goal are looked up, and the path once it's found
+        assert len(lattice.nodes) == 41
+
+    def test_expansions(self, lattice: Lattice) -> None:
+        lattice.randomize(0.25, seed=0)
+        lattice.transposition_table_size = 0
+        set_origin_and_goal(lattice, Pos(0, 0), Pos(20, 20))
+        lattice.clear_search_results()
+        with lattice.counting() as stats:
+            assert lattice.search(PathfindingOption.IDA_STAR)
+        # Nodes are expanded again in every iteration, and none of them are kept in the scratch data
+        assert stats.nodes_expanded > count_nodes(lattice, NodeState.VISITED)
+        assert lattice.scratch.get_num_visited() == 0
+        assert not stats.trace_events
+        assert lattice.stats is None
+
+
+def find_earliest_arrival(lattice: Lattice, origin: Pos, goal: Pos) -> Optional[int]:
+    '''
+    Finds the earliest generation the goal can be reached in through the Game of Life, with a plain breadth-first
+    search over (cell, generation) states, to check find_path_through_life() against.
+    '''
+
+    nrows, ncols = lattice.get_dim()
+    board = lattice.states == NodeState.WALL.value
+    reachable = {origin} if not board[origin] else set()
+    for generation in range(DEFAULT_MAX_GENERATIONS):
+        if goal in reachable:
+            return generation
+        board = get_next_generation(board)
+        reachable = {
+            Pos(r, c)
+            for pos in reachable
+            for r, c in [
+                pos,
+                (pos.r - 1, pos.c),
+                (pos.r + 1, pos.c),
+                (pos.r, pos.c - 1),
+                (pos.r, pos.c + 1),
+            ]
+            if 0 <= r < nrows and 0 <= c < ncols and not board[r, c]
+        }
+    return None
+
+
+class TestPathThroughLife:
+    def check_path(self, lattice: Lattice, path: List[Pos]) -> None:
+        board = lattice.states == NodeState.WALL.value
+        for pos, next_pos in zip(path, path[1:]):
+            assert not board[pos]
+            assert abs(pos.r - next_pos.r) + abs(pos.c - next_pos.c) <= 1
+            board = get_next_generation(board)
+        assert not board[path[-1]]
+
+    def test_still_life(self, lattice: Lattice) -> None:
+        for r, c in [(5, 5), (5, 6), (6, 5), (6, 6)]:  # Block, which never changes
+            lattice.get_node(r, c).set_state(NodeState.WALL)
+        path = lattice.find_path_through_life(Pos(5, 0), Pos(5, 10))
+        expected = lattice.find_path(Pos(5, 0), Pos(5, 10), PathfindingOption.BFS)
+        assert len(path) == len(expected)
+        self.check_path(lattice, path)
+
+    @pytest.mark.parametrize('seed', range(5))
+    def test_earliest_arrival(self, lattice: Lattice, seed: int) -> None:
+        lattice.randomize(0.35, seed=seed)
+        rng = random.Random(seed)
+        for _ in range(5):
+            origin = Pos(rng.randrange(21), rng.randrange(21))
+            goal = Pos(rng.randrange(21), rng.randrange(21))
+            states = lattice.states.copy()
+            path = lattice.find_path_through_life(origin, goal)
+            assert (lattice.states == states).all()
+            expected = find_earliest_arrival(lattice, origin, goal)
+            if expected is None:
+                assert path is None
+                continue
+            assert len(path) == expected + 1
+            assert path[0] == origin and path[-1] == goal
+            self.check_path(lattice, path)
+
+    def test_not_found(self, lattice: Lattice) -> None:
+        lattice.get_node(0, 0).set_state(NodeState.WALL)
+        assert lattice.find_path_through_life(Pos(0, 0), Pos(5, 5)) is None
+        assert lattice.find_path_through_life(Pos(1, 1), Pos(5, 5), 3) is None
+        assert lattice.find_path_through_life(Pos(1, 1), Pos(1, 1), 0) == [Pos(1, 1)]
+
+    def test_chunked(self) -> None:
+        lattice = Lattice(None, LatticeInfo(ScreenDim(100, 100), 10), chunked=True)
+        with pytest.raises(ValueError, match='chunked'):
+            lattice.find_path_through_life(Pos(0, 0), Pos(5, 5))
+
+    def test_visualize(self, lattice: Lattice) -> None:
+        lattice.randomize(0.2, seed=0)
+        set_origin_and_goal(lattice, Pos(0, 0), Pos(20, 20))
+        path = lattice.find_path_through_life(Pos(0, 0), Pos(20, 20))
+        assert lattice.visualize_path_through_life() == path
+        assert lattice.get_origin().get_state() == NodeState.ORIGIN
+        assert lattice.get_goal().get_state() == NodeState.GOAL
+
+
+class TestSolveMany:
+    def get_pairs(self):
+        return [
+            (Pos(1, 1), Pos(19, 19)),
+            (Pos(19, 1), Pos(1, 19)),
+            (Pos(1, 1), Pos(0, 0)),  # Goal is a wall
+            (Pos(5, 5), Pos(5, 5)),
+        ]
+
+    def test_find_path(self, lattice: Lattice) -> None:
+        lattice.generate_maze(MazeOption.KRUSKAL)
+        states = lattice.states.copy()
+        path = lattice.find_path(Pos(1, 1), Pos(19, 19), PathfindingOption.BFS)
+        assert (lattice.states == states).all()
+        assert path[0] == Pos(1, 1) and path[-1] == Pos(19, 19)
+        set_origin_and_goal(lattice, Pos(1, 1), Pos(19, 19))
+        lattice.visualize(PathfindingOption.BFS)
+        assert len(path) == count_nodes(lattice, NodeState.PATH) + 2
+
+    def test_find_path_between_visualizations(self) -> None:
+        lattices = [
+            Lattice(None, LatticeInfo(ScreenDim(210, 210), 10)) for _ in range(2)
+        ]
+        for lattice in lattices:
+            set_origin_and_goal(lattice, Pos(0, 0), Pos(20, 20))
+            lattice.visualize(PathfindingOption.BFS)
+        lattices[0].find_path(Pos(0, 0), Pos(20, 20), PathfindingOption.BFS)
+        for lattice in lattices:
+            set_origin_and_goal(lattice, Pos(0, 0), Pos(2, 2))
+            lattice.visualize(PathfindingOption.BFS)
+        # The first visualization's results are cleared either way
+        assert (lattices[0].states == lattices[1].states).all()
+
+    @pytest.mark.parametrize('workers', [1, 2])
+    def test_solve_many(self, lattice: Lattice, workers: int) -> None:
+        lattice.generate_maze(MazeOption.KRUSKAL)
+        states = lattice.states.copy()
+        pairs = self.get_pairs()
+        paths = lattice.solve_many(pairs, PathfindingOption.A_STAR, workers=workers)
+        assert (lattice.states == states).all()
+        assert paths == [
+            lattice.find_path(origin, goal, PathfindingOption.A_STAR)
+            for origin, goal in pairs
+        ]
+        assert paths[2] is None
+        assert paths[3] == [Pos(5, 5)]
+
+
+class TestChunked:
+    @pytest.fixture
+    def chunked_lattice(self) -> Lattice:
+        return Lattice(None, LatticeInfo(ScreenDim(10**6, 10**6), 1), chunked=True)
+
+    @pytest.mark.parametrize(
+        'option',
+        [
+            PathfindingOption.BFS,
+            PathfindingOption.DIJKSTRA,
+            PathfindingOption.A_STAR,
+            PathfindingOption.FRINGE,
+            PathfindingOption.IDA_STAR,
+        ],
+    )
+    def test_search(self, chunked_lattice: Lattice, option: PathfindingOption) -> None:
+        origin, goal = Pos(500000, 500000), Pos(500010, 500010)
+        for r in range(origin.r - 1, goal.r + 2):  # Path has to go around this
+            chunked_lattice.get_node(r, origin.c + 5).set_state(NodeState.WALL)
+        set_origin_and_goal(chunked_lattice, origin, goal)
+        chunked_lattice.visualize(option)
+        assert chunked_lattice.get_path_cost() == 24
+        assert len(chunked_lattice.get_path(chunked_lattice.get_goal())) == 25
+        assert chunked_lattice.states.get_num_chunks() <= 4
+        path = chunked_lattice.find_path(origin, goal, option)
+        assert len(path) == 25
+
+    def test_search_memory_freed(self, chunked_lattice: Lattice) -> None:
+        origin, goal = Pos(500000, 500000), Pos(500000, 500130)
+        wall = Pos(10, 10)
+        chunked_lattice.get_node(*wall).set_state(NodeState.WALL)
+        set_origin_and_goal(chunked_lattice, origin, goal)
+        chunked_lattice.visualize(PathfindingOption.BFS)
+        assert chunked_lattice.states.get_num_chunks() > 3
+        chunked_lattice.clear_search_results()
+        # Only the wall's, the origin's and the goal's chunks and nodes are left
+        assert chunked_lattice.states.get_num_chunks() == 3
+        assert set(chunked_lattice.nodes) == {wall, origin, goal}
+        assert (
+            len(chunked_lattice.find_path(origin, goal, PathfindingOption.BFS)) == 131
+        )
+        assert set(chunked_lattice.nodes) == {wall, origin, goal}
+        chunked_lattice.clear()
+        assert not chunked_lattice.nodes
+
+    def test_clear(self, chunked_lattice: Lattice) -> None:
+        chunked_lattice.change_node_state_on_user_input(Pos(3, 4))
+        assert chunked_lattice.get_node(3, 4).get_state() == NodeState.WALL
+        chunked_lattice.clear()
+        assert chunked_lattice.get_node(3, 4).get_state() == NodeState.VACANT
+        assert chunked_lattice.states.get_num_chunks() == 0
+
+    def test_dense_only(self, chunked_lattice: Lattice, tmp_path) -> None:
+        with pytest.raises(ValueError):
+            chunked_lattice.save(str(tmp_path / 'lattice.lat'))
+        with pytest.raises(ValueError):
+            chunked_lattice.generate_maze(MazeOption.KRUSKAL)
+        with pytest.raises(ValueError):
+            chunked_lattice.fill()
+        with pytest.raises(ValueError):
+            chunked_lattice.game_of_life()
+
+
+class TestSaveLoad:
+    def test_round_trip(self, lattice: Lattice, tmp_path) -> None:
+        lattice.randomize(0.3, seed=1)
+        set_origin_and_goal(lattice, Pos(0, 0), Pos(20, 20))
+        path = str(tmp_path / 'lattice.lat')
+        lattice.save(path)
+        loaded_lattice = Lattice.load(path)
+        assert loaded_lattice.get_dim() == lattice.get_dim()
+        assert loaded_lattice.get_info() == lattice.get_info()
+        assert (loaded_lattice.states == lattice.states).all()
+        assert loaded_lattice.get_origin().get_pos() == Pos(0, 0)
+        assert loaded_lattice.get_goal().get_pos() == Pos(20, 20)
+        assert loaded_lattice.costs is None
+
+    def test_cost_layer(self, lattice: Lattice, tmp_path) -> None:
+        nrows, ncols = lattice.get_dim()
+        lattice.costs = np.arange(nrows * ncols, dtype=np.float32).reshape(nrows, ncols)
+        path = str(tmp_path / 'lattice.lat')
+        lattice.save(path)
+        loaded_lattice = Lattice.load(path)
+        assert (loaded_lattice.costs == lattice.costs).all()
+        loaded_lattice.costs[0, 0] = -1  # Copy-on-write, so the file is untouched
+        assert Lattice.load(path).costs[0, 0] == 0
+
+    def test_save_loaded_cost_layer(self, lattice: Lattice, tmp_path) -> None:
+        nrows, ncols = lattice.get_dim()
+        costs = np.arange(nrows * ncols, dtype=np.float32).reshape(nrows, ncols)
+        lattice.costs = costs
+        path = str(tmp_path / 'lattice.lat')
+        lattice.save(path)
+        loaded_lattice = Lattice.load(path)
+        loaded_lattice.costs[0, 0] = -1
+        loaded_lattice.save(path)  # Over the file its cost layer is mapped from
+        assert (loaded_lattice.costs[1:] == costs[1:]).all()
+        assert Lattice.load(path).costs[0, 0] == -1
+        assert os.listdir(tmp_path) == ['lattice.lat']
+
+    def test_origin_outside(self, lattice: Lattice, tmp_path) -> None:
+        set_origin_and_goal(lattice, Pos(0, 0), Pos(20, 20))
+        path = str(tmp_path / 'lattice.lat')
+        lattice.save(path)
+        with open(path, 'r+b') as f:
+            fields = list(LATTICE_FILE_HEADER.unpack(f.read(LATTICE_FILE_HEADER.size)))
+            fields[-2:] = [21, 3]  # Goal
+            f.seek(0)
+            f.write(LATTICE_FILE_HEADER.pack(*fields))
+        with pytest.raises(ValueError, match='goal'):
+            Lattice.load(path)
+
+    def test_invalid_file(self, tmp_path) -> None:
+        path = tmp_path / 'lattice.lat'
+        path.write_bytes(b'not a lattice file at all, just some bytes')
+        with pytest.raises(ValueError):
+            Lattice.load(str(path))
+
+
+class TestGameOfLife:
+    def test_blinker(self, lattice: Lattice) -> None:
+        for c in range(4, 7):
+            lattice.get_node(5, c).set_state(NodeState.WALL)
+        all_neighbour_indices = lattice.get_all_neighbour_indices()
+        changed_nodes = lattice.next_generation(all_neighbour_indices)
+        assert len(changed_nodes) == 4
+        assert {
+            (r, c) for r, c in zip(*np.nonzero(lattice.states == NodeState.WALL.value))
+        } == {(4, 5), (5, 5), (6, 5)}
+        lattice.next_generation(all_neighbour_indices)
+        assert {
+            (r, c) for r, c in zip(*np.nonzero(lattice.states == NodeState.WALL.value))
+        } == {(5, 4), (5, 5), (5, 6)}
@@ -1,7 +1,18 @@
+import os
+import sys
 import pytest
+import subprocess
 
-from Node import Node, Pos
-from Lattice import Lattice
+from Node import (
+    NUM_COLOURS_IN_TRANSITION,
+    Node,
+    Pos,
+    build_palette,
+    get_node_colours,
+    load_palette,
+    save_palette,
+)
+from Lattice import Lattice, LatticeInfo, ScreenDim
 from enums import NodeState
 
 
@@ -12,9 +23,62 @@ def node() -> Node:
 
 @pytest.fixture
 def lattice() -> Lattice:
-    return Lattice()
+    return Lattice(None, LatticeInfo(ScreenDim(100, 100), 10))
 
 
 class TestNode:
     def test_vacant_state(self, node: Node) -> None:
         assert node.get_state() == NodeState.VACANT
+
+    def test_colour(self, node: Node) -> None:
+        assert node.get_colour(None) == (250, 240, 202)
+        node.set_state(NodeState.VISITED)
+        assert node.get_colour(1) == get_node_colours()[NodeState.VISITED][0]
+        assert len(get_node_colours()[NodeState.VISITED]) == NUM_COLOURS_IN_TRANSITION
+
+
+class TestPalette:
+    def test_cache(self, tmp_path) -> None:
+        path = str(tmp_path / 'palette.npz')
+        assert load_palette(path) is None
+        palette = build_palette()
+        save_palette(palette, path)
+        assert load_palette(path) == palette
+        assert os.listdir(tmp_path) == ['palette.npz']
+
+    def test_corrupt_cache(self, tmp_path) -> None:
+        path = tmp_path / 'palette.npz'
+        path.write_bytes(b'PK\x03\x04garbage')
+        assert load_palette(str(path)) is None
+
+    def test_matches_pygame_colours(self) -> None:
+        pg = pytest.importorskip('pygame')
+        from colour import Color
+
+        palette = build_palette()
+        # The colours the palette was drawn with before it was built lazily: single colours were passed to pygame by
+        # name, transitions as the hex strings of colour.Color
+        for node_state, name in [
+            (NodeState.WALL, '#000500'),
+            (NodeState.VACANT, '#FAF0CA'),
+            (NodeState.ORIGIN, 'green'),
+            (NodeState.GOAL, 'red'),
+        ]:
+            assert palette[node_state] == [tuple(pg.Color(name))[:3]]
+        colours = Color('#ffd100').range_to(Color('#ffee32'), NUM_COLOURS_IN_TRANSITION)
+        assert palette[NodeState.PATH] == [
+            tuple(pg.Color(colour.hex_l))[:3] for colour in colours
+        ]
+
+    def test_headless_import(self) -> None:
+        output = subprocess.run(
+            [
+                sys.executable,
+                '-c',
+                'import sys; import Lattice; print("pygame" in sys.modules, "colour" in sys.modules)',
+            ],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+        assert output.split() == ['False', 'False']
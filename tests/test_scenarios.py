@@ -0,0 +1,102 @@
+import pytest
+
+from Node import Pos
+from enums import NodeState, PathfindingOption
+from Lattice import Lattice
+from scenarios import Scenario, is_optimal, read_scenarios, run_scenario, run_scenarios
+
+MAP = '''type octile
+height 4
+width 5
+map
+.....
+.@@T.
+..G@.
+S....
+'''
+
+SCENARIOS = '''version 1
+0\ttest.map\t5\t4\t0\t0\t4\t3\t7
+0\ttest.map\t5\t4\t0\t3\t4\t0\t7
+1\ttest.map\t5\t4\t2\t2\t0\t0\t4
+'''
+
+
+@pytest.fixture
+def map_path(tmp_path) -> str:
+    path = tmp_path / 'test.map'
+    path.write_text(MAP)
+    return str(path)
+
+
+@pytest.fixture
+def scenario_path(tmp_path) -> str:
+    path = tmp_path / 'test.map.scen'
+    path.write_text(SCENARIOS)
+    return str(path)
+
+
+class TestScenarios:
+    def test_load_movingai_map(self, map_path: str) -> None:
+        lattice = Lattice.load_movingai_map(map_path)
+        assert lattice.get_dim() == (4, 5)
+        walls = {(1, 1), (1, 2), (1, 3), (2, 3)}
+        for r in range(4):
+            for c in range(5):
+                expected_state = NodeState.WALL if (r, c) in walls else NodeState.VACANT
+                assert lattice.get_node(r, c).get_state() == expected_state
+
+    def test_load_malformed_map(self, tmp_path) -> None:
+        path = tmp_path / 'malformed.map'
+        path.write_text(MAP[:-3])
+        with pytest.raises(ValueError):
+            Lattice.load_movingai_map(str(path))
+
+    def test_read_scenarios(self, scenario_path: str) -> None:
+        scenarios = list(read_scenarios(scenario_path))
+        assert len(scenarios) == 3
+        assert scenarios[0].origin == Pos(0, 0)
+        assert scenarios[0].goal == Pos(3, 4)
+        assert scenarios[2].origin == Pos(2, 2)
+        assert scenarios[2].optimal_length == 4
+
+    @pytest.mark.parametrize(
+        'option',
+        [PathfindingOption.BFS, PathfindingOption.DIJKSTRA, PathfindingOption.A_STAR],
+    )
+    def test_run_scenarios(
+        self, map_path: str, scenario_path: str, option: PathfindingOption
+    ) -> None:
+        lattice = Lattice.load_movingai_map(map_path)
+        results = list(run_scenarios(lattice, read_scenarios(scenario_path), option))
+        assert len(results) == 3
+        for result in results:
+            assert result.path_found
+            assert result.expansions > 0
+            assert is_optimal(result)
+
+    def test_expansions(self, map_path: str, scenario_path: str) -> None:
+        lattice = Lattice.load_movingai_map(map_path)
+        scenario = next(read_scenarios(scenario_path))
+        a_star = run_scenario(lattice, scenario, PathfindingOption.A_STAR)
+        # A* expands every node once at most
+        assert a_star.expansions == lattice.scratch.get_num_visited()
+        # IDA* doesn't mark nodes as visited, but its expansions are still counted
+        ida_star = run_scenario(lattice, scenario, PathfindingOption.IDA_STAR)
+        assert lattice.scratch.get_num_visited() == 0
+        assert ida_star.expansions >= scenario.optimal_length
+
+    def test_origin_is_goal(self, map_path: str) -> None:
+        lattice = Lattice.load_movingai_map(map_path)
+        scenario = Scenario(0, 'test.map', Pos(0, 0), Pos(0, 0), 0)
+        result = run_scenario(lattice, scenario, PathfindingOption.A_STAR)
+        assert result.path_found
+        assert result.path_cost == 0
+        assert is_optimal(result)
+
+    def test_outside_lattice(self, map_path: str) -> None:
+        lattice = Lattice.load_movingai_map(map_path)
+        for origin, goal in [(Pos(0, 0), Pos(4, 0)), (Pos(-1, 0), Pos(0, 0))]:
+            scenario = Scenario(0, 'test.map', origin, goal, 0)
+            with pytest.raises(ValueError, match='outside'):
+                run_scenario(lattice, scenario, PathfindingOption.BFS)
@@ -0,0 +1,34 @@
+import pytest
+
+from SearchScratch import SearchScratch, SparseSearchScratch
+
+
+@pytest.fixture(params=['dense', 'sparse'])
+def scratch(request) -> SearchScratch:
+    return SearchScratch(10) if request.param == 'dense' else SparseSearchScratch()
+
+
+class TestSearchScratch:
+    def test_initial_state(self, scratch: SearchScratch) -> None:
+        for index in range(10):
+            assert not scratch.is_visited(index)
+            assert not scratch.is_reached(index)
+            assert scratch.get_g(index) == float('inf')
+            assert scratch.get_predecessor(index) is None
+
+    def test_update(self, scratch: SearchScratch) -> None:
+        scratch.update(0, 0, None)
+        scratch.update(1, 1, 0)
+        scratch.mark_visited(0)
+        assert scratch.is_visited(0)
+        assert scratch.get_g(1) == 1
+        assert scratch.get_predecessor(1) == 0
+        assert scratch.get_predecessor(0) is None
+
+    def test_new_search(self, scratch: SearchScratch) -> None:
+        scratch.update(1, 1, 0)
+        scratch.mark_visited(1)
+        scratch.new_search()
+        assert not scratch.is_visited(1)
+        assert scratch.get_g(1) == float('inf')
+        assert scratch.get_predecessor(1) is None
@@ -0,0 +1,64 @@
+import os
+import json
+import time
+import pytest
+import pygame as pg
+
+from Node import Pos
+from enums import PathfindingOption
+from SearchStats import SearchStats
+from Lattice import Lattice, LatticeInfo, ScreenDim
+
+
+@pytest.fixture
+def stats() -> SearchStats:
+    return SearchStats()
+
+
+def make_lattice(pg_screen=None) -> Lattice:
+    lattice = Lattice(pg_screen, LatticeInfo(ScreenDim(100, 100), 10))
+    lattice.set_origin(Pos(0, 0))
+    lattice.set_goal(Pos(9, 9))
+    return lattice
+
+
+class TestSearchStats:
+    def test_nested_spans(self, stats: SearchStats) -> None:
+        with stats.span('search'):
+            time.sleep(0.01)
+            with stats.span('display'):
+                time.sleep(0.01)
+        assert stats.times['display'] >= 0.01
+        assert 0.01 <= stats.times['search'] < 0.01 + stats.times['display']
+        assert len(stats.trace_events) == 2
+
+    def test_visualize(self) -> None:
+        lattice = make_lattice()
+        stats = lattice.visualize(PathfindingOption.A_STAR, instrument=True)
+        assert stats.nodes_expanded == lattice.scratch.get_num_visited()
+        assert stats.path_length == 18
+        assert stats.frontier_pops <= stats.frontier_pushes
+        assert 0 < stats.frontier_peak <= stats.frontier_pushes
+        assert stats.times['search'] > 0
+        assert lattice.stats is None
+
+    def test_not_instrumented(self) -> None:
+        lattice = make_lattice()
+        assert lattice.visualize(PathfindingOption.BFS) is None
+
+    def test_render_and_display_times(self) -> None:
+        os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+        pg.display.init()
+        lattice = make_lattice(pg.display.set_mode((100, 100)))
+        stats = lattice.visualize(PathfindingOption.BFS, instrument=True)
+        assert stats.times['render'] > 0
+        assert stats.times['display'] > 0
+
+    def test_export_chrome_trace(self, tmp_path) -> None:
+        lattice = make_lattice()
+        stats = lattice.visualize(PathfindingOption.DIJKSTRA, instrument=True)
+        path = tmp_path / 'trace.json'
+        stats.export_chrome_trace(str(path))
+        trace = json.loads(path.read_text())
+        assert trace['traceEvents'][0]['name'] == 'search'
+        assert trace['otherData']['nodes_expanded'] == stats.nodes_expanded
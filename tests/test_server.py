@@ -0,0 +1,101 @@
+import asyncio
+import pytest
+
+from Node import Pos
+from enums import NodeState, PathfindingOption
+from Lattice import Lattice, LatticeInfo, ScreenDim
+from client import PathClient, ServerError
+from server import PathServer
+
+
+@pytest.fixture
+def lattice_path(tmp_path) -> str:
+    lattice = Lattice(None, LatticeInfo(ScreenDim(50, 50), 10))
+    path = str(tmp_path / 'open.lat')
+    lattice.save(path)
+    return path
+
+
+def run_with_server(tmp_path, test) -> None:
+    '''
+    Starts a server on a Unix socket, runs the given coroutine function with a client connected to it, and shuts the
+    server down.
+    '''
+
+    socket_path = str(tmp_path / 'server.sock')
+    server = PathServer(workers=2, max_pipeline=4)
+
+    async def run() -> None:
+        ready = asyncio.Event()
+        serve_task = asyncio.create_task(server.serve(socket_path, ready=ready))
+        await ready.wait()
+        client = await PathClient.connect(socket_path)
+        try:
+            await test(client)
+        finally:
+            await client.close()
+            serve_task.cancel()
+
+    try:
+        asyncio.run(run())
+    finally:
+        server.close()
+
+
+class TestServer:
+    def test_find_path(self, tmp_path, lattice_path: str) -> None:
+        async def test(client: PathClient) -> None:
+            assert await client.load(lattice_path) == {'id': 0, 'nrows': 5, 'ncols': 5}
+            path = await client.find_path(Pos(0, 0), Pos(4, 4), PathfindingOption.BFS)
+            assert path[0] == Pos(0, 0) and path[-1] == Pos(4, 4)
+            assert len(path) == 9
+
+        run_with_server(tmp_path, test)
+
+    def test_pipelined_edits(self, tmp_path, lattice_path: str) -> None:
+        async def test(client: PathClient) -> None:
+            await client.load(lattice_path)
+            wall = [Pos(r, 2) for r in range(5)]
+            # Sent without waiting, so queries before the edit must not see it, and queries after it must
+            paths = await asyncio.gather(
+                *[client.find_path(Pos(0, 0), Pos(0, 4)) for _ in range(6)],
+                client.set_cells(wall, NodeState.WALL),
+                *[client.find_path(Pos(0, 0), Pos(0, 4)) for _ in range(6)],
+            )
+            assert all(path is not None for path in paths[:6])
+            assert all(path is None for path in paths[7:])
+            await client.set_cells(wall[:1], NodeState.VACANT)
+            assert await client.find_path(Pos(0, 0), Pos(0, 4)) is not None
+
+        run_with_server(tmp_path, test)
+
+    def test_errors(self, tmp_path, lattice_path: str) -> None:
+        async def test(client: PathClient) -> None:
+            with pytest.raises(ServerError, match='No map loaded'):
+                await client.find_path(Pos(0, 0), Pos(1, 1))
+            with pytest.raises(ServerError):
+                await client.load(str(tmp_path / 'missing.lat'))
+            await client.load(lattice_path)
+            with pytest.raises(ServerError, match='outside'):
+                await client.find_path(Pos(0, 0), Pos(5, 5))
+            with pytest.raises(ServerError, match='state'):
+                await client.set_cells([Pos(0, 0)], NodeState.PATH)
+            with pytest.raises(ServerError, match='Unknown op'):
+                await client.request('teleport')
+            with pytest.raises(ServerError, match='cells'):
+                await client.request('set_cells', cells=5)
+            with pytest.raises(ServerError, match='cell'):
+                await client.request('set_cells', cells=[5])
+            with pytest.raises(ServerError, match='algorithm'):
+                await client.request(
+                    'find_path', origin=[0, 0], goal=[1, 1], algorithm=[]
+                )
+            with pytest.raises(ServerError, match='path'):
+                await client.request('load', path=5)
+            # The connection is still up
+            assert await client.find_path(Pos(0, 0), Pos(0, 1)) == [
+                Pos(0, 0),
+                Pos(0, 1),
+            ]
+
+        run_with_server(tmp_path, test)